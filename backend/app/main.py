@@ -3,7 +3,9 @@ FastAPI应用入口文件
 """
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import json
 import time
@@ -35,6 +37,63 @@ request_manager = None
 persistence_manager = None
 cleanup_task = None
 websocket_handler = None
+warmup_task = None
+# 重试后仍预热失败的服务及错误信息（服务名 -> 错误），在就绪检查中返回
+warmup_errors: Dict[str, str] = {}
+
+
+async def _warm_up_with_retry(name: str, service) -> bool:
+    """
+    预热单个服务，失败时按指数退避重试
+    
+    重试次数用尽后记录错误并放弃预热：服务仍可处理请求（首个请求承担冷启动开销），
+    就绪检查不再因此一直返回未就绪。
+    
+    Args:
+        name: 服务名（就绪检查中的键）
+        service: 服务实例
+    
+    Returns:
+        bool: 预热是否成功
+    """
+    max_attempts = max(settings.service_warmup_max_attempts, 1)
+    delay = settings.service_warmup_retry_seconds
+    error = None
+    
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if await service.warm_up():
+                warmup_errors.pop(name, None)
+                return True
+            error = getattr(service, "last_warmup_error", None) or "预热未成功"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        
+        if attempt < max_attempts:
+            logger.warning(f"{name} 第 {attempt}/{max_attempts} 次预热失败: {error}，{delay:.1f}秒后重试")
+            await asyncio.sleep(delay)
+            delay *= 2
+    
+    warmup_errors[name] = error
+    logger.error(f"{name} 预热 {max_attempts} 次均失败，放弃预热，服务按未预热状态就绪: {error}")
+    return False
+
+
+async def warm_up_services():
+    """
+    后台预热STT和LLM服务
+    
+    在应用开始接收请求后执行，预热期间存活检查正常响应，就绪检查返回未就绪。
+    """
+    start_time = time.time()
+    logger.info("开始预热服务...")
+    
+    if stt_service:
+        await _warm_up_with_retry("stt_service", stt_service)
+    if llm_service:
+        await _warm_up_with_retry("llm_service", llm_service)
+    
+    logger.info(f"服务预热结束，耗时 {time.time() - start_time:.2f}秒")
 
 
 @asynccontextmanager
@@ -42,10 +101,12 @@ async def lifespan(app: FastAPI):
     """
     应用生命周期管理器
     """
-    global session_manager, stt_service, llm_service, request_manager, persistence_manager, cleanup_task, websocket_handler
+    global session_manager, stt_service, llm_service, request_manager, persistence_manager, cleanup_task, websocket_handler, warmup_task
     
     # 启动时初始化
     logger.info("AI对话应用后端启动中...")
+    startup_start = time.perf_counter()
+    startup_timing = {}
     
     try:
         # 初始化会话管理器
@@ -53,6 +114,7 @@ async def lifespan(app: FastAPI):
         logger.info("会话管理器初始化完成")
         
         # 初始化STT服务
+        stt_start = time.perf_counter()
         try:
             stt_service = create_stt_service()
             if await stt_service.initialize():
@@ -64,13 +126,16 @@ async def lifespan(app: FastAPI):
             from app.services.stt_service import STTService
             stt_service = STTService()
             await stt_service.initialize()
+        startup_timing["stt"] = time.perf_counter() - stt_start
         
         # 初始化LLM服务
+        llm_start = time.perf_counter()
         llm_service = create_llm_service()
         if await llm_service.initialize():
             logger.info("LLM服务初始化完成")
         else:
             logger.warning("LLM服务初始化失败，继续运行")
+        startup_timing["llm"] = time.perf_counter() - llm_start
         
         # 初始化请求管理器
         request_manager = LLMRequestManager(session_manager, llm_service)
@@ -107,7 +172,17 @@ async def lifespan(app: FastAPI):
         # 设置请求管理器的WebSocket处理器
         request_manager.set_websocket_handler(websocket_handler)
         
-        logger.info("应用启动完成")
+        # 后台预热服务（不阻塞启动）
+        if settings.service_warmup_enabled:
+            warmup_task = asyncio.create_task(warm_up_services())
+        
+        # 启动耗时报告（STT细分为引擎库导入和模型加载）
+        stt_detail = ", ".join(f"{key}={value}s" for key, value in stt_service.startup_timing.items())
+        logger.info(
+            f"应用启动完成，总耗时 {time.perf_counter() - startup_start:.3f}s: "
+            f"STT服务 {startup_timing['stt']:.3f}s" + (f" ({stt_detail})" if stt_detail else "") +
+            f", LLM服务 {startup_timing['llm']:.3f}s"
+        )
         
     except Exception as e:
         logger.error(f"应用启动失败: {e}")
@@ -119,6 +194,10 @@ async def lifespan(app: FastAPI):
     logger.info("AI对话应用后端关闭中...")
     
     try:
+        # 停止未完成的预热
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
+        
         # 停止定期清理任务
         if cleanup_task:
             await cleanup_task.stop()
@@ -225,6 +304,42 @@ async def conversation_health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    就绪检查端点
+    
+    STT和LLM服务初始化并完成预热后才返回就绪（HTTP 200），否则返回HTTP 503。
+    预热重试用尽仍失败的服务视为就绪，错误信息在 `warmup_errors` 中返回。
+    与只检查进程存活的 `/` 不同，供部署时判断是否可以接收流量。
+    
+    Returns:
+        JSONResponse: 就绪状态
+    """
+    def _service_ready(name: str, service) -> bool:
+        if not service or not service.is_initialized:
+            return False
+        return service.is_warm or not settings.service_warmup_enabled or name in warmup_errors
+    
+    checks = {
+        "stt_service": _service_ready("stt_service", stt_service),
+        "llm_service": _service_ready("llm_service", llm_service),
+        "websocket_handler": websocket_handler is not None
+    }
+    ready = all(checks.values())
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "checks": checks,
+            "warmup_enabled": settings.service_warmup_enabled,
+            "warmup_running": bool(warmup_task and not warmup_task.done()),
+            "warmup_errors": dict(warmup_errors)
+        }
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     import time
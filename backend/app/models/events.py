@@ -42,12 +42,40 @@ class MessageStartData(BaseModel):
     """消息开始事件数据"""
     session_id: str = Field(description="会话唯一ID")
     sender: str = Field(description="消息发送者标识")
+    binary_audio: bool = Field(default=False, description="是否使用二进制WebSocket帧发送音频")
+    audio_codec: Literal["pcm", "opus", "ogg_opus"] = Field(
+        default="pcm",
+        description="音频编码：pcm（默认）、opus（每个音频块一个Opus数据包）、ogg_opus（Ogg封装的Opus字节流）"
+    )
+    sample_rate: Optional[int] = Field(
+        default=None,
+        ge=8000,
+        le=192000,
+        description="PCM音频采样率，未提供时为服务端配置的采样率（仅 audio_codec 为 pcm 时有效）"
+    )
+    channels: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=8,
+        description="PCM音频声道数，未提供时为服务端配置的声道数（仅 audio_codec 为 pcm 时有效）"
+    )
+    sample_width: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=4,
+        description="PCM采样位宽（字节）：1为无符号8-bit，2/3/4为有符号小端整数，默认2（仅 audio_codec 为 pcm 时有效）"
+    )
 
 
 class AudioStreamData(BaseModel):
     """音频流事件数据"""
     session_id: str = Field(description="会话唯一ID")
     audio_chunk: str = Field(description="base64编码的音频数据")
+    sequence: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="音频块序号（每条消息从0开始连续递增），提供时服务端按序号去重并记录已连续接收的位置"
+    )
 
 
 class MessageEndData(BaseModel):
@@ -143,6 +171,10 @@ class MessageRecordedData(BaseModel):
     session_id: str = Field(description="目标会话标识")
     message_id: str = Field(description="分配给消息的ID")
     message_content: Optional[str] = Field(default=None, description="消息内容（仅录制消息时包含）")
+    transcription_quality: Optional[str] = Field(
+        default=None,
+        description="最终转录使用的质量层级（full/reduced/minimal，仅启用负载自适应质量时包含）"
+    )
 
 
 class SessionRestoredData(BaseModel):
@@ -154,6 +186,42 @@ class SessionRestoredData(BaseModel):
     response_count: int = Field(description="回答生成数量")
     has_modifications: bool = Field(description="是否有修改建议")
     restored_at: str = Field(description="恢复时间")
+    audio_resume_sequence: Optional[int] = Field(
+        default=None,
+        description="录音中恢复时，客户端应从该音频块序号开始重新发送（之前的音频块已连续接收）"
+    )
+    audio_received_bytes: Optional[int] = Field(
+        default=None,
+        description="录音中恢复时，服务端已连续接收的音频字节数"
+    )
+
+
+class PartialTranscriptionData(BaseModel):
+    """部分转录结果事件数据（渐进式转录）"""
+    session_id: str = Field(description="目标会话标识")
+    partial_text: str = Field(description="当前消息已转录的累积文本")
+    segment_index: int = Field(description="最新完成转录的音频分段序号（从0开始）")
+
+
+class AudioStreamReadyData(BaseModel):
+    """二进制音频流就绪事件数据"""
+    session_id: str = Field(description="目标会话标识")
+    stream_handle: int = Field(description="二进制音频帧帧头中使用的音频流句柄")
+
+
+class AudioBackpressureData(BaseModel):
+    """音频背压事件数据"""
+    session_id: str = Field(description="目标会话标识")
+    reason: Literal["rate_limited", "buffer_full", "sequence_gap"] = Field(
+        description="背压原因：发送速率超限、音频缓冲区已满或音频块序号不连续"
+    )
+    retry_after_ms: Optional[int] = Field(default=None, description="建议暂停发送的时间（毫秒），缓冲区已满时为空")
+    dropped_chunks: int = Field(description="本条消息累计被丢弃的音频块数量")
+    resume_sequence: Optional[int] = Field(
+        default=None,
+        description="客户端应从该音频块序号开始重新发送（仅音频块携带序号时提供）"
+    )
+    message: Optional[str] = Field(default=None, description="背压描述")
 
 
 class LLMResponseData(BaseModel):
@@ -278,6 +346,21 @@ class MessageRecordedEvent(BaseModel):
     data: MessageRecordedData
 
 
+class PartialTranscriptionEvent(BaseModel):
+    type: Literal["partial_transcription_update"] = "partial_transcription_update"
+    data: PartialTranscriptionData
+
+
+class AudioStreamReadyEvent(BaseModel):
+    type: Literal["audio_stream_ready"] = "audio_stream_ready"
+    data: AudioStreamReadyData
+
+
+class AudioBackpressureEvent(BaseModel):
+    type: Literal["audio_backpressure"] = "audio_backpressure"
+    data: AudioBackpressureData
+
+
 class LLMResponseEvent(BaseModel):
     type: Literal["llm_response"] = "llm_response"
     data: LLMResponseData
@@ -332,6 +415,9 @@ IncomingEvent = Union[
 OutgoingEvent = Union[
     SessionCreatedEvent,
     MessageRecordedEvent,
+    PartialTranscriptionEvent,
+    AudioStreamReadyEvent,
+    AudioBackpressureEvent,
     LLMResponseEvent,
     OpinionPredictionEvent,
     StatusUpdateEvent,
@@ -368,6 +454,9 @@ class EventTypes:
     # 后端 → 前端事件
     SESSION_CREATED = "session_created"
     MESSAGE_RECORDED = "message_recorded"
+    PARTIAL_TRANSCRIPTION_UPDATE = "partial_transcription_update"
+    AUDIO_STREAM_READY = "audio_stream_ready"
+    AUDIO_BACKPRESSURE = "audio_backpressure"
     LLM_RESPONSE = "llm_response"
     OPINION_PREDICTION_RESPONSE = "opinion_prediction_response"
     STATUS_UPDATE = "status_update"
@@ -396,10 +485,14 @@ class ErrorCodes:
     SESSION_ALREADY_EXISTS = "SESSION_ALREADY_EXISTS"
     SESSION_EXPIRED = "SESSION_EXPIRED"
     
+    # 音频流错误
+    AUDIO_STREAM_HANDLE_INVALID = "AUDIO_STREAM_HANDLE_INVALID"
+    
     # 服务错误
     STT_SERVICE_ERROR = "STT_SERVICE_ERROR"
     LLM_SERVICE_ERROR = "LLM_SERVICE_ERROR"
     SERVICE_TIMEOUT = "SERVICE_TIMEOUT"
+    SERVICE_OVERLOADED = "SERVICE_OVERLOADED"
     
     # 系统错误
     INTERNAL_ERROR = "INTERNAL_ERROR"
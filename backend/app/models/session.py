@@ -77,6 +77,13 @@ class Session(BaseModel):
     partial_transcription: Optional[str] = Field(default=None, description="断连时的部分转录内容")
     audio_chunks_count: int = Field(default=0, description="断连时已收集的音频块数量") 
     accumulated_audio_data: Optional[bytes] = Field(default=None, description="断连时累积的音频数据")
+    audio_codec: str = Field(default="pcm", description="录音中消息的音频编码（message_start 协商）")
+    audio_input_format: Optional[Dict[str, int]] = Field(default=None, description="录音中消息的PCM输入格式（采样率、声道数、采样位宽）")
+    audio_binary: bool = Field(default=False, description="录音中消息是否使用二进制帧发送音频（重连或服务重启后重新下发句柄）")
+    audio_journal_path: Optional[str] = Field(default=None, description="录音的音频日志文件路径（开始录音时记录）")
+    audio_journal_length: int = Field(default=0, description="断连时音频日志中已落盘的字节数，0表示未知（进程异常退出），恢复时按文件实际长度读取")
+    audio_next_sequence: Optional[int] = Field(default=None, description="断连时下一个期望的音频块序号（客户端使用序号时）")
+    audio_received_bytes: int = Field(default=0, description="断连时已连续接收的音频字节数（客户端使用序号时）")
     is_recovering_from_disconnect: bool = Field(default=False, description="是否正在从断连中恢复")
     
     # 时间戳
@@ -167,12 +174,21 @@ class Session(BaseModel):
         self.status = status
         self.updated_at = datetime.utcnow()
 
-    def start_message(self, sender: str) -> str:
+    def start_message(self, sender: str, audio_codec: str = "pcm", audio_input_format: Optional[Dict[str, int]] = None,
+                      audio_binary: bool = False) -> str:
         """开始新消息，返回临时消息ID"""
         # 生成临时消息ID
         temp_id = f"temp_{len(self.messages)}_{int(datetime.utcnow().timestamp() * 1000)}"
         self.current_message_id = temp_id
         self.current_message_sender = sender
+        self.audio_codec = audio_codec
+        self.audio_input_format = audio_input_format
+        self.audio_binary = audio_binary
+        # 上一条消息的音频日志位置对新消息无效
+        self.audio_journal_path = None
+        self.audio_journal_length = 0
+        self.audio_next_sequence = None
+        self.audio_received_bytes = 0
         self.update_status(SessionStatus.RECORDING_MESSAGE)
         return temp_id
 
@@ -193,6 +209,13 @@ class Session(BaseModel):
         self.partial_transcription = None
         self.audio_chunks_count = 0
         self.accumulated_audio_data = None
+        self.audio_codec = "pcm"
+        self.audio_input_format = None
+        self.audio_binary = False
+        self.audio_journal_path = None
+        self.audio_journal_length = 0
+        self.audio_next_sequence = None
+        self.audio_received_bytes = 0
         self.is_recovering_from_disconnect = False
         self.update_status(SessionStatus.IDLE)
         
@@ -210,6 +233,18 @@ class Session(BaseModel):
         self.audio_chunks_count = len(audio_data) if audio_data else 0
         self.updated_at = datetime.utcnow()
 
+    def set_audio_journal(self, path: str, length: int):
+        """记录音频日志位置（开始录音时长度为0，断连时更新为已落盘长度；会话持久化时只保存路径和长度）"""
+        self.audio_journal_path = path
+        self.audio_journal_length = length
+        self.updated_at = datetime.utcnow()
+
+    def set_audio_upload_progress(self, next_sequence: int, received_bytes: int):
+        """记录断连时音频块的续传位置"""
+        self.audio_next_sequence = next_sequence
+        self.audio_received_bytes = received_bytes
+        self.updated_at = datetime.utcnow()
+
     def get_accumulated_audio(self) -> Optional[bytes]:
         """获取断连时保存的累积音频数据"""
         return self.accumulated_audio_data
@@ -246,6 +281,13 @@ class Session(BaseModel):
             "active_response_request_id": self.active_response_request_id,
             "partial_transcription": self.partial_transcription,
             "audio_chunks_count": self.audio_chunks_count,
+            "audio_codec": self.audio_codec,
+            "audio_input_format": self.audio_input_format,
+            "audio_binary": self.audio_binary,
+            "audio_journal_path": self.audio_journal_path,
+            "audio_journal_length": self.audio_journal_length,
+            "audio_next_sequence": self.audio_next_sequence,
+            "audio_received_bytes": self.audio_received_bytes,
             "is_recovering_from_disconnect": self.is_recovering_from_disconnect,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
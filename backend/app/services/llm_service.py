@@ -21,6 +21,7 @@ class LLMService:
     
     def __init__(self):
         self.is_initialized = False
+        self.is_warm = False
         self.client = None
         self.response_system_prompt = ""
         self.opinion_system_prompt = ""
@@ -98,6 +99,16 @@ class LLMService:
         self.opinion_system_prompt = self._read_prompt_file(default_opinion_path)
         self.response_generation_requirements = self._read_prompt_file(default_requirements_path)
     
+    async def warm_up(self) -> bool:
+        """
+        预热LLM服务（Mock模式无需预热，初始化完成即可）
+        
+        Returns:
+            bool: 预热是否成功
+        """
+        self.is_warm = self.is_initialized
+        return self.is_warm
+    
     async def shutdown(self):
         """关闭LLM服务"""
         try:
@@ -443,6 +454,7 @@ class LLMService:
             "service": "LLM",
             "status": "healthy" if self.is_initialized else "unhealthy",
             "initialized": self.is_initialized,
+            "warm": self.is_warm,
             "api_configured": bool(settings.openrouter_api_key),
             "base_url": settings.openrouter_base_url,
             "mode": "mock" if not settings.openrouter_api_key else "openrouter"
@@ -495,6 +507,24 @@ class OpenRouterLLMService(LLMService):
             logger.error(f"OpenRouter LLM服务初始化失败: {e}")
             return False
     
+    async def warm_up(self) -> bool:
+        """
+        预热OpenRouter连接：发送一次轻量的模型列表请求，提前完成DNS解析和TLS握手
+        
+        预热请求失败不影响就绪状态（API可能稍后恢复），只记录警告。
+        """
+        if not self.is_initialized or not self.api_client:
+            return False
+        
+        try:
+            await asyncio.wait_for(self.api_client.models.list(), timeout=settings.llm_timeout)
+            logger.info("OpenRouter连接预热完成")
+        except Exception as e:
+            logger.warning(f"OpenRouter连接预热失败: {e}")
+        
+        self.is_warm = True
+        return True
+    
     async def _call_llm(self, messages: List[Dict[str, str]], response_format: str = "auto", max_tokens: int = None, count: int = 3) -> Optional[Dict[str, Any]]:
         """真实的OpenRouter API调用"""
         if not self.api_client:
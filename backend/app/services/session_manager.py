@@ -113,13 +113,17 @@ class SessionManager:
     # 消息管理
     # ===============================
     
-    def start_message(self, session_id: str, sender: str) -> str:
+    def start_message(self, session_id: str, sender: str, audio_codec: str = "pcm",
+                      audio_input_format: Optional[Dict[str, int]] = None, audio_binary: bool = False) -> str:
         """
         开始新消息
         
         Args:
             session_id: 会话ID
             sender: 消息发送者
+            audio_codec: 消息音频编码
+            audio_input_format: PCM输入格式（采样率、声道数、采样位宽），未声明时为None
+            audio_binary: 是否使用二进制帧发送音频
             
         Returns:
             str: 临时消息ID
@@ -131,7 +135,7 @@ class SessionManager:
         if not session:
             raise ValueError(f"会话不存在: {session_id}")
         
-        temp_id = session.start_message(sender)
+        temp_id = session.start_message(sender, audio_codec, audio_input_format, audio_binary)
         
         logger.info(f"消息开始: {session_id}, 发送者: {sender}, 临时ID: {temp_id}")
         
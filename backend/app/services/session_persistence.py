@@ -61,6 +61,14 @@ class SessionPersistenceManager:
             "user_profile": session.user_profile.dict() if session.user_profile else None,
             "target_profile": session.target_profile.dict() if session.target_profile else None,
             "current_message_sender": session.current_message_sender,
+            # 录音中断连时只保存音频日志的位置，音频本身不写入JSON
+            "audio_codec": session.audio_codec,
+            "audio_input_format": session.audio_input_format,
+            "audio_binary": session.audio_binary,
+            "audio_journal_path": session.audio_journal_path,
+            "audio_journal_length": session.audio_journal_length,
+            "audio_next_sequence": session.audio_next_sequence,
+            "audio_received_bytes": session.audio_received_bytes,
             "active_opinion_request_id": session.active_opinion_request_id,
             "active_response_request_id": session.active_response_request_id,
             "created_at": session.created_at.isoformat(),
@@ -89,6 +97,13 @@ class SessionPersistenceManager:
         session.user_profile = ProfileArchive(**user_profile) if user_profile else None
         session.target_profile = ProfileArchive(**target_profile) if target_profile else None
         session.current_message_sender = data.get("current_message_sender")
+        session.audio_codec = data.get("audio_codec", "pcm")
+        session.audio_input_format = data.get("audio_input_format")
+        session.audio_binary = data.get("audio_binary", False)
+        session.audio_journal_path = data.get("audio_journal_path")
+        session.audio_journal_length = data.get("audio_journal_length", 0)
+        session.audio_next_sequence = data.get("audio_next_sequence")
+        session.audio_received_bytes = data.get("audio_received_bytes", 0)
         session.active_opinion_request_id = data.get("active_opinion_request_id")
         session.active_response_request_id = data.get("active_response_request_id")
         
@@ -237,6 +252,7 @@ class SessionPersistenceManager:
                     file_mtime = datetime.fromtimestamp(session_file.stat().st_mtime)
                     
                     if file_mtime < cutoff_time:
+                        self._remove_audio_journal(session_file)
                         session_file.unlink()
                         cleaned_count += 1
                         logger.debug(f"清理过期会话文件: {session_file.stem}")
@@ -253,6 +269,16 @@ class SessionPersistenceManager:
             logger.error(f"清理过期会话失败: {e}")
             return 0
     
+    def _remove_audio_journal(self, session_file: Path):
+        """删除过期会话引用的音频日志文件"""
+        try:
+            journal_path = json.loads(session_file.read_text(encoding='utf-8')).get("audio_journal_path")
+            if journal_path and os.path.exists(journal_path):
+                os.unlink(journal_path)
+                logger.debug(f"清理过期音频日志: {journal_path}")
+        except (OSError, ValueError) as e:
+            logger.error(f"清理音频日志失败 {session_file}: {e}")
+    
     async def get_session_info(self, session_id: str) -> Optional[dict]:
         """
         获取会话基本信息（不完全加载会话）
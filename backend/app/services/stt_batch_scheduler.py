@@ -0,0 +1,260 @@
+"""
+跨会话Whisper批量推理调度器
+
+在短时间窗口内收集来自不同会话的转录请求，拼接为一段音频并通过
+clip_timestamps 划分为多个片段，交给 faster-whisper 的 BatchedInferencePipeline
+一次批量推理，再按片段把结果分发回各自请求的 Future。
+
+与单独转录的差异：片段由 clip_timestamps 划定，批量推理不做 VAD 过滤
+（vad_filter），也不以前文为条件解码（condition_on_previous_text）。
+请求中启用的这两个参数会被忽略，首次出现时记录警告，并计入统计。
+"""
+import asyncio
+import bisect
+import contextlib
+import dataclasses
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper单个片段最多处理30秒音频，超过的请求不参与批量推理
+MAX_BATCH_CLIP_SECONDS = 30.0
+
+# 批量推理不支持或会被忽略的参数（启用时记录到 dropped_option_requests）
+_UNBATCHED_OPTIONS = ("vad_filter", "condition_on_previous_text")
+
+
+class WhisperBatchScheduler:
+    """跨会话的Whisper批量推理调度器"""
+
+    def __init__(self, model, batch_size: int, window_ms: int, sample_rate: int = 16000, executor=None,
+                 replica_pool=None):
+        """
+        初始化批量调度器
+
+        Args:
+            model: 已加载的WhisperModel
+            batch_size: 单批次最大请求数，达到后立即执行
+            window_ms: 收集请求的时间窗口（毫秒）
+            sample_rate: 音频采样率
+            executor: 执行批量推理的STTExecutor，为None时使用默认线程池；
+                等待凑批的请求计入该执行器的队列深度和准入控制
+            replica_pool: 模型副本池，每个批次占用一个副本槽位（为None时不记账）
+        """
+        from faster_whisper import BatchedInferencePipeline
+
+        self.pipeline = BatchedInferencePipeline(model=model)
+        self.batch_size = max(batch_size, 1)
+        self.window_seconds = max(window_ms, 0) / 1000.0
+        self.sample_rate = sample_rate
+        self.executor = executor
+        self.replica_pool = replica_pool
+
+        # 按转录参数分组的待处理请求: key -> [(audio, future)]
+        self.pending: Dict[Tuple, List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self.pending_options: Dict[Tuple, Dict[str, Any]] = {}
+        self.flush_timers: Dict[Tuple, asyncio.Task] = {}
+        self.running_batches: set = set()
+        if executor:
+            executor.backlog_counter = self.pending_count
+
+        # 统计信息
+        self.total_batches = 0
+        self.total_requests = 0
+        # 启用了被忽略参数的请求数
+        self.dropped_option_requests = 0
+
+    def accepts(self, sample_count: int, options: Dict[str, Any]) -> bool:
+        """
+        判断请求是否适合批量推理
+
+        单片段不超过30秒，且已指定语言（配置或会话锁定）。批量推理只对合并后的音频检测一次语言
+        并强制用于所有片段，未指定语言的请求需要单独转录以按各自音频检测语言。
+        """
+        return options.get("language") is not None and 0 < sample_count <= MAX_BATCH_CLIP_SECONDS * self.sample_rate
+
+    def pending_count(self) -> int:
+        """等待凑批的请求数"""
+        return sum(len(items) for items in self.pending.values())
+
+    async def submit(self, audio: np.ndarray, options: Dict[str, Any]):
+        """
+        提交一个转录请求，等待所在批次完成
+
+        Args:
+            audio: float32单声道音频
+            options: 转录参数
+
+        Returns:
+            Tuple[List, Any]: 该请求的分段列表和该请求自己的TranscriptionInfo
+
+        Raises:
+            STTOverloadedError: 执行器队列已满（包括等待凑批的请求）
+        """
+        if self.executor:
+            self.executor.check_admission()
+
+        batch_options = {k: v for k, v in options.items() if k not in _UNBATCHED_OPTIONS}
+        dropped = [k for k in _UNBATCHED_OPTIONS if options.get(k)]
+        if dropped:
+            if self.dropped_option_requests == 0:
+                logger.warning(f"批量推理忽略以下转录参数，结果可能与单独转录不同: {', '.join(dropped)}")
+            self.dropped_option_requests += 1
+            logger.debug(f"批量推理请求忽略参数: {dropped}")
+        key = self._options_key(batch_options)
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.pending.setdefault(key, []).append((audio, future))
+        self.pending_options[key] = batch_options
+
+        if len(self.pending[key]) >= self.batch_size:
+            self._flush(key)
+        elif key not in self.flush_timers:
+            self.flush_timers[key] = asyncio.create_task(self._flush_after_window(key))
+
+        return await future
+
+    @staticmethod
+    def _options_key(options: Dict[str, Any]) -> Tuple:
+        """只有转录参数完全相同的请求才能合并到同一批次"""
+        return tuple(sorted((k, repr(v)) for k, v in options.items()))
+
+    async def _flush_after_window(self, key: Tuple):
+        """时间窗口结束后执行批次"""
+        try:
+            await asyncio.sleep(self.window_seconds)
+        except asyncio.CancelledError:
+            return
+        self.flush_timers.pop(key, None)
+        self._flush(key)
+
+    def _flush(self, key: Tuple):
+        """取出该分组的全部待处理请求并启动批量推理"""
+        timer = self.flush_timers.pop(key, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+
+        items = self.pending.pop(key, [])
+        options = self.pending_options.pop(key, {})
+        if not items:
+            return
+
+        task = asyncio.create_task(self._execute_batch(items, options))
+        self.running_batches.add(task)
+        task.add_done_callback(self.running_batches.discard)
+
+    async def _execute_batch(self, items: List[Tuple[np.ndarray, asyncio.Future]], options: Dict[str, Any]):
+        """在线程池中执行批量推理，并把结果分发给各请求"""
+        audios = [audio for audio, _ in items]
+
+        try:
+            if self.executor:
+                results = await self.executor.run(self._run_batch, audios, options)
+            else:
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(None, self._run_batch, audios, options)
+        except asyncio.CancelledError:
+            # 服务关闭时批次被取消，同时取消各请求，避免等待结果的调用方永久阻塞
+            for _, future in items:
+                if not future.done():
+                    future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Whisper批量推理失败: 批次大小 {len(items)}, {e}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.total_batches += 1
+        self.total_requests += len(items)
+        logger.debug(f"Whisper批量推理完成: 批次大小 {len(items)}")
+
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _run_batch(self, audios: List[np.ndarray], options: Dict[str, Any]):
+        """同步执行批量推理（工作线程中调用，整个批次占用一个模型副本）"""
+        audio_seconds = sum(audio.shape[0] for audio in audios) / self.sample_rate
+        with self.replica_pool.acquire(audio_seconds) if self.replica_pool else contextlib.nullcontext():
+            return self._transcribe_batch(audios, options)
+
+    def _transcribe_batch(self, audios: List[np.ndarray], options: Dict[str, Any]):
+        """
+        批量转录并拆分结果
+
+        各请求的音频首尾相接，每段对应一个clip，批量推理后按分段起始时间归属回各请求，
+        并将时间戳换算为相对该请求音频的时间。
+        """
+        offsets = []
+        clips = []
+        position = 0
+        for audio in audios:
+            offsets.append(position / self.sample_rate)
+            clips.append({
+                "start": position / self.sample_rate,
+                "end": (position + audio.shape[0]) / self.sample_rate
+            })
+            position += audio.shape[0]
+
+        merged_audio = np.concatenate(audios)
+        segment_iter, info = self.pipeline.transcribe(
+            merged_audio,
+            clip_timestamps=clips,
+            batch_size=len(audios),
+            **options
+        )
+
+        results: List[List[Any]] = [[] for _ in audios]
+        for segment in segment_iter:
+            # 加上少量容差，避免浮点误差把分段归到前一个请求
+            index = max(bisect.bisect_right(offsets, segment.start + 1e-3) - 1, 0)
+            offset = offsets[index]
+            results[index].append(
+                dataclasses.replace(segment, start=segment.start - offset, end=segment.end - offset)
+            )
+
+        # 每个请求返回独立的TranscriptionInfo，时长为该请求自己的音频时长
+        return [
+            (segments, dataclasses.replace(
+                info,
+                duration=audio.shape[0] / self.sample_rate,
+                duration_after_vad=audio.shape[0] / self.sample_rate
+            ))
+            for segments, audio in zip(results, audios)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取调度器统计信息"""
+        return {
+            "batch_size": self.batch_size,
+            "window_ms": int(self.window_seconds * 1000),
+            "pending_requests": self.pending_count(),
+            "running_batches": len(self.running_batches),
+            "total_batches": self.total_batches,
+            "total_requests": self.total_requests,
+            "dropped_option_requests": self.dropped_option_requests,
+            "ignored_options": list(_UNBATCHED_OPTIONS),
+            "average_batch_size": round(self.total_requests / self.total_batches, 2) if self.total_batches else 0
+        }
+
+    async def shutdown(self):
+        """取消所有等待中的请求和批次"""
+        for timer in self.flush_timers.values():
+            timer.cancel()
+        self.flush_timers.clear()
+
+        for items in self.pending.values():
+            for _, future in items:
+                if not future.done():
+                    future.cancel()
+        self.pending.clear()
+        self.pending_options.clear()
+
+        for task in list(self.running_batches):
+            task.cancel()
@@ -0,0 +1,180 @@
+"""
+STT专用执行器
+
+STT推理使用独立的有界线程池，不再与会话持久化等文件I/O共享默认线程池。
+并发数由 max_workers 决定，等待队列有上限；队列已满或超过 stt_timeout 时
+抛出明确的异常，由上层转换为客户端错误事件。
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class STTOverloadedError(Exception):
+    """STT等待队列已满，请求被拒绝"""
+
+
+class STTTimeoutError(Exception):
+    """STT请求排队加执行时间超过超时限制"""
+
+
+class STTExecutor:
+    """有界STT执行器（带准入控制和队列指标）"""
+
+    def __init__(self, max_workers: int, max_queue_size: int, timeout: float, name: str = "stt"):
+        """
+        初始化STT执行器
+
+        Args:
+            max_workers: 同时执行的推理任务数（线程池大小）
+            max_queue_size: 等待执行的最大请求数，超过后直接拒绝
+            timeout: 单个请求从排队到完成的超时时间（秒）
+            name: 执行器名称，用于线程名和日志
+        """
+        self.name = name
+        self.max_workers = max(max_workers, 1)
+        self.max_queue_size = max(max_queue_size, 0)
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-worker")
+
+        # 执行槽位在首次使用时创建，确保绑定到运行中的事件循环
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # 尚未提交到执行器的外部积压请求数（如批量调度器中等待凑批的请求），计入队列深度和准入控制
+        self.backlog_counter: Optional[Callable[[], int]] = None
+
+        # 队列指标
+        self.queued = 0
+        self.running = 0
+        self.completed_count = 0
+        self.rejected_count = 0
+        self.timeout_count = 0
+        self.failed_count = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.recent_wait_times = deque(maxlen=200)
+
+    @property
+    def queue_depth(self) -> int:
+        """排队中的请求数（包括外部积压的请求）"""
+        backlog = self.backlog_counter() if self.backlog_counter else 0
+        return self.queued + backlog
+
+    def check_admission(self):
+        """
+        检查是否还能接受新请求
+
+        Raises:
+            STTOverloadedError: 等待队列已满
+        """
+        queue_depth = self.queue_depth
+        if queue_depth + self.running >= self.max_workers + self.max_queue_size:
+            self.rejected_count += 1
+            logger.warning(f"{self.name}执行器队列已满，拒绝请求: 排队 {queue_depth}, 执行中 {self.running}")
+            raise STTOverloadedError(f"STT服务繁忙，等待队列已满 (排队: {queue_depth}, 执行中: {self.running})")
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        在STT线程池中执行同步函数
+
+        Raises:
+            STTOverloadedError: 等待队列已满
+            STTTimeoutError: 排队加执行超过超时时间
+        """
+        slots = self._get_slots()
+
+        # 执行中和排队中的请求都在同步代码中计数，避免并发提交时的竞态
+        self.check_admission()
+
+        loop = asyncio.get_event_loop()
+        enqueued_at = time.monotonic()
+        deadline = enqueued_at + self.timeout
+
+        # 排队等待执行槽位
+        self.queued += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeout_count += 1
+            logger.warning(f"{self.name}执行器排队超时: {self.timeout}秒")
+            raise STTTimeoutError(f"STT请求排队超时 ({self.timeout}秒)")
+        finally:
+            self.queued -= 1
+
+        wait_time = time.monotonic() - enqueued_at
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        self.recent_wait_times.append(wait_time)
+
+        # 槽位在线程真正结束时释放，超时返回后线程仍占用槽位，避免超额并发
+        self.running += 1
+        try:
+            concurrent_future = self.executor.submit(func, *args)
+        except Exception:
+            self.running -= 1
+            slots.release()
+            raise
+
+        def _release(_):
+            try:
+                loop.call_soon_threadsafe(self._on_task_done, slots)
+            except RuntimeError:
+                # 事件循环已关闭（被取消的请求在服务关闭后才结束），无需再释放槽位
+                pass
+
+        concurrent_future.add_done_callback(_release)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(concurrent_future),
+                timeout=max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            self.timeout_count += 1
+            logger.warning(f"{self.name}执行器任务超时: {self.timeout}秒")
+            raise STTTimeoutError(f"STT处理超时 ({self.timeout}秒)")
+        except Exception:
+            self.failed_count += 1
+            raise
+
+    def _on_task_done(self, slots: asyncio.Semaphore):
+        self.running -= 1
+        self.completed_count += 1
+        slots.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取队列深度和等待时间指标"""
+        recent = sorted(self.recent_wait_times)
+        p95 = recent[min(int(len(recent) * 0.95), len(recent) - 1)] if recent else 0.0
+        waited_count = self.completed_count + self.running
+
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "timeout_seconds": self.timeout,
+            "queue_depth": self.queue_depth,
+            "backlog": self.queue_depth - self.queued,
+            "running": self.running,
+            "completed": self.completed_count,
+            "rejected": self.rejected_count,
+            "timeouts": self.timeout_count,
+            "failed": self.failed_count,
+            "avg_wait_ms": round(self.total_wait_time / waited_count * 1000, 2) if waited_count else 0,
+            "p95_wait_ms": round(p95 * 1000, 2),
+            "max_wait_ms": round(self.max_wait_time * 1000, 2)
+        }
+
+    def shutdown(self):
+        """关闭线程池（不等待执行中的任务）"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
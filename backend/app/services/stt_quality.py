@@ -0,0 +1,100 @@
+"""
+负载自适应的STT转录质量策略
+
+STT执行器排队过深或等待时间过长时，逐级降低最终转录的解码质量换取吞吐：
+    full     使用配置的 beam_size 和词级时间戳
+    reduced  降低 beam_size，关闭词级时间戳
+    minimal  在 reduced 基础上改用已加载的部分转录小模型
+负载超过阈值时立即降级；负载回落后需持续 recover_seconds 才逐级恢复，避免在阈值附近频繁抖动。
+"""
+import logging
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+QUALITY_TIERS = ("full", "reduced", "minimal")
+
+
+class AdaptiveQualityPolicy:
+    """根据STT队列深度和等待时间选择转录质量层级"""
+
+    def __init__(self, queue_depth_threshold: int, wait_ms_threshold: float, recover_seconds: float,
+                 allow_minimal: bool = False):
+        """
+        初始化质量策略
+
+        Args:
+            queue_depth_threshold: 排队请求数达到该值时降到 reduced，达到两倍时降到 minimal
+            wait_ms_threshold: 最近一次排队等待达到该毫秒数时降到 reduced，达到两倍时降到 minimal
+            recover_seconds: 负载回落后保持当前层级的最短时间（秒）
+            allow_minimal: 是否允许降到 minimal（需要已加载部分转录小模型）
+        """
+        self.queue_depth_threshold = max(queue_depth_threshold, 1)
+        self.wait_ms_threshold = max(wait_ms_threshold, 1.0)
+        self.recover_seconds = recover_seconds
+        self.max_level = len(QUALITY_TIERS) - 1 if allow_minimal else 1
+
+        self.level = 0
+        self._calm_since = None
+
+        # 各层级被选用的次数
+        self.tier_counts: Dict[str, int] = {tier: 0 for tier in QUALITY_TIERS}
+        self.degrade_count = 0
+
+    def _load_level(self, queue_depth: int, wait_ms: float) -> int:
+        """按当前负载计算应处的层级"""
+        level = 0
+        if queue_depth >= self.queue_depth_threshold or wait_ms >= self.wait_ms_threshold:
+            level = 1
+        if queue_depth >= 2 * self.queue_depth_threshold or wait_ms >= 2 * self.wait_ms_threshold:
+            level = 2
+        return min(level, self.max_level)
+
+    def select(self, queue_depth: int, wait_ms: float) -> str:
+        """
+        根据当前负载选择本次转录的质量层级
+
+        Args:
+            queue_depth: STT执行器当前排队请求数
+            wait_ms: 最近一次请求的排队等待时间（毫秒）
+
+        Returns:
+            str: 质量层级（full / reduced / minimal）
+        """
+        target = self._load_level(queue_depth, wait_ms)
+        now = time.monotonic()
+
+        if target > self.level:
+            logger.warning(
+                f"STT负载过高，转录质量降级: {QUALITY_TIERS[self.level]} -> {QUALITY_TIERS[target]} "
+                f"(排队 {queue_depth}, 等待 {wait_ms:.0f}ms)"
+            )
+            self.level = target
+            self.degrade_count += 1
+            self._calm_since = None
+        elif target < self.level:
+            # 负载回落后持续一段时间才恢复一级
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= self.recover_seconds:
+                self.level -= 1
+                self._calm_since = now if target < self.level else None
+                logger.info(f"STT负载回落，转录质量恢复到 {QUALITY_TIERS[self.level]}")
+        else:
+            self._calm_since = None
+
+        tier = QUALITY_TIERS[self.level]
+        self.tier_counts[tier] += 1
+        return tier
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取当前质量层级和各层级使用次数"""
+        return {
+            "current_tier": QUALITY_TIERS[self.level],
+            "queue_depth_threshold": self.queue_depth_threshold,
+            "wait_ms_threshold": self.wait_ms_threshold,
+            "recover_seconds": self.recover_seconds,
+            "degrade_count": self.degrade_count,
+            "tier_counts": dict(self.tier_counts)
+        }
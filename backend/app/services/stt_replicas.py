@@ -0,0 +1,89 @@
+"""
+进程内Whisper模型副本池
+
+WhisperModel 以 num_workers=N 创建时，CTranslate2 在同一进程内加载 N 个模型副本，
+多个Python线程同时调用 transcribe 时可以真正并行（每个副本使用 cpu_threads 个计算线程）。
+CTranslate2 不暴露请求落在哪个副本上，这里按槽位记账：每次推理前选择当前最空闲的槽位
+（进行中请求最少，其次累计占用时间最短），推理结束后累计占用时间，用于健康检查中的副本利用率。
+STT执行器并发数与副本数相同时，每个进行中的请求恰好占用一个副本。
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+
+class ModelReplicaPool:
+    """模型副本的最少负载分配和利用率统计（线程安全，在推理工作线程中调用）"""
+
+    def __init__(self, num_replicas: int, cpu_threads: int):
+        """
+        初始化副本池
+
+        Args:
+            num_replicas: 模型副本数（WhisperModel 的 num_workers）
+            cpu_threads: 每个副本的CPU线程数
+        """
+        self.num_replicas = max(num_replicas, 1)
+        self.cpu_threads = cpu_threads
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.replicas: List[Dict[str, Any]] = [
+            {"active": 0, "requests": 0, "busy_seconds": 0.0, "audio_seconds": 0.0}
+            for _ in range(self.num_replicas)
+        ]
+
+    @contextmanager
+    def acquire(self, audio_seconds: float = 0.0):
+        """
+        占用最空闲的副本槽位执行一次推理
+
+        Args:
+            audio_seconds: 本次推理的音频时长（秒），用于统计实时率
+
+        Yields:
+            int: 副本编号
+        """
+        with self._lock:
+            index = min(
+                range(self.num_replicas),
+                key=lambda i: (self.replicas[i]["active"], self.replicas[i]["busy_seconds"])
+            )
+            replica = self.replicas[index]
+            replica["active"] += 1
+            replica["requests"] += 1
+
+        start_time = time.perf_counter()
+        try:
+            yield index
+        finally:
+            elapsed = time.perf_counter() - start_time
+            with self._lock:
+                replica["active"] -= 1
+                replica["busy_seconds"] += elapsed
+                replica["audio_seconds"] += audio_seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各副本的请求数、占用时间和利用率"""
+        uptime = max(time.monotonic() - self.started_at, 1e-6)
+        with self._lock:
+            replicas = [
+                {
+                    "replica": index,
+                    "active": replica["active"],
+                    "requests": replica["requests"],
+                    "busy_seconds": round(replica["busy_seconds"], 3),
+                    "utilization": round(min(replica["busy_seconds"] / uptime, 1.0), 4),
+                    "real_time_factor": (
+                        round(replica["busy_seconds"] / replica["audio_seconds"], 3)
+                        if replica["audio_seconds"] else None
+                    )
+                }
+                for index, replica in enumerate(self.replicas)
+            ]
+        return {
+            "num_replicas": self.num_replicas,
+            "cpu_threads_per_replica": self.cpu_threads,
+            "active_requests": sum(replica["active"] for replica in replicas),
+            "replicas": replicas
+        }
@@ -3,28 +3,158 @@ STT (Speech-to-Text) 服务 - 累积处理模式
 """
 import asyncio
 import base64
+import contextlib
 import logging
 from typing import Dict, Optional, Any, List
 from datetime import datetime, timedelta
 import json
+import os
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from config.settings import settings
+from app.services.stt_executor import STTExecutor, STTOverloadedError, STTTimeoutError
+from app.services.stt_quality import AdaptiveQualityPolicy
+from app.services.stt_replicas import ModelReplicaPool
+from app.utils.audio_buffer import AudioBuffer
+from app.utils.audio_codec import OpusStreamDecoder, is_codec_available
+from app.utils.audio_journal import AudioJournal
+from app.utils.audio_resampler import PCMFormatConverter
+from app.utils.audio_processing import pcm16_to_float32, find_silence_split_points
+from app.utils.transcription_cache import TranscriptionCache
+from app.utils.vad import StreamingEnergyVAD
 
 logger = logging.getLogger(__name__)
 
+# 词之间不使用空格分隔的语言（Whisper语言代码），分段文本直接拼接；其他语言以空格分隔
+UNSPACED_LANGUAGES = frozenset({"zh", "yue", "ja", "th", "lo", "my", "km", "bo"})
+# 上述语言文字的Unicode区段（泰文、老挝文、藏文、缅甸文、高棉文、中日文及全角符号）
+_UNSPACED_RANGES = (
+    (0x0E00, 0x0FFF), (0x1000, 0x109F), (0x1780, 0x17FF),
+    (0x2E80, 0x312F), (0x3190, 0x9FFF), (0xF900, 0xFAFF), (0xFF00, 0xFFEF), (0x20000, 0x3FFFF)
+)
+
+
+def _is_unspaced_char(char: str) -> bool:
+    """字符是否属于不使用空格分词的文字"""
+    code = ord(char)
+    return any(start <= code <= end for start, end in _UNSPACED_RANGES)
+
 
 class STTService:
     """STT服务管理器 - 累积处理模式"""
     
     def __init__(self):
         self.is_initialized = False
+        self.is_warm = False
+        self.last_warmup_error: Optional[str] = None
         self.model = None
         self.active_streams: Dict[str, Dict[str, Any]] = {}
         self.cleanup_task = None
         
+        # STT专用执行器（真实推理引擎初始化时创建）
+        self.executor: Optional[STTExecutor] = None
+        
+        # 启动耗时（秒）：引擎库导入和模型加载
+        self.startup_timing: Dict[str, float] = {}
+        
+        # 最近一次最终转录使用的质量层级（由WebSocket处理器取出后随message_recorded返回）
+        self.transcription_quality: Dict[str, str] = {}
+        
+        # 最终转录结果缓存（断连恢复、重试时相同音频直接返回）
+        self.transcription_cache: Optional[TranscriptionCache] = (
+            TranscriptionCache(settings.stt_result_cache_size) if settings.stt_result_cache_size > 0 else None
+        )
+        
+        # 部分转录结果回调（由WebSocket处理器注入）
+        self.partial_result_callback = None
+        
         # 缓冲区配置
         self.max_buffer_size = settings.audio_buffer_max_size
+    
+    def set_partial_result_callback(self, callback):
+        """
+        设置部分转录结果回调
+        
+        Args:
+            callback: 异步回调函数，签名为 callback(session_id, partial_text, segment_index)
+        """
+        self.partial_result_callback = callback
+    
+    async def _emit_partial_result(self, session_id: str, partial_text: str, segment_index: int):
+        """推送部分转录结果，回调异常不影响转录流程"""
+        if not self.partial_result_callback:
+            return
+        
+        try:
+            await self.partial_result_callback(session_id, partial_text, segment_index)
+        except Exception as e:
+            logger.error(f"推送部分转录结果失败 {session_id}: {e}")
+    
+    async def warm_up(self) -> bool:
+        """
+        预热STT服务：用合成音频完整执行一次推理，让首个真实请求不再承担
+        推理引擎的延迟初始化和模型内存换入开销
+        
+        Returns:
+            bool: 预热是否成功
+        """
+        if not self.is_initialized:
+            logger.warning("STT服务未初始化，跳过预热")
+            return False
+        
+        start_time = time.time()
+        try:
+            await self._warm_up_inference(self._synthetic_warmup_clip())
+        except Exception as e:
+            self.last_warmup_error = str(e) or type(e).__name__
+            logger.error(f"STT服务预热失败: {e}")
+            return False
+        
+        self.is_warm = True
+        self.last_warmup_error = None
+        logger.info(f"STT服务预热完成，耗时 {time.time() - start_time:.2f}秒")
+        return True
+    
+    async def _warm_up_inference(self, audio_bytes: bytes):
+        """执行预热推理（Mock模式无需预热）"""
+        pass
+    
+    @staticmethod
+    def _synthetic_warmup_clip(seconds: float = 1.0) -> bytes:
+        """生成预热用的合成音频：低幅度噪声叠加正弦音（16-bit PCM）"""
+        sample_count = int(settings.audio_sample_rate * seconds)
+        t = np.arange(sample_count, dtype=np.float32) / settings.audio_sample_rate
+        rng = np.random.default_rng(0)
+        signal = 0.1 * np.sin(2 * np.pi * 440.0 * t) + 0.01 * rng.standard_normal(sample_count).astype(np.float32)
+        samples = (signal * 32767).astype("<i2")
+        if settings.audio_channels > 1:
+            samples = np.repeat(samples, settings.audio_channels)
+        return samples.tobytes()
+    
+    def pop_transcription_quality(self, session_id: str) -> Optional[str]:
+        """取出会话最近一次最终转录使用的质量层级（未启用自适应质量时为None）"""
+        return self.transcription_quality.pop(session_id, None)
+    
+    async def release_session(self, session_id: str):
+        """对话结束时释放会话级别（跨消息）的STT状态，以及未完成消息的音频流和音频日志"""
+        self.transcription_quality.pop(session_id, None)
+        if session_id in self.active_streams:
+            await self.stop_stream_processing(session_id)
+            self._remove_stream(session_id)
+        elif settings.audio_journal_enabled:
+            AudioJournal.remove(self._audio_journal_path(session_id))
+    
+    async def _run_blocking(self, func, *args):
+        """在STT专用执行器中运行阻塞的推理函数（未创建时退回默认线程池）"""
+        if self.executor:
+            return await self.executor.run(func, *args)
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func, *args)
         
     async def initialize(self) -> bool:
         """
@@ -58,6 +188,11 @@ class STTService:
             session_ids = list(self.active_streams.keys())
             for session_id in session_ids:
                 await self.stop_stream_processing(session_id)
+                # 保留音频日志，重启后可恢复录音中的消息
+                self._remove_stream(session_id, discard_journal=False)
+            
+            if self.executor:
+                self.executor.shutdown()
             
             self.is_initialized = False
             logger.info("STT服务已关闭")
@@ -84,17 +219,24 @@ class STTService:
             logger.warning(f"会话 {session_id} 的音频流已在处理中，重置流状态")
             # 保留现有音频数据
             existing_stream = self.active_streams[session_id]
-            existing_audio = existing_audio or b''.join(existing_stream.get("audio_chunks", []))
+            existing_audio = existing_audio or existing_stream["audio_buffer"].view()
         
         try:
+            previous_stream = self.active_streams.get(session_id)
+            
             # 创建流处理状态
             self.active_streams[session_id] = {
                 "start_time": datetime.utcnow(),
-                "audio_chunks": [existing_audio] if existing_audio else [],
+                "audio_buffer": self._create_audio_buffer(session_id, existing_audio),
+                "journal": self._open_audio_journal(session_id, existing_audio),
+                "vad": self._create_vad(),
                 "total_bytes": len(existing_audio) if existing_audio else 0,
                 "is_disconnection_recovery": existing_audio is not None
             }
             
+            if previous_stream:
+                self._close_stream_resources(previous_stream, discard_journal=False)
+            
             if existing_audio:
                 logger.info(f"恢复音频流处理: {session_id}, 已有音频: {len(existing_audio)} 字节")
             else:
@@ -105,7 +247,201 @@ class STTService:
             logger.error(f"开始音频流处理失败 {session_id}: {e}")
             return False
     
-    async def process_audio_chunk(self, session_id: str, audio_chunk_base64: str) -> Optional[Dict[str, Any]]:
+    def _create_audio_buffer(self, session_id: str, existing_audio: Optional[bytes] = None) -> AudioBuffer:
+        """创建会话音频缓冲区（按配置启用磁盘溢出）"""
+        return AudioBuffer(
+            existing_audio,
+            spill_threshold=settings.audio_spill_threshold,
+            spool_dir=settings.audio_spool_dir,
+            name=session_id
+        )
+    
+    @staticmethod
+    def _audio_journal_path(session_id: str) -> str:
+        """会话音频日志文件路径"""
+        return os.path.join(settings.audio_journal_dir, f"{session_id}.pcm")
+    
+    def _open_audio_journal(self, session_id: str, existing_audio: Optional[bytes] = None) -> Optional[AudioJournal]:
+        """打开会话音频日志（未启用或打开失败时返回None，不影响录音）"""
+        if not settings.audio_journal_enabled:
+            return None
+        try:
+            return AudioJournal(
+                self._audio_journal_path(session_id),
+                existing_audio,
+                fsync_interval=settings.audio_journal_fsync_interval
+            )
+        except OSError as e:
+            logger.error(f"打开音频日志失败 {session_id}: {e}")
+            return None
+    
+    def _append_audio_journal(self, session_id: str, stream_info: Dict[str, Any], audio_data: bytes):
+        """追加音频到会话日志，并按间隔在线程池中批量fsync"""
+        journal = stream_info.get("journal")
+        if journal is None:
+            return
+        try:
+            journal.append(audio_data)
+        except OSError as e:
+            logger.error(f"写入音频日志失败 {session_id}: {e}，停止记录音频日志")
+            journal.close(discard=True)
+            stream_info["journal"] = None
+            return
+        if journal.claim_sync():
+            asyncio.get_event_loop().run_in_executor(None, journal.sync)
+    
+    def get_audio_journal_path(self, session_id: str) -> Optional[str]:
+        """获取音频流当前的音频日志路径（未启用或已停止记录时为None）"""
+        stream_info = self.active_streams.get(session_id)
+        journal = stream_info.get("journal") if stream_info else None
+        return journal.path if journal else None
+    
+    async def sync_audio_journal(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        立即将会话音频日志落盘（断连时保存会话前调用）
+        
+        Returns:
+            Optional[Dict[str, Any]]: {"path": 日志路径, "length": 已落盘字节数}；未启用音频日志时为None
+        """
+        stream_info = self.active_streams.get(session_id)
+        journal = stream_info.get("journal") if stream_info else None
+        if journal is None:
+            return None
+        
+        loop = asyncio.get_event_loop()
+        length = await loop.run_in_executor(None, journal.sync)
+        return {"path": journal.path, "length": length}
+    
+    def set_stream_format(self, session_id: str, codec: str, input_format: Optional[Dict[str, int]] = None) -> bool:
+        """
+        设置音频流的输入格式（message_start 协商，断连恢复时重新设置）
+        
+        压缩编码，或与服务端格式不同的PCM，会为该流创建独立的解码/转换器，
+        后续音频块先转换为服务端格式的16-bit PCM再进入缓冲区。
+        
+        Args:
+            session_id: 会话ID
+            codec: 音频编码（pcm / opus / ogg_opus）
+            input_format: PCM输入格式 {"sample_rate", "channels", "sample_width"}，缺省项取服务端配置
+            
+        Returns:
+            bool: 是否设置成功（流不存在或服务端不支持该格式时返回False）
+        """
+        stream_info = self.active_streams.get(session_id)
+        if stream_info is None:
+            logger.error(f"会话 {session_id} 的音频流未开始")
+            return False
+        
+        try:
+            decoder = self._create_decoder(codec, input_format)
+        except (RuntimeError, ValueError) as e:
+            logger.error(f"创建音频解码器失败 {session_id}: {e}")
+            return False
+        
+        stream_info["decoder"] = decoder
+        stream_info["decode_lock"] = asyncio.Lock()
+        if decoder:
+            logger.info(f"音频流输入格式: {session_id}, {decoder.get_stats()}")
+        return True
+    
+    def validate_stream_format(self, codec: str, input_format: Optional[Dict[str, int]] = None) -> Optional[str]:
+        """
+        检查服务端能否处理该输入格式（message_start 在开始消息前调用）
+        
+        Returns:
+            Optional[str]: 不支持时的原因，支持时为None
+        """
+        try:
+            self._create_decoder(codec, input_format)
+        except (RuntimeError, ValueError) as e:
+            return str(e)
+        return None
+    
+    def _create_decoder(self, codec: str, input_format: Optional[Dict[str, int]] = None):
+        """
+        按输入格式创建解码/转换器（服务端格式的PCM返回None）
+        
+        Raises:
+            RuntimeError: 服务端不支持该音频编码
+            ValueError: 输入格式无效
+        """
+        if not is_codec_available(codec):
+            raise RuntimeError(f"服务端不支持音频编码: {codec}")
+        if codec == "pcm":
+            return self._create_pcm_converter(input_format or {})
+        return OpusStreamDecoder(codec, settings.audio_sample_rate, settings.audio_channels)
+    
+    async def discard_stream(self, session_id: str, discard_journal: bool = True):
+        """
+        不经转录直接丢弃音频流（启动或恢复音频流失败时清理）
+        
+        Args:
+            session_id: 会话ID
+            discard_journal: 是否删除音频日志（恢复失败时保留，客户端重新开始录音前音频仍可找回）
+        """
+        if session_id in self.active_streams:
+            await self.stop_stream_processing(session_id)
+            self._remove_stream(session_id, discard_journal)
+    
+    @staticmethod
+    def _create_pcm_converter(input_format: Dict[str, int]) -> Optional[PCMFormatConverter]:
+        """客户端PCM格式与服务端格式不同时创建格式转换器（相同时返回None，直接写入缓冲区）"""
+        sample_rate = input_format.get("sample_rate") or settings.audio_sample_rate
+        channels = input_format.get("channels") or settings.audio_channels
+        sample_width = input_format.get("sample_width") or 2
+        if (sample_rate, channels, sample_width) == (settings.audio_sample_rate, settings.audio_channels, 2):
+            return None
+        return PCMFormatConverter(sample_rate, channels, sample_width, settings.audio_sample_rate, settings.audio_channels)
+    
+    async def _decode_audio(self, session_id: str, stream_info: Dict[str, Any], audio_data: bytes) -> bytes:
+        """在线程池中解码/转换音频块（持有流的解码锁，保证同一流的音频块按到达顺序处理）"""
+        loop = asyncio.get_event_loop()
+        pcm_data = await loop.run_in_executor(None, stream_info["decoder"].decode, audio_data)
+        logger.debug(f"解码音频块 {session_id}: {len(audio_data)} -> {len(pcm_data)} 字节")
+        return pcm_data
+    
+    def _create_vad(self) -> Optional[StreamingEnergyVAD]:
+        """
+        按配置创建流式VAD（未启用时返回None）
+        
+        只需要停顿检测时（如按停顿分段转录），VAD只做检测，不丢弃音频。
+        """
+        if not settings.audio_vad_enabled and not self._needs_pause_detection():
+            return None
+        return StreamingEnergyVAD(
+            sample_rate=settings.audio_sample_rate,
+            channels=settings.audio_channels,
+            frame_ms=settings.audio_vad_frame_ms,
+            threshold_db=settings.audio_vad_threshold_db,
+            padding_ms=settings.audio_vad_padding_ms,
+            min_pause_ms=settings.whisper_progressive_min_pause_ms,
+            drop_silence=settings.audio_vad_enabled
+        )
+    
+    def _needs_pause_detection(self) -> bool:
+        """子类需要停顿检测时返回True"""
+        return False
+    
+    def _remove_stream(self, session_id: str, discard_journal: bool = True):
+        """
+        移除音频流状态并释放音频缓冲区
+        
+        Args:
+            session_id: 会话ID
+            discard_journal: 是否删除音频日志（服务关闭时保留，供重启后恢复）
+        """
+        stream_info = self.active_streams.pop(session_id, None)
+        if stream_info:
+            self._close_stream_resources(stream_info, discard_journal)
+    
+    @staticmethod
+    def _close_stream_resources(stream_info: Dict[str, Any], discard_journal: bool):
+        """关闭流的音频缓冲区和音频日志"""
+        stream_info["audio_buffer"].close()
+        if stream_info.get("journal"):
+            stream_info["journal"].close(discard=discard_journal)
+    
+    async def process_audio_chunk(self, session_id: str, audio_chunk_base64: str) -> Dict[str, Any]:
         """
         处理音频数据块（累积模式）
         
@@ -114,42 +450,108 @@ class STTService:
             audio_chunk_base64: base64编码的音频数据
             
         Returns:
-            Optional[Dict[str, Any]]: 如果缓冲区满，返回背压控制信息
+            Dict[str, Any]: 处理结果，见 process_audio_bytes
+        """
+        try:
+            # 解码音频数据
+            audio_data = base64.b64decode(audio_chunk_base64)
+        except Exception as e:
+            logger.error(f"解码音频块失败 {session_id}: {e}")
+            return {"accepted": False, "message": f"音频块base64解码失败: {e}"}
+        
+        return await self.process_audio_bytes(session_id, audio_data)
+    
+    async def process_audio_bytes(self, session_id: str, audio_data: bytes) -> Dict[str, Any]:
+        """
+        处理原始音频数据（二进制音频帧直接调用，无需base64解码）
+        
+        Args:
+            session_id: 会话ID
+            audio_data: 16-bit PCM数据（bytes/memoryview）；流设置了输入格式时为客户端格式的音频数据
+            
+        Returns:
+            Dict[str, Any]: {"accepted": 音频块是否已被接收}。被VAD丢弃的静音、尚未凑成完整数据包的
+            压缩数据也算已接收；未接收时附带 message，缓冲区已满时另有 buffer_full=True
         """
         if not self.is_initialized:
             logger.error("STT服务未初始化")
-            return None
+            return {"accepted": False, "message": "STT服务未初始化"}
         
         if session_id not in self.active_streams:
             logger.error(f"会话 {session_id} 的音频流未开始")
-            return None
+            return {"accepted": False, "message": "音频流未开始"}
         
         try:
-            # 解码音频数据
-            audio_data = base64.b64decode(audio_chunk_base64)
-            
             # 获取流状态
             stream_info = self.active_streams[session_id]
             
-            # 缓冲区大小检查
-            new_total_bytes = stream_info["total_bytes"] + len(audio_data)
-            if new_total_bytes > self.max_buffer_size:
-                logger.warning(f"音频缓冲区已满 {session_id}: 当前 {stream_info['total_bytes']} 字节, 最大 {self.max_buffer_size} 字节")
-                return {
-                    "buffer_full": True,
-                    "message": f"音频缓冲区已满 (当前: {stream_info['total_bytes']}, 最大: {self.max_buffer_size})"
-                }
-            
-            # 累积音频数据
-            stream_info["audio_chunks"].append(audio_data)
-            stream_info["total_bytes"] += len(audio_data)
-            
-            logger.debug(f"累积音频块 {session_id}: 数据长度 {len(audio_data)}, 总长度 {stream_info['total_bytes']}")
-            return None  # 累积模式下，不返回部分结果
+            # 压缩音频或非服务端格式的PCM先转换；转换和写入缓冲区都在解码锁内完成，避免乱序
+            if stream_info.get("decoder"):
+                async with stream_info["decode_lock"]:
+                    audio_data = await self._decode_audio(session_id, stream_info, audio_data)
+                    if not audio_data:
+                        return {"accepted": True}
+                    return await self._append_pcm(session_id, stream_info, audio_data)
+            
+            return await self._append_pcm(session_id, stream_info, audio_data)
                 
         except Exception as e:
             logger.error(f"处理音频块失败 {session_id}: {e}")
-            return None
+            return {"accepted": False, "message": f"处理音频块失败: {e}"}
+    
+    async def _append_pcm(self, session_id: str, stream_info: Dict[str, Any], audio_data: bytes) -> Dict[str, Any]:
+        """
+        将PCM音频写入流缓冲区（VAD过滤、缓冲区容量检查、音频日志）
+        
+        Returns:
+            Dict[str, Any]: 处理结果，见 process_audio_bytes
+        """
+        # 丢弃长静音，只有保留下来的音频进入缓冲区
+        if stream_info["vad"]:
+            audio_data = stream_info["vad"].process(audio_data)
+            if not audio_data:
+                # 整块均为被丢弃的静音，但其中可能检测到停顿（分段转录需要）
+                if stream_info["vad"].last_pause_tail is not None:
+                    await self._notify_audio_appended(session_id, stream_info, audio_data)
+                return {"accepted": True}
+        
+        # 缓冲区大小检查
+        new_total_bytes = stream_info["total_bytes"] + len(audio_data)
+        if new_total_bytes > self.max_buffer_size:
+            logger.warning(f"音频缓冲区已满 {session_id}: 当前 {stream_info['total_bytes']} 字节, 最大 {self.max_buffer_size} 字节")
+            return {
+                "accepted": False,
+                "buffer_full": True,
+                "message": f"音频缓冲区已满 (当前: {stream_info['total_bytes']}, 最大: {self.max_buffer_size})"
+            }
+        
+        # 累积音频数据
+        stream_info["audio_buffer"].append(audio_data)
+        stream_info["total_bytes"] += len(audio_data)
+        self._append_audio_journal(session_id, stream_info, audio_data)
+        
+        logger.debug(f"累积音频块 {session_id}: 数据长度 {len(audio_data)}, 总长度 {stream_info['total_bytes']}")
+        
+        await self._notify_audio_appended(session_id, stream_info, audio_data)
+        return {"accepted": True}  # 累积模式下，不返回部分结果
+    
+    async def _notify_audio_appended(self, session_id: str, stream_info: Dict[str, Any], audio_data: bytes):
+        """调用音频累积扩展点；音频已写入缓冲区，扩展点失败不影响音频块被接收"""
+        try:
+            await self._on_audio_appended(session_id, stream_info, audio_data)
+        except Exception as e:
+            logger.error(f"音频累积后处理失败 {session_id}: {e}")
+    
+    async def _on_audio_appended(self, session_id: str, stream_info: Dict[str, Any], audio_data: bytes):
+        """
+        音频块累积后的扩展点（渐进式转录、流式识别等），默认不做处理
+        
+        Args:
+            session_id: 会话ID
+            stream_info: 流状态
+            audio_data: 本次新增的PCM数据
+        """
+        pass
     
     async def stop_stream_processing(self, session_id: str) -> bool:
         """
@@ -168,8 +570,6 @@ class STTService:
         try:
             stream_info = self.active_streams[session_id]
             
-            # TODO: 停止Vosk处理
-            
             logger.info(f"停止音频流处理: {session_id}, 总字节数: {stream_info['total_bytes']}")
             
             return True
@@ -195,9 +595,7 @@ class STTService:
         try:
             stream_info = self.active_streams[session_id]
             
-            # 合并所有音频块
-            all_audio = b''.join(stream_info["audio_chunks"])
-            total_bytes = len(all_audio)
+            total_bytes = len(stream_info["audio_buffer"])
             
             logger.info(f"开始一次性处理累积音频: {session_id}, 总字节数: {total_bytes}")
             
@@ -218,7 +616,7 @@ class STTService:
                 final_text = "未检测到音频内容"
             
             # 清理流状态
-            del self.active_streams[session_id]
+            self._remove_stream(session_id)
             
             logger.info(f"累积转录完成 {session_id}: {final_text[:100]}...")
             
@@ -228,7 +626,7 @@ class STTService:
             logger.error(f"获取最终转录失败 {session_id}: {e}")
             return None
     
-    def get_accumulated_audio(self, session_id: str) -> Optional[bytes]:
+    def get_accumulated_audio(self, session_id: str) -> Optional[memoryview]:
         """
         获取已累积的音频数据（用于断连恢复）
         
@@ -236,14 +634,14 @@ class STTService:
             session_id: 会话ID
             
         Returns:
-            Optional[bytes]: 累积的音频数据
+            Optional[memoryview]: 累积音频的只读视图（不复制数据）
         """
         if session_id not in self.active_streams:
             return None
         
         try:
             stream_info = self.active_streams[session_id]
-            all_audio = b''.join(stream_info["audio_chunks"])
+            all_audio = stream_info["audio_buffer"].view()
             logger.info(f"获取累积音频数据: {session_id}, 大小: {len(all_audio)} 字节")
             return all_audio
         except Exception as e:
@@ -269,11 +667,14 @@ class STTService:
         return {
             "session_id": session_id,
             "start_time": stream_info["start_time"].isoformat(),
-            "chunk_count": len(stream_info["audio_chunks"]),
+            "chunk_count": stream_info["audio_buffer"].chunk_count,
             "total_bytes": stream_info["total_bytes"],
             "duration_seconds": (datetime.utcnow() - stream_info["start_time"]).total_seconds(),
             "buffer_usage_percent": round((stream_info["total_bytes"] / self.max_buffer_size) * 100, 2),
-            "is_disconnection_recovery": stream_info.get("is_disconnection_recovery", False)
+            "is_disconnection_recovery": stream_info.get("is_disconnection_recovery", False),
+            "spilled_to_disk": stream_info["audio_buffer"].is_spilled,
+            "vad": stream_info["vad"].get_stats() if stream_info["vad"] else None,
+            "decoder": stream_info["decoder"].get_stats() if stream_info.get("decoder") else None
         }
     
     def get_all_stream_status(self) -> List[Dict[str, Any]]:
@@ -326,7 +727,11 @@ class STTService:
             "buffer_usage": {
                 "total_bytes": total_buffer_usage,
                 "usage_percent": round((total_buffer_usage / self.max_buffer_size) * 100, 2) if self.max_buffer_size > 0 else 0
-            }
+            },
+            "warm": self.is_warm,
+            "startup_timing": self.startup_timing,
+            "transcription_cache": self.transcription_cache.get_stats() if self.transcription_cache else None,
+            "executor": self.executor.get_stats() if self.executor else None
         }
 
 
@@ -338,6 +743,9 @@ class WhisperSTTService(STTService):
     """
     基于faster-whisper的STT服务实现 - 累积处理模式
     
+    配置 whisper_partial_model_name 后采用两级模型：小模型（独立执行器）负责录音过程中的
+    渐进式部分转录，大模型在 message_end 时对全部音频生成最终转录。
+    
     注意：需要安装faster-whisper库
     pip install faster-whisper
     """
@@ -346,15 +754,39 @@ class WhisperSTTService(STTService):
         super().__init__()
         self.model = None
         self.model_info = {}
+        self.batch_scheduler = None
+        self.process_pool = None
+        
+        # 进程内模型副本的槽位记账（多进程推理模式下为None）
+        self.replica_pool: Optional[ModelReplicaPool] = None
+        
+        # 部分转录小模型及其独立执行器（未配置时为None，部分转录使用主模型）
+        self.partial_model = None
+        self.partial_executor: Optional[STTExecutor] = None
+        
+        # 负载自适应质量策略（未启用时为None，始终按配置的质量转录）
+        self.quality_policy: Optional[AdaptiveQualityPolicy] = None
+        
+        # 会话语言锁定：{session_id: {"language", "probability"}}，按最近使用顺序保留有限数量
+        self.session_languages: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.language_stats = {"pinned_requests": 0, "detections": 0, "redetections": 0}
+        
+        # 按模型层级统计的推理指标
+        self.tier_metrics: Dict[str, Dict[str, float]] = {
+            tier: {"requests": 0, "audio_seconds": 0.0, "inference_seconds": 0.0}
+            for tier in ("partial", "final")
+        }
         
     async def initialize(self) -> bool:
         """
         初始化Whisper服务
         """
         try:
-            from faster_whisper import WhisperModel
             import os
-            import torch
+            
+            import_start = time.perf_counter()
+            from faster_whisper import WhisperModel
+            self.startup_timing["import_seconds"] = round(time.perf_counter() - import_start, 3)
             
             # 自动检测设备
             device = self._detect_device() if settings.whisper_device == "auto" else settings.whisper_device
@@ -369,18 +801,72 @@ class WhisperSTTService(STTService):
             logger.info(f"模型路径: {model_path}")
             
             # 检查本地模型文件
-            if os.path.exists(model_path):
-                logger.info(f"从本地加载Whisper模型: {model_path}")
-                self.model = WhisperModel(
+            if not os.path.exists(model_path):
+                logger.error(f"Whisper模型文件不存在: {model_path}")
+                logger.info("请确保已将模型文件下载到指定目录，或使用模型转换工具")
+                return False
+            
+            load_start = time.perf_counter()
+            if settings.stt_worker_processes > 0:
+                # 多进程模式：模型只在工作进程中加载，每个进程加载后各自完成一次预热推理
+                from app.services.stt_worker_pool import WhisperProcessPool
+                logger.info(f"启动Whisper工作进程池: 进程数={settings.stt_worker_processes}")
+                warmup_audio = (
+                    pcm16_to_float32(self._synthetic_warmup_clip(), settings.audio_channels)
+                    if settings.service_warmup_enabled else None
+                )
+                self.process_pool = WhisperProcessPool(
                     model_path,
                     device=device,
                     compute_type=compute_type,
-                    cpu_threads=settings.max_workers
+                    num_processes=settings.stt_worker_processes,
+                    cpu_threads=settings.stt_worker_cpu_threads,
+                    warmup_audio=warmup_audio
                 )
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, self.process_pool.start)
+                executor_workers = settings.stt_worker_processes
             else:
-                logger.error(f"Whisper模型文件不存在: {model_path}")
-                logger.info("请确保已将模型文件下载到指定目录，或使用模型转换工具")
-                return False
+                num_workers, cpu_threads = self._get_replica_config()
+                logger.info(f"从本地加载Whisper模型: {model_path}, 副本数={num_workers}, 每副本线程数={cpu_threads}")
+                self.model = WhisperModel(
+                    model_path,
+                    device=device,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers
+                )
+                self.replica_pool = ModelReplicaPool(num_workers, cpu_threads)
+                # 多副本时执行器并发数与副本数一致，超出的请求在执行器中排队（计入准入控制和负载指标）
+                executor_workers = num_workers if num_workers > 1 else settings.max_workers
+            self.startup_timing["model_load_seconds"] = round(time.perf_counter() - load_start, 3)
+            
+            # STT专用有界执行器（多进程模式下每个线程负责等待一个工作进程）
+            self.executor = STTExecutor(
+                max_workers=executor_workers,
+                max_queue_size=settings.stt_queue_max_size,
+                timeout=settings.stt_timeout,
+                name="whisper"
+            )
+            
+            # 部分转录小模型
+            if settings.whisper_partial_model_name:
+                self._load_partial_model(WhisperModel, device, compute_type)
+            
+            if settings.whisper_adaptive_quality:
+                self.quality_policy = AdaptiveQualityPolicy(
+                    queue_depth_threshold=settings.whisper_degrade_queue_depth,
+                    wait_ms_threshold=settings.whisper_degrade_wait_ms,
+                    recover_seconds=settings.whisper_quality_recover_seconds,
+                    allow_minimal=self.partial_model is not None
+                )
+            
+            # 跨会话批量推理调度器（依赖进程内模型）
+            if settings.whisper_batching_enabled:
+                if self.process_pool:
+                    logger.warning("多进程推理模式下不支持跨会话批量推理，已禁用")
+                else:
+                    self._create_batch_scheduler()
             
             # 存储模型信息
             self.model_info = {
@@ -389,14 +875,28 @@ class WhisperSTTService(STTService):
                 "device": device,
                 "compute_type": compute_type,
                 "batch_size": settings.whisper_batch_size,
+                "batching_enabled": self.batch_scheduler is not None,
+                "worker_processes": settings.stt_worker_processes,
+                "num_workers": self.replica_pool.num_replicas if self.replica_pool else None,
+                "cpu_threads": self.replica_pool.cpu_threads if self.replica_pool else None,
                 "beam_size": settings.whisper_beam_size,
                 "language": settings.whisper_language,
-                "vad_filter": settings.whisper_vad_filter
+                "vad_filter": settings.whisper_vad_filter,
+                "progressive_transcription": settings.whisper_progressive_transcription,
+                "progressive_transcription_seconds": settings.whisper_progressive_transcription_seconds,
+                "progressive_segment_on_pause": settings.whisper_progressive_segment_on_pause,
+                "parallel_transcription": settings.whisper_parallel_transcription,
+                "partial_model_name": settings.whisper_partial_model_name if self.partial_model else None,
+                "adaptive_quality": self.quality_policy is not None,
+                "language_pinning": self._language_pinning_enabled()
             }
             
             self.is_initialized = True
             
-            logger.info("Whisper STT服务初始化完成（累积处理模式）")
+            logger.info(
+                f"Whisper STT服务初始化完成（累积处理模式）: faster-whisper导入 {self.startup_timing['import_seconds']}s, "
+                f"模型加载 {self.startup_timing['model_load_seconds']}s"
+            )
             return True
             
         except ImportError:
@@ -404,22 +904,130 @@ class WhisperSTTService(STTService):
             return False
         except Exception as e:
             logger.error(f"Whisper STT服务初始化失败: {e}")
+            if self.process_pool:
+                self.process_pool.shutdown()
+                self.process_pool = None
             return False
     
+    @staticmethod
+    def _get_replica_config():
+        """
+        计算进程内模型副本数和每个副本的CPU线程数
+        
+        Returns:
+            Tuple[int, int]: (副本数, 每副本CPU线程数)
+        """
+        import os
+        
+        num_workers = max(settings.whisper_num_workers, 1)
+        if settings.whisper_cpu_threads > 0:
+            cpu_threads = settings.whisper_cpu_threads
+        elif num_workers == 1:
+            cpu_threads = settings.max_workers
+        else:
+            cpu_threads = max((os.cpu_count() or 1) // num_workers, 1)
+        return num_workers, cpu_threads
+    
+    def _load_partial_model(self, model_class, device: str, compute_type: str):
+        """加载部分转录小模型（模型不存在或加载失败时部分转录退回主模型）"""
+        import os
+        
+        model_path = self._get_model_path(settings.whisper_partial_model_name)
+        if not os.path.exists(model_path):
+            logger.warning(f"部分转录模型文件不存在: {model_path}，部分转录使用主模型")
+            return
+        
+        try:
+            load_start = time.perf_counter()
+            self.partial_model = model_class(
+                model_path,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=settings.whisper_partial_cpu_threads
+            )
+            self.startup_timing["partial_model_load_seconds"] = round(time.perf_counter() - load_start, 3)
+        except Exception as e:
+            logger.warning(f"部分转录模型加载失败: {e}，部分转录使用主模型")
+            self.partial_model = None
+            return
+        
+        self.partial_executor = STTExecutor(
+            max_workers=settings.whisper_partial_max_workers,
+            max_queue_size=settings.stt_queue_max_size,
+            timeout=settings.stt_timeout,
+            name="whisper-partial"
+        )
+        logger.info(
+            f"两级转录已启用: 部分转录模型={settings.whisper_partial_model_name}, "
+            f"最终转录模型={settings.whisper_model_name}"
+        )
+    
+    def _create_batch_scheduler(self):
+        """创建跨会话批量推理调度器（faster-whisper版本过低时退回逐个转录）"""
+        try:
+            from app.services.stt_batch_scheduler import WhisperBatchScheduler
+            self.batch_scheduler = WhisperBatchScheduler(
+                self.model,
+                batch_size=settings.whisper_batch_size,
+                window_ms=settings.whisper_batch_window_ms,
+                sample_rate=settings.audio_sample_rate,
+                executor=self.executor,
+                replica_pool=self.replica_pool
+            )
+            logger.info(
+                f"Whisper跨会话批量推理已启用: 批次大小={settings.whisper_batch_size}, "
+                f"时间窗口={settings.whisper_batch_window_ms}ms"
+            )
+        except ImportError:
+            logger.warning("当前faster-whisper版本不支持BatchedInferencePipeline，批量推理已禁用")
+            self.batch_scheduler = None
+    
+    async def shutdown(self):
+        """关闭Whisper服务"""
+        if self.batch_scheduler:
+            await self.batch_scheduler.shutdown()
+        await super().shutdown()
+        if self.partial_executor:
+            self.partial_executor.shutdown()
+        if self.process_pool:
+            self.process_pool.shutdown()
+    
+    async def _warm_up_inference(self, audio_bytes: bytes):
+        """
+        Whisper预热：关闭VAD过滤，确保合成音频真正经过编码器和解码器
+        
+        多进程工作池的每个进程已在初始化时各自完成预热推理，这里只提交一次，
+        验证执行器到工作进程的完整链路。
+        """
+        if self.process_pool:
+            request_count = 1
+        else:
+            request_count = self.replica_pool.num_replicas if self.replica_pool else 1
+        requests = [
+            self._transcribe_audio_bytes(audio_bytes, vad_filter=False)
+            for _ in range(request_count)
+        ]
+        if self.partial_model:
+            requests.append(self._transcribe_audio_bytes(audio_bytes, tier="partial", vad_filter=False))
+        await asyncio.gather(*requests)
+    
     def _detect_device(self) -> str:
         """
         自动检测最佳推理设备
+        
+        直接查询CTranslate2（faster-whisper的推理后端）可见的CUDA设备，
+        不再为一次设备检测导入PyTorch。
         """
         try:
-            import torch
-            if torch.cuda.is_available():
+            import ctranslate2
+            if ctranslate2.get_cuda_device_count() > 0:
                 logger.info("检测到CUDA支持，使用GPU推理")
                 return "cuda"
             else:
                 logger.info("未检测到CUDA支持，使用CPU推理")
                 return "cpu"
-        except ImportError:
-            logger.info("PyTorch未安装，使用CPU推理")
+        except Exception as e:
+            logger.info(f"CUDA设备检测失败: {e}，使用CPU推理")
             return "cpu"
     
     def _get_compute_type(self, device: str) -> str:
@@ -441,19 +1049,24 @@ class WhisperSTTService(STTService):
                 logger.warning(f"CPU设备不支持计算类型 {settings.whisper_compute_type}，使用 int8")
                 return "int8"
     
-    def _get_model_path(self) -> str:
+    def _get_model_path(self, model_name: Optional[str] = None) -> str:
         """
         构建模型文件路径
+        
+        Args:
+            model_name: 模型名称，默认为 whisper_model_name
         """
         import os
         
+        model_name = model_name or settings.whisper_model_name
+        
         # 检查是否是预转换的CT2模型目录
-        ct2_model_path = os.path.join(settings.whisper_model_path, f"{settings.whisper_model_name}-ct2")
+        ct2_model_path = os.path.join(settings.whisper_model_path, f"{model_name}-ct2")
         if os.path.exists(ct2_model_path):
             return ct2_model_path
         
         # 检查标准模型文件
-        standard_model_path = os.path.join(settings.whisper_model_path, settings.whisper_model_name)
+        standard_model_path = os.path.join(settings.whisper_model_path, model_name)
         if os.path.exists(standard_model_path):
             return standard_model_path
         
@@ -462,7 +1075,7 @@ class WhisperSTTService(STTService):
     
     async def start_stream_processing(self, session_id: str, existing_audio: bytes = None) -> bool:
         """
-        开始Whisper音频流处理（累积模式）
+        开始Whisper音频流处理（累积模式，可选渐进式转录）
         """
         if not self.is_initialized:
             logger.error("Whisper服务未初始化")
@@ -472,16 +1085,31 @@ class WhisperSTTService(STTService):
             logger.warning(f"会话 {session_id} 的音频流已在处理中，重置流状态")
             # 保留现有音频数据
             existing_stream = self.active_streams[session_id]
-            existing_audio = existing_audio or b''.join(existing_stream.get("audio_chunks", []))
+            existing_audio = existing_audio or existing_stream["audio_buffer"].view()
+            self._cancel_progressive_tasks(existing_stream)
 
         try:
+            previous_stream = self.active_streams.get(session_id)
+
             # 创建流处理状态
             self.active_streams[session_id] = {
                 "start_time": datetime.utcnow(),
-                "audio_chunks": [existing_audio] if existing_audio else [],
+                "audio_buffer": self._create_audio_buffer(session_id, existing_audio),
+                "journal": self._open_audio_journal(session_id, existing_audio),
+                "vad": self._create_vad(),
                 "total_bytes": len(existing_audio) if existing_audio else 0,
-                "is_disconnection_recovery": existing_audio is not None
+                "is_disconnection_recovery": existing_audio is not None,
+                # 渐进式转录状态
+                "progressive_offset": 0,  # 尚未提交转录的音频起始字节偏移
+                "progressive_texts": [],
+                "progressive_language": None,  # 分段转录检测到的语言，决定分段文本的拼接方式
+                "progressive_tasks": [],
+                "progressive_lock": asyncio.Lock(),
+                "progressive_failed": False
             }
+
+            if previous_stream:
+                self._close_stream_resources(previous_stream, discard_journal=False)
             
             if existing_audio:
                 logger.info(f"恢复Whisper音频流处理: {session_id}, 已有音频: {len(existing_audio)} 字节")
@@ -493,62 +1121,171 @@ class WhisperSTTService(STTService):
             logger.error(f"开始Whisper流处理失败 {session_id}: {e}")
             return False
     
-    async def process_audio_chunk(self, session_id: str, audio_chunk_base64: str) -> Optional[Dict[str, Any]]:
+    def _needs_pause_detection(self) -> bool:
+        return settings.whisper_progressive_transcription and settings.whisper_progressive_segment_on_pause
+
+    async def _on_audio_appended(self, session_id: str, stream_info: Dict[str, Any], audio_data: bytes):
         """
-        处理音频数据块（累积模式）
+        启用渐进式转录时，在后台分段转录新音频，并推送部分转录结果。
+        
+        默认按停顿分段：达到 whisper_progressive_transcription_seconds 最短时长后在VAD检测到的停顿处切分，
+        超过 whisper_progressive_max_segment_seconds 仍无停顿则强制切分；
+        关闭按停顿分段时，每累积 whisper_progressive_transcription_seconds 秒的新音频切分一次。
         """
-        if session_id not in self.active_streams:
-            logger.error(f"会话 {session_id} 的音频流未开始")
-            return None
+        if not settings.whisper_progressive_transcription:
+            return
 
-        try:
-            audio_data = base64.b64decode(audio_chunk_base64)
-            stream_info = self.active_streams[session_id]
+        audio_buffer = stream_info["audio_buffer"]
+        pending_bytes = len(audio_buffer) - stream_info["progressive_offset"]
+        min_bytes = self._seconds_to_bytes(settings.whisper_progressive_transcription_seconds)
 
-            # 缓冲区大小检查
-            new_total_bytes = stream_info["total_bytes"] + len(audio_data)
-            if new_total_bytes > self.max_buffer_size:
-                logger.warning(f"Whisper音频缓冲区已满 {session_id}: 当前 {stream_info['total_bytes']} 字节")
-                return {
-                    "buffer_full": True,
-                    "message": f"音频缓冲区已满 (当前: {stream_info['total_bytes']}, 最大: {self.max_buffer_size})"
-                }
+        if not settings.whisper_progressive_segment_on_pause:
+            if pending_bytes >= min_bytes:
+                self._schedule_progressive_segment(session_id, stream_info)
+            return
 
-            # 累积音频数据
-            stream_info["audio_chunks"].append(audio_data)
-            stream_info["total_bytes"] += len(audio_data)
+        vad = stream_info["vad"]
+        if vad and vad.last_pause_tail is not None:
+            # 在停顿点切分，停顿之后的音频留给下一段
+            cut_offset = len(audio_buffer) - vad.last_pause_tail
+            if cut_offset - stream_info["progressive_offset"] >= min_bytes:
+                self._schedule_progressive_segment(session_id, stream_info, cut_offset)
+                return
 
-            logger.debug(f"Whisper累积音频块 {session_id}: 数据长度 {len(audio_data)}, 总长度 {stream_info['total_bytes']}")
-            return None  # 累积模式下，不返回部分结果
+        if pending_bytes >= self._seconds_to_bytes(settings.whisper_progressive_max_segment_seconds):
+            self._schedule_progressive_segment(session_id, stream_info)
 
-        except Exception as e:
-            logger.error(f"Whisper处理音频块失败 {session_id}: {e}")
-            return None
+    @staticmethod
+    def _seconds_to_bytes(seconds: float) -> int:
+        """音频时长换算为字节数（16-bit PCM）"""
+        bytes_per_second = settings.audio_sample_rate * settings.audio_channels * 2
+        return max(int(seconds * bytes_per_second), 1)
+
+    def _schedule_progressive_segment(self, session_id: str, stream_info: Dict[str, Any], end_offset: Optional[int] = None):
+        """将尚未转录的音频（到 end_offset 为止，默认到末尾）切出为一段，交给后台任务转录"""
+        audio_buffer = stream_info["audio_buffer"]
+        end_offset = len(audio_buffer) if end_offset is None else end_offset
+        segment_audio = audio_buffer.view(stream_info["progressive_offset"], end_offset)
+        stream_info["progressive_offset"] = end_offset
+
+        segment_index = len(stream_info["progressive_tasks"])
+        task = asyncio.create_task(
+            self._transcribe_progressive_segment(session_id, stream_info, segment_index, segment_audio)
+        )
+        stream_info["progressive_tasks"].append(task)
+        logger.debug(f"提交渐进式转录分段 {session_id}: 序号 {segment_index}, 字节数 {len(segment_audio)}")
+
+    async def _transcribe_progressive_segment(self, session_id: str, stream_info: Dict[str, Any],
+                                              segment_index: int, segment_audio: bytes):
+        """
+        后台转录一个渐进式分段
+
+        通过会话级锁保证分段按顺序完成，并以前文作为提示词保持上下文连贯。
+        """
+        async with stream_info["progressive_lock"]:
+            if stream_info["progressive_failed"]:
+                return
+
+            try:
+                previous_text = self._join_texts(stream_info["progressive_texts"], stream_info["progressive_language"])
+                segments, info = await self._transcribe_audio_bytes(
+                    segment_audio,
+                    tier="partial",
+                    language_session_id=session_id,
+                    initial_prompt=previous_text or None
+                )
+                language = getattr(info, "language", None) or stream_info["progressive_language"]
+                stream_info["progressive_language"] = language
+                stream_info["progressive_texts"].append(self._segments_to_text(segments, language))
+            except Exception as e:
+                # 任一分段失败后，最终转录退回为一次性处理全部音频
+                stream_info["progressive_failed"] = True
+                logger.error(f"渐进式转录分段失败 {session_id}: 序号 {segment_index}, {e}")
+                return
+
+        partial_text = self._join_texts(stream_info["progressive_texts"], stream_info["progressive_language"])
+        if partial_text:
+            await self._emit_partial_result(session_id, partial_text, segment_index)
+
+    def _cancel_progressive_tasks(self, stream_info: Dict[str, Any]):
+        """取消流中尚未完成的渐进式转录任务"""
+        for task in stream_info.get("progressive_tasks", []):
+            if not task.done():
+                task.cancel()
+
+    @classmethod
+    def _segments_to_text(cls, segments, language: Optional[str] = None) -> str:
+        """拼接Whisper分段文本"""
+        return cls._join_texts([segment.text.strip() for segment in segments], language) if segments else ""
+
+    @staticmethod
+    def _text_separator(previous: str, current: str, language: Optional[str] = None) -> str:
+        """
+        两段文本之间的分隔符
+
+        已知语言时按语言决定（中文、日文等直接拼接，其他语言加空格）；
+        语言未知时按衔接处的字符判断，任一侧是中日文等字符则直接拼接。
+        """
+        if not previous or not current:
+            return ""
+        if language:
+            return "" if language in UNSPACED_LANGUAGES else " "
+        if previous[-1].isspace() or current[0].isspace():
+            return ""
+        return "" if _is_unspaced_char(previous[-1]) or _is_unspaced_char(current[0]) else " "
+
+    @classmethod
+    def _join_texts(cls, texts: List[str], language: Optional[str] = None) -> str:
+        """按语言的分隔符拼接多段文本（跳过空文本）"""
+        joined = ""
+        for text in texts:
+            if text:
+                joined += cls._text_separator(joined, text, language) + text
+        return joined
+
+    async def stop_stream_processing(self, session_id: str) -> bool:
+        """
+        停止Whisper音频流处理
+        """
+        if session_id in self.active_streams:
+            self._cancel_progressive_tasks(self.active_streams[session_id])
+        return await super().stop_stream_processing(session_id)
 
     async def get_final_transcription(self, session_id: str) -> Optional[str]:
         """
         获取Whisper最终转录结果（累积模式）
+        
+        渐进式转录已覆盖的分段直接复用，只需转录最后剩余的尾部音频；
+        启用两级模型时部分转录结果只用于实时反馈，最终转录由主模型重新处理全部音频。
+        
+        Raises:
+            STTOverloadedError: STT执行器队列已满（音频流保留，可重试）
+            STTTimeoutError: STT处理超时（音频流保留，可重试）
         """
         if session_id not in self.active_streams:
             logger.error(f"会话 {session_id} 的音频流不存在")
             return None
 
+        keep_stream = False
         try:
             stream_info = self.active_streams[session_id]
-            
-            # 合并所有音频块
-            all_audio = b''.join(stream_info["audio_chunks"])
-            total_bytes = len(all_audio)
-            
-            logger.info(f"开始一次性Whisper转录: {session_id}, 总字节数: {total_bytes}")
+            total_bytes = stream_info["total_bytes"]
+
+            quality_tier, quality_options = self._select_quality()
+            quality_options["language_session_id"] = session_id
 
             if total_bytes > 0:
-                # 执行转录
-                segments, _ = await self._transcribe_audio_bytes(all_audio)
-                
-                if segments:
-                    final_text = "".join([segment.text.strip() for segment in segments])
-                    
+                cache_key = await self._get_cache_key(stream_info, quality_options)
+                final_text = self.transcription_cache.get(cache_key) if cache_key else None
+                if final_text is not None:
+                    self._cancel_progressive_tasks(stream_info)
+                    logger.info(f"命中转录缓存: {session_id}, 总字节数: {total_bytes}")
+                else:
+                    final_text = await self._transcribe_final(session_id, stream_info, quality_tier, quality_options)
+                    if final_text and cache_key:
+                        self.transcription_cache.put(cache_key, final_text)
+
+                if final_text:
                     # 如果是断连恢复，添加标记
                     if stream_info.get("is_disconnection_recovery"):
                         final_text = f"[恢复] {final_text}"
@@ -557,57 +1294,437 @@ class WhisperSTTService(STTService):
             else:
                 final_text = "未检测到音频内容"
                 
+            if self.quality_policy:
+                self.transcription_quality[session_id] = quality_tier
             logger.info(f"Whisper累积转录完成 {session_id}: {final_text[:100]}...")
             return final_text
 
+        except (STTOverloadedError, STTTimeoutError) as e:
+            # 保留音频流，客户端可重新发送message_end重试
+            keep_stream = True
+            logger.warning(f"Whisper转录暂不可用 {session_id}: {e}")
+            raise
         except Exception as e:
             logger.error(f"Whisper获取最终转录失败 {session_id}: {e}")
             return None
         finally:
             # 确保清理流状态
-            if session_id in self.active_streams:
-                del self.active_streams[session_id]
+            if not keep_stream and session_id in self.active_streams:
+                self._cancel_progressive_tasks(self.active_streams[session_id])
+                self._remove_stream(session_id)
                 logger.debug(f"已清理Whisper会话流: {session_id}")
+
+    async def _transcribe_final(self, session_id: str, stream_info: Dict[str, Any], quality_tier: str,
+                                quality_options: Dict[str, Any]) -> Optional[str]:
+        """转录会话的全部音频（复用渐进式分段或一次性转录）"""
+        final_text = None
+        if self.partial_model:
+            # 小模型的部分转录不再需要，取消尚未完成的分段
+            self._cancel_progressive_tasks(stream_info)
+        elif stream_info["progressive_tasks"]:
+            final_text = await self._finish_progressive_transcription(session_id, stream_info, **quality_options)
+
+        if final_text is None:
+            # 一次性转录全部累积音频
+            all_audio = stream_info["audio_buffer"].view()
+            logger.info(
+                f"开始一次性Whisper转录: {session_id}, 总字节数: {stream_info['total_bytes']}, 质量层级: {quality_tier}"
+            )
+            final_text = await self._transcribe_streaming(session_id, all_audio, **quality_options)
+        return final_text
+
+    async def _get_cache_key(self, stream_info: Dict[str, Any], quality_options: Dict[str, Any]) -> Optional[str]:
+        """计算全部音频加解码参数的缓存键（未启用缓存时返回None）"""
+        if not self.transcription_cache:
+            return None
+
+        use_partial_model = quality_options.get("tier") == "partial" and self.partial_model is not None
+
+        # 语言只取配置值：会话锁定的语言来自同一音频的检测结果，不应导致重试时缓存未命中
+        params = {
+            "model": settings.whisper_partial_model_name if use_partial_model else settings.whisper_model_name,
+            "beam_size": quality_options.get("beam_size", settings.whisper_beam_size),
+            "word_timestamps": quality_options.get("word_timestamps", settings.whisper_word_timestamps),
+            "language": settings.whisper_language,
+            "temperature": settings.whisper_temperature,
+            "vad_filter": settings.whisper_vad_filter
+        }
+
+        # 长录音的哈希计算放到线程池（hashlib处理大块数据时释放GIL）
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, TranscriptionCache.make_key, stream_info["audio_buffer"].view(), params
+        )
+
+    def _select_quality(self):
+        """
+        按STT执行器当前负载选择最终转录的质量层级
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: 质量层级和需要覆盖的转录参数
+        """
+        if not self.quality_policy or not self.executor:
+            return "full", {}
+
+        wait_times = self.executor.recent_wait_times
+        quality_tier = self.quality_policy.select(
+            queue_depth=self.executor.queue_depth,
+            wait_ms=wait_times[-1] * 1000 if wait_times else 0.0
+        )
+
+        quality_options = {}
+        if quality_tier != "full":
+            quality_options.update({
+                "beam_size": min(settings.whisper_degraded_beam_size, settings.whisper_beam_size),
+                "word_timestamps": False
+            })
+        if quality_tier == "minimal":
+            quality_options["tier"] = "partial"
+        return quality_tier, quality_options
+
+    async def _transcribe_streaming(self, session_id: str, audio_bytes: bytes, **transcribe_options) -> str:
+        """
+        一次性转录全部音频，分段解码完成即累积文本
+
+        启用渐进式转录时，每个分段完成后同时推送部分转录结果；
+        否则直接整体转录（可参与跨会话批量推理）。
+        启用并行转录且音频超过一个窗口时，改为分窗口并行转录。
+        """
+        if settings.whisper_parallel_transcription:
+            # 整段音频的能量计算放到线程池，不阻塞事件循环
+            loop = asyncio.get_event_loop()
+            split_points = await loop.run_in_executor(None, self._parallel_split_points, audio_bytes)
+            if split_points:
+                return await self._transcribe_parallel_windows(session_id, audio_bytes, split_points, **transcribe_options)
+
+        if not settings.whisper_progressive_transcription:
+            segments, info = await self._transcribe_audio_bytes(audio_bytes, **transcribe_options)
+            return self._segments_to_text(segments, getattr(info, "language", None))
+
+        # 逐段产出时还拿不到检测结果，使用配置或会话锁定的语言（都没有时按字符判断分隔符）
+        language = self._known_language(session_id)
+        texts = []
+        async for segment in self._iter_transcription_segments(audio_bytes, **transcribe_options):
+            texts.append(segment.text.strip())
+            await self._emit_partial_result(session_id, self._join_texts(texts, language), len(texts) - 1)
+        return self._join_texts(texts, language)
+
+    def _parallel_split_points(self, audio_bytes: bytes) -> List[int]:
+        """计算并行转录的窗口切分点（窗口加上两侧重叠不超过 whisper_parallel_window_seconds）"""
+        overlap_seconds = max(settings.whisper_parallel_overlap_seconds, 0.0)
+        core_seconds = max(settings.whisper_parallel_window_seconds - 2 * overlap_seconds, 1.0)
+        return find_silence_split_points(
+            audio_bytes,
+            settings.audio_sample_rate,
+            settings.audio_channels,
+            window_seconds=core_seconds,
+            search_seconds=min(5.0, core_seconds / 4)
+        )
+
+    async def _transcribe_parallel_windows(self, session_id: str, audio_bytes: bytes, split_points: List[int],
+                                           **transcribe_options) -> str:
+        """
+        分窗口并行转录长音频
+
+        窗口在静音处切分，两侧各向外扩展重叠时长后同时提交到STT执行器。
+        拼接时每个分段按其中点时间归属到唯一的窗口，重叠音频由此去重；不再按文本去重，
+        避免误删跨窗口边界真实重复的词句。
+        """
+        bytes_per_second = settings.audio_sample_rate * settings.audio_channels * 2
+        frame_bytes = settings.audio_channels * 2
+        overlap_bytes = int(settings.whisper_parallel_overlap_seconds * bytes_per_second) // frame_bytes * frame_bytes
+        boundaries = [0] + split_points + [len(audio_bytes)]
+        audio_view = memoryview(audio_bytes)
+
+        windows = []
+        for core_start, core_end in zip(boundaries, boundaries[1:]):
+            window_start = max(core_start - overlap_bytes, 0)
+            window_end = min(core_end + overlap_bytes, len(audio_bytes))
+            windows.append((core_start, core_end, window_start, window_end))
+
+        logger.info(
+            f"并行分窗口转录 {session_id}: 总时长 {len(audio_bytes) / bytes_per_second:.1f}秒, 窗口数 {len(windows)}"
+        )
+
+        # 同时提交的窗口数不超过执行器并发数，长录音的窗口不会占满等待队列而被拒绝
+        executor = self.partial_executor if transcribe_options.get("tier") == "partial" and self.partial_model else self.executor
+        window_slots = asyncio.Semaphore(executor.max_workers if executor else settings.max_workers)
+
+        async def _transcribe_window(window_start: int, window_end: int):
+            async with window_slots:
+                return await self._transcribe_audio_bytes(audio_view[window_start:window_end], **transcribe_options)
+
+        tasks = [
+            asyncio.ensure_future(_transcribe_window(window_start, window_end))
+            for _, _, window_start, window_end in windows
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # 任一窗口失败时取消其余窗口，不再继续占用执行器
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        merged_text = ""
+        for (core_start, core_end, window_start, _), (segments, info) in zip(windows, results):
+            offset = window_start / bytes_per_second
+            core_start_time = core_start / bytes_per_second
+            core_end_time = core_end / bytes_per_second
+            is_last = core_end == len(audio_bytes)
+
+            kept = []
+            for segment in segments:
+                midpoint = offset + (segment.start + segment.end) / 2
+                if midpoint >= core_start_time and (midpoint < core_end_time or is_last):
+                    kept.append(segment)
+
+            language = getattr(info, "language", None)
+            text = self._segments_to_text(kept, language)
+            if text:
+                merged_text += self._text_separator(merged_text, text, language) + text
+
+        return merged_text
+
+    async def _finish_progressive_transcription(self, session_id: str, stream_info: Dict[str, Any],
+                                                **transcribe_options) -> Optional[str]:
+        """
+        等待渐进式分段完成并转录尾部音频
+
+        Returns:
+            Optional[str]: 拼接后的完整文本；渐进式转录失败时返回None，由调用方退回一次性转录
+        """
+        await asyncio.gather(*stream_info["progressive_tasks"], return_exceptions=True)
+        if stream_info["progressive_failed"]:
+            logger.warning(f"渐进式转录存在失败分段，改为一次性转录: {session_id}")
+            return None
+
+        tail_audio = stream_info["audio_buffer"].view(stream_info["progressive_offset"])
+        texts = list(stream_info["progressive_texts"])
+
+        logger.info(
+            f"渐进式转录收尾 {session_id}: 已完成分段 {len(texts)} 个, 尾部音频 {len(tail_audio)} 字节"
+        )
+
+        language = stream_info["progressive_language"]
+        if tail_audio:
+            segments, info = await self._transcribe_audio_bytes(
+                tail_audio,
+                initial_prompt=self._join_texts(texts, language) or None,
+                **transcribe_options
+            )
+            language = language or getattr(info, "language", None)
+            texts.append(self._segments_to_text(segments, language))
+
+        return self._join_texts(texts, language)
     
-    async def _transcribe_audio_bytes(self, audio_bytes: bytes):
+    async def _transcribe_audio_bytes(self, audio_bytes: bytes, segment_queue: Optional[asyncio.Queue] = None,
+                                      tier: str = "final", language_session_id: Optional[str] = None,
+                                      **transcribe_options):
         """
         执行Whisper音频转录（从字节数据）
-        """
-        import tempfile
-        import wave
-        import os
-        import asyncio
 
+        PCM数据直接转换为内存中的float32数组交给faster-whisper，不再经过临时WAV文件。
+        faster-whisper返回的分段是惰性生成器，真正的解码发生在迭代时，
+        因此整个解码过程都放在工作线程中完成，避免阻塞事件循环。
+
+        Args:
+            audio_bytes: 16-bit PCM音频数据
+            segment_queue: 可选队列，每解码完成一个分段即放入队列，结束时放入None
+            tier: 模型层级，"partial" 在加载了小模型时使用小模型及其独立执行器，否则使用主模型
+            language_session_id: 所属会话ID，提供时使用该会话锁定的语言；只有主模型的结果会更新锁定语言，
+                小模型的语言检测和置信度不可靠，不参与锁定
+            **transcribe_options: 覆盖默认配置的转录参数（如 initial_prompt）
+
+        Returns:
+            Tuple[List, Any]: 已完全解码的分段列表和TranscriptionInfo
+        """
         if not audio_bytes:
+            if segment_queue is not None:
+                segment_queue.put_nowait(None)
             return [], None
 
+        options = {
+            "beam_size": settings.whisper_beam_size,
+            "language": settings.whisper_language,
+            "temperature": settings.whisper_temperature,
+            "condition_on_previous_text": settings.whisper_condition_on_previous_text,
+            "vad_filter": settings.whisper_vad_filter,
+            "word_timestamps": settings.whisper_word_timestamps
+        }
+        options.update(transcribe_options)
+
+        pinned_language = None
+        if language_session_id and options["language"] is None and self._language_pinning_enabled():
+            pinned_language = self._get_pinned_language(language_session_id)
+            options["language"] = pinned_language
+
+        use_partial_model = tier == "partial" and self.partial_model is not None
+        tier = "partial" if use_partial_model else "final"
+        sample_count = len(audio_bytes) // (2 * max(settings.audio_channels, 1))
+        audio_seconds = sample_count / settings.audio_sample_rate
+
+        # 非流式请求优先交给跨会话批量调度器（不超过30秒，在事件循环中转换的开销可以忽略）
+        if not use_partial_model and self.batch_scheduler and segment_queue is None and self.batch_scheduler.accepts(sample_count, options):
+            start_time = time.perf_counter()
+            audio = pcm16_to_float32(audio_bytes, settings.audio_channels)
+            segments, info = await self.batch_scheduler.submit(audio, options)
+            self._record_tier_metrics(tier, audio_seconds, time.perf_counter() - start_time)
+            # 批量推理的语言不是按本请求音频检测的，只做已锁定语言的置信度检查，不据此锁定语言
+            if language_session_id and pinned_language and self._language_pinning_enabled():
+                self._observe_language(language_session_id, segments, info, pinned_language)
+            return segments, info
+
+        loop = asyncio.get_event_loop()
+
+        def _sync_transcribe():
+            start_time = time.perf_counter()
+            # 长音频的格式转换在工作线程中完成
+            audio = pcm16_to_float32(audio_bytes, settings.audio_channels)
+            use_replica = not use_partial_model and self.replica_pool is not None
+            # 分段是惰性解码的，迭代完成前一直占用模型副本
+            with self.replica_pool.acquire(audio_seconds) if use_replica else contextlib.nullcontext():
+                if use_partial_model:
+                    segment_iter, info = self.partial_model.transcribe(audio, **options)
+                elif self.process_pool:
+                    # 工作进程中完成解码，分段一次性返回
+                    segment_iter, info = self.process_pool.transcribe(audio, options)
+                else:
+                    segment_iter, info = self.model.transcribe(audio, **options)
+                segments = []
+                for segment in segment_iter:
+                    segments.append(segment)
+                    if segment_queue is not None:
+                        loop.call_soon_threadsafe(segment_queue.put_nowait, segment)
+            loop.call_soon_threadsafe(self._record_tier_metrics, tier, audio_seconds, time.perf_counter() - start_time)
+            return segments, info
+
         try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio_file:
-                temp_audio_path = temp_audio_file.name
-                with wave.open(temp_audio_path, 'wb') as wav_file:
-                    wav_file.setnchannels(settings.audio_channels)
-                    wav_file.setsampwidth(2)  # 16-bit
-                    wav_file.setframerate(settings.audio_sample_rate)
-                    wav_file.writeframes(audio_bytes)
-
-            def _sync_transcribe():
-                return self.model.transcribe(
-                    temp_audio_path,
-                    beam_size=settings.whisper_beam_size,
-                    language=settings.whisper_language,
-                    temperature=settings.whisper_temperature,
-                    condition_on_previous_text=settings.whisper_condition_on_previous_text,
-                    vad_filter=settings.whisper_vad_filter,
-                    word_timestamps=settings.whisper_word_timestamps
+            if use_partial_model:
+                segments, info = await self.partial_executor.run(_sync_transcribe)
+            else:
+                segments, info = await self._run_blocking(_sync_transcribe)
+        finally:
+            if segment_queue is not None:
+                loop.call_soon_threadsafe(segment_queue.put_nowait, None)
+        if language_session_id and not use_partial_model and self._language_pinning_enabled():
+            self._observe_language(language_session_id, segments, info, pinned_language)
+        return segments, info
+
+    @staticmethod
+    def _language_pinning_enabled() -> bool:
+        """未强制指定语言且启用了语言锁定"""
+        return settings.whisper_language is None and settings.whisper_language_pinning
+
+    def _get_pinned_language(self, session_id: str) -> Optional[str]:
+        """获取会话已锁定的语言（未锁定时返回None，由Whisper自动检测）"""
+        state = self.session_languages.get(session_id)
+        if state is None:
+            self.language_stats["detections"] += 1
+            return None
+        self.session_languages.move_to_end(session_id)
+        self.language_stats["pinned_requests"] += 1
+        return state["language"]
+
+    def _known_language(self, session_id: str) -> Optional[str]:
+        """配置的语言或会话已锁定的语言（不计入锁定统计）"""
+        if settings.whisper_language:
+            return settings.whisper_language
+        state = self.session_languages.get(session_id)
+        return state["language"] if state else None
+
+    def _observe_language(self, session_id: str, segments, info, pinned_language: Optional[str]):
+        """
+        根据转录结果更新会话语言锁定
+
+        未锁定时，检测到的语言概率达到 whisper_language_pin_probability 即锁定
+        （只用于单独转录的结果，批量推理的语言不是按请求自身音频检测的）；
+        已锁定时，若本次转录的平均对数概率低于 whisper_language_redetect_logprob，
+        说明语言可能已变化，解除锁定让下一次转录重新检测。
+        """
+        if pinned_language:
+            confidence = self._mean_avg_logprob(segments)
+            if confidence is not None and confidence < settings.whisper_language_redetect_logprob:
+                self.session_languages.pop(session_id, None)
+                self.language_stats["redetections"] += 1
+                logger.info(
+                    f"会话 {session_id} 转录置信度下降 (avg_logprob={confidence:.2f})，"
+                    f"解除语言锁定 {pinned_language}，下次重新检测"
                 )
+            return
 
-            loop = asyncio.get_event_loop()
-            segments, info = await loop.run_in_executor(None, _sync_transcribe)
-            return segments, info
+        language = getattr(info, "language", None)
+        probability = getattr(info, "language_probability", 0.0) or 0.0
+        if not language or probability < settings.whisper_language_pin_probability:
+            return
 
+        previous = self.session_languages.get(session_id)
+        self.session_languages[session_id] = {"language": language, "probability": round(probability, 3)}
+        self.session_languages.move_to_end(session_id)
+        while len(self.session_languages) > settings.whisper_language_pin_max_sessions:
+            self.session_languages.popitem(last=False)
+        if not previous or previous["language"] != language:
+            logger.info(f"会话 {session_id} 锁定语言: {language} (概率 {probability:.2f})")
+
+    @staticmethod
+    def _mean_avg_logprob(segments) -> Optional[float]:
+        """按分段时长加权的平均对数概率（没有分段时返回None）"""
+        total_duration = 0.0
+        weighted_sum = 0.0
+        for segment in segments or []:
+            duration = max(segment.end - segment.start, 0.01)
+            weighted_sum += segment.avg_logprob * duration
+            total_duration += duration
+        return weighted_sum / total_duration if total_duration else None
+
+    async def release_session(self, session_id: str):
+        """对话结束时释放会话的语言锁定和转录质量标记"""
+        await super().release_session(session_id)
+        self.session_languages.pop(session_id, None)
+
+    def _record_tier_metrics(self, tier: str, audio_seconds: float, inference_seconds: float):
+        """累计某一模型层级的推理量和耗时"""
+        metrics = self.tier_metrics[tier]
+        metrics["requests"] += 1
+        metrics["audio_seconds"] += audio_seconds
+        metrics["inference_seconds"] += inference_seconds
+
+    def _get_tier_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各模型层级的推理指标（含实时率：推理耗时/音频时长）"""
+        stats = {}
+        for tier, metrics in self.tier_metrics.items():
+            audio_seconds = metrics["audio_seconds"]
+            stats[tier] = {
+                "requests": metrics["requests"],
+                "audio_seconds": round(audio_seconds, 2),
+                "inference_seconds": round(metrics["inference_seconds"], 2),
+                "real_time_factor": round(metrics["inference_seconds"] / audio_seconds, 3) if audio_seconds else None
+            }
+        return stats
+
+    async def _iter_transcription_segments(self, audio_bytes: bytes, **transcribe_options):
+        """
+        异步迭代转录分段：工作线程每解码完成一个分段就立即产出
+
+        Yields:
+            Segment: faster-whisper分段
+        """
+        segment_queue: asyncio.Queue = asyncio.Queue()
+        transcribe_task = asyncio.create_task(
+            self._transcribe_audio_bytes(audio_bytes, segment_queue=segment_queue, **transcribe_options)
+        )
+        try:
+            while True:
+                segment = await segment_queue.get()
+                if segment is None:
+                    break
+                yield segment
+            # 传播工作线程中的异常
+            await transcribe_task
         finally:
-            if 'temp_audio_path' in locals() and os.path.exists(temp_audio_path):
-                os.unlink(temp_audio_path)
+            if not transcribe_task.done():
+                transcribe_task.cancel()
     
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -617,7 +1734,18 @@ class WhisperSTTService(STTService):
         base_status.update({
             "mode": "whisper_cumulative",
             "model_info": self.model_info,
-            "model_loaded": self.model is not None
+            "model_loaded": self.model is not None or self.process_pool is not None,
+            "process_pool": self.process_pool.get_stats() if self.process_pool else None,
+            "model_replicas": self.replica_pool.get_stats() if self.replica_pool else None,
+            "batch_scheduler": self.batch_scheduler.get_stats() if self.batch_scheduler else None,
+            "partial_executor": self.partial_executor.get_stats() if self.partial_executor else None,
+            "tiers": self._get_tier_stats(),
+            "quality_policy": self.quality_policy.get_stats() if self.quality_policy else None,
+            "language_pinning": {
+                "enabled": self._language_pinning_enabled(),
+                "pinned_sessions": len(self.session_languages),
+                **self.language_stats
+            }
         })
         return base_status
 
@@ -628,7 +1756,10 @@ class WhisperSTTService(STTService):
 
 class VoskSTTService(STTService):
     """
-    真实的Vosk STT服务实现 - 累积处理模式
+    真实的Vosk STT服务实现 - 流式识别模式
+    
+    每个会话在开始录音时创建一个KaldiRecognizer，音频块到达后按顺序在工作线程中
+    送入识别器，消息结束时只需取出最终结果。
     
     注意：需要安装vosk库和下载模型文件
     pip install vosk
@@ -636,26 +1767,36 @@ class VoskSTTService(STTService):
     
     def __init__(self):
         super().__init__()
+        # 识别器喂数据使用独立线程池：音频必须全部送入识别器，不能走带准入控制的STT执行器
+        self.feed_executor: Optional[ThreadPoolExecutor] = None
     
     async def initialize(self) -> bool:
         """
         初始化真实的Vosk服务
         """
         try:
-            import vosk
-            import json
             import os
             
+            import_start = time.perf_counter()
+            import vosk
+            self.startup_timing["import_seconds"] = round(time.perf_counter() - import_start, 3)
+            
             # 检查模型文件
             if not os.path.exists(settings.vosk_model_path):
                 logger.error(f"Vosk模型文件不存在: {settings.vosk_model_path}")
                 return False
             
             # 加载模型
+            load_start = time.perf_counter()
             self.model = vosk.Model(settings.vosk_model_path)
+            self.startup_timing["model_load_seconds"] = round(time.perf_counter() - load_start, 3)
+            self.feed_executor = ThreadPoolExecutor(max_workers=settings.max_workers, thread_name_prefix="vosk-feed")
             
             self.is_initialized = True
-            logger.info(f"Vosk STT服务初始化完成（累积处理模式），模型路径: {settings.vosk_model_path}")
+            logger.info(
+                f"Vosk STT服务初始化完成（流式识别模式），模型路径: {settings.vosk_model_path}, "
+                f"vosk导入 {self.startup_timing['import_seconds']}s, 模型加载 {self.startup_timing['model_load_seconds']}s"
+            )
             
             return True
             
@@ -666,36 +1807,143 @@ class VoskSTTService(STTService):
             logger.error(f"Vosk STT服务初始化失败: {e}")
             return False
     
+    async def shutdown(self):
+        """关闭Vosk服务"""
+        await super().shutdown()
+        if self.feed_executor:
+            self.feed_executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _warm_up_inference(self, audio_bytes: bytes):
+        """Vosk预热：用临时识别器完整识别一次合成音频"""
+        import vosk
+        
+        def _sync_recognize():
+            recognizer = vosk.KaldiRecognizer(self.model, settings.vosk_sample_rate)
+            recognizer.AcceptWaveform(audio_bytes)
+            return recognizer.FinalResult()
+        
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self.feed_executor, _sync_recognize)
+    
+    async def start_stream_processing(self, session_id: str, existing_audio: bytes = None) -> bool:
+        """
+        开始Vosk音频流处理：为会话创建识别器和顺序喂数据任务
+        """
+        if session_id in self.active_streams:
+            self._stop_recognizer(self.active_streams[session_id])
+        
+        if not await super().start_stream_processing(session_id, existing_audio):
+            return False
+        
+        try:
+            import vosk
+            
+            recognizer = vosk.KaldiRecognizer(self.model, settings.vosk_sample_rate)
+            recognizer.SetWords(True)
+            
+            stream_info = self.active_streams[session_id]
+            stream_info.update({
+                "recognizer": recognizer,
+                "recognized_texts": [],
+                "last_partial_text": "",
+                "feed_queue": asyncio.Queue(),
+            })
+            stream_info["feed_task"] = asyncio.create_task(self._feed_recognizer_loop(session_id, stream_info))
+            
+            # 断连恢复时，先把已有音频送入新的识别器
+            if len(stream_info["audio_buffer"]):
+                stream_info["feed_queue"].put_nowait(stream_info["audio_buffer"].view())
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"创建Vosk识别器失败 {session_id}: {e}")
+            self._remove_stream(session_id)
+            return False
+    
+    async def _on_audio_appended(self, session_id: str, stream_info: Dict[str, Any], audio_data: bytes):
+        """音频块到达后立即排入识别器队列"""
+        stream_info["feed_queue"].put_nowait(audio_data)
+    
+    async def _feed_recognizer_loop(self, session_id: str, stream_info: Dict[str, Any]):
+        """
+        按顺序把音频送入识别器（每个会话一个任务，保证识别器不会被并发调用）
+        
+        队列中积压的多个音频块合并后一次送入，减少线程切换次数；收到None表示音频结束。
+        """
+        feed_queue: asyncio.Queue = stream_info["feed_queue"]
+        recognizer = stream_info["recognizer"]
+        loop = asyncio.get_event_loop()
+        
+        def _sync_accept(audio: bytes):
+            if recognizer.AcceptWaveform(audio):
+                return json.loads(recognizer.Result()).get("text", ""), ""
+            return None, json.loads(recognizer.PartialResult()).get("partial", "")
+        
+        finished = False
+        while not finished:
+            chunks = [await feed_queue.get()]
+            while not feed_queue.empty():
+                chunks.append(feed_queue.get_nowait())
+            if chunks[-1] is None:
+                finished = True
+                chunks.pop()
+            
+            audio = b''.join(chunks)
+            if not audio:
+                continue
+            
+            try:
+                final_text, partial_text = await loop.run_in_executor(self.feed_executor, _sync_accept, audio)
+            except Exception as e:
+                logger.error(f"Vosk识别器处理音频失败 {session_id}: {e}")
+                continue
+            
+            if final_text:
+                stream_info["recognized_texts"].append(final_text)
+            
+            if settings.vosk_partial_results:
+                live_text = " ".join(stream_info["recognized_texts"] + ([partial_text] if partial_text else []))
+                if live_text and live_text != stream_info["last_partial_text"]:
+                    stream_info["last_partial_text"] = live_text
+                    await self._emit_partial_result(session_id, live_text, len(stream_info["recognized_texts"]))
+    
+    def _stop_recognizer(self, stream_info: Dict[str, Any]):
+        """停止识别器喂数据任务"""
+        feed_task = stream_info.get("feed_task")
+        if feed_task and not feed_task.done():
+            feed_task.cancel()
+    
+    async def stop_stream_processing(self, session_id: str) -> bool:
+        """停止Vosk音频流处理"""
+        if session_id in self.active_streams:
+            self._stop_recognizer(self.active_streams[session_id])
+        return await super().stop_stream_processing(session_id)
+    
     async def get_final_transcription(self, session_id: str) -> Optional[str]:
-        """获取Vosk最终转录结果（累积模式）"""
+        """获取Vosk最终转录结果：等待剩余音频送入识别器后取最终结果"""
         if session_id not in self.active_streams:
             logger.error(f"会话 {session_id} 的音频流不存在")
             return None
         
         try:
-            import vosk
-            import json
-            
             stream_info = self.active_streams[session_id]
+            total_bytes = stream_info["total_bytes"]
             
-            # 合并所有音频块
-            all_audio = b''.join(stream_info["audio_chunks"])
-            total_bytes = len(all_audio)
-            
-            logger.info(f"开始一次性Vosk转录: {session_id}, 总字节数: {total_bytes}")
+            logger.info(f"结束Vosk流式识别: {session_id}, 总字节数: {total_bytes}")
             
             if total_bytes > 0:
-                # 创建识别器
-                recognizer = vosk.KaldiRecognizer(self.model, settings.vosk_sample_rate)
-                recognizer.SetWords(True)
+                # 通知喂数据任务音频结束，并等待积压音频处理完
+                stream_info["feed_queue"].put_nowait(None)
+                await stream_info["feed_task"]
                 
-                # 处理所有音频数据
-                if recognizer.AcceptWaveform(all_audio):
-                    result = json.loads(recognizer.Result())
-                    final_text = result.get("text", "")
-                else:
-                    final_result = json.loads(recognizer.FinalResult())
-                    final_text = final_result.get("text", "")
+                recognizer = stream_info["recognizer"]
+                loop = asyncio.get_event_loop()
+                final_result = await loop.run_in_executor(self.feed_executor, recognizer.FinalResult)
+                tail_text = json.loads(final_result).get("text", "")
+                
+                texts = stream_info["recognized_texts"] + ([tail_text] if tail_text else [])
+                final_text = " ".join(texts)
                 
                 # 如果是断连恢复，添加标记
                 if stream_info.get("is_disconnection_recovery"):
@@ -705,7 +1953,7 @@ class VoskSTTService(STTService):
             else:
                 final_text = "未检测到音频内容"
             
-            logger.info(f"Vosk累积转录完成 {session_id}: {final_text}")
+            logger.info(f"Vosk流式转录完成 {session_id}: {final_text}")
             return final_text
             
         except Exception as e:
@@ -714,14 +1962,16 @@ class VoskSTTService(STTService):
         finally:
             # 确保清理流状态
             if session_id in self.active_streams:
-                del self.active_streams[session_id]
+                self._stop_recognizer(self.active_streams[session_id])
+                self._remove_stream(session_id)
                 logger.debug(f"已清理Vosk会话流: {session_id}")
     
     async def health_check(self) -> Dict[str, Any]:
         """Vosk健康检查"""
         base_status = await super().health_check()
         base_status.update({
-            "mode": "vosk_cumulative"
+            "mode": "vosk_streaming",
+            "partial_results": settings.vosk_partial_results
         })
         return base_status
 
@@ -731,6 +1981,9 @@ def create_stt_service() -> STTService:
     """
     创建STT服务实例
     
+    推理引擎库（faster-whisper / vosk）不在模块顶层导入，只在所选引擎的
+    initialize() 中按需导入，未选用的引擎不会增加启动耗时和内存占用。
+    
     Returns:
         STTService: STT服务实例
     """
@@ -0,0 +1,162 @@
+"""
+多进程Whisper推理工作池
+
+每个工作进程加载自己的WhisperModel，绕开API进程的GIL和单进程算力上限。
+音频通过 multiprocessing.shared_memory 交给子进程，只传递共享内存名称和长度，
+不再序列化整段音频数据。
+
+每个工作进程在初始化函数中加载模型后立即执行一次预热推理，完成初始化之前不会领取任务，
+因此无论请求被分配到哪个进程，都不会落在未预热的模型上。
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 工作进程内的模型实例（每个进程一份）
+_worker_model = None
+
+
+def _init_worker(model_path: str, device: str, compute_type: str, cpu_threads: int, warmup_audio: np.ndarray = None):
+    """工作进程初始化：加载WhisperModel，并用预热音频执行一次推理"""
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model_path,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads
+    )
+
+    if warmup_audio is not None:
+        try:
+            # 关闭VAD过滤，确保合成音频真正经过编码器和解码器
+            segment_iter, _ = _worker_model.transcribe(warmup_audio, vad_filter=False)
+            list(segment_iter)
+        except Exception as e:
+            # 预热失败不影响模型使用，首个请求承担延迟初始化开销
+            logger.warning(f"工作进程预热推理失败: PID={os.getpid()}, {e}")
+
+
+def _worker_ping() -> int:
+    """确认工作进程已完成模型加载"""
+    if _worker_model is None:
+        raise RuntimeError("工作进程模型未加载")
+    return os.getpid()
+
+
+def _worker_transcribe(shm_name: str, num_samples: int, options: Dict[str, Any]) -> Tuple[List[Any], Any]:
+    """
+    工作进程中执行转录
+
+    Args:
+        shm_name: 存放float32音频的共享内存名称
+        num_samples: 音频采样点数
+        options: 转录参数
+
+    Returns:
+        Tuple[List[Segment], TranscriptionInfo]: 已完全解码的分段和转录信息
+    """
+    # 复制出音频后立即关闭共享内存：推理出错时异常回溯仍会引用传给模型的数组，
+    # 直接使用共享内存视图会导致 close() 抛出 BufferError，掩盖真正的转录错误
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        shared_audio = np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf)
+        audio = shared_audio.copy()
+        del shared_audio
+    finally:
+        shm.close()
+
+    segment_iter, info = _worker_model.transcribe(audio, **options)
+    return list(segment_iter), info
+
+
+class WhisperProcessPool:
+    """多进程Whisper推理工作池"""
+
+    def __init__(self, model_path: str, device: str, compute_type: str, num_processes: int, cpu_threads: int = 0,
+                 warmup_audio: np.ndarray = None):
+        """
+        初始化工作池
+
+        Args:
+            model_path: 模型路径
+            device: 推理设备
+            compute_type: 计算类型
+            num_processes: 工作进程数
+            cpu_threads: 每个进程的CPU线程数，0表示按CPU核心数平均分配
+            warmup_audio: float32单声道预热音频，每个工作进程加载模型后执行一次推理（为None时不预热）
+        """
+        self.num_processes = max(num_processes, 1)
+        self.cpu_threads = cpu_threads or max((os.cpu_count() or 1) // self.num_processes, 1)
+        self.model_path = model_path
+        self.device = device
+        self.compute_type = compute_type
+
+        # 使用spawn避免fork后CTranslate2/OpenMP线程状态不一致
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.num_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_path, device, compute_type, self.cpu_threads, warmup_audio)
+        )
+        self.completed_count = 0
+
+    def start(self):
+        """
+        启动全部工作进程，阻塞等待模型加载和预热（加载失败时抛出异常）
+
+        同时提交与进程数相同的探测任务，促使进程池启动全部工作进程。
+        已完成初始化的进程可能处理多个探测任务，仍在初始化的进程完成预热后才会领取请求。
+        """
+        futures = [self.pool.submit(_worker_ping) for _ in range(self.num_processes)]
+        pids = {future.result() for future in futures}
+        logger.info(
+            f"Whisper工作进程池已启动: 进程数={self.num_processes}, "
+            f"每进程线程数={self.cpu_threads}, 已就绪进程PID={sorted(pids)}"
+        )
+
+    def transcribe(self, audio: np.ndarray, options: Dict[str, Any]) -> Tuple[List[Any], Any]:
+        """
+        在工作进程中转录音频（阻塞调用，应在执行器线程中运行）
+
+        Args:
+            audio: float32单声道音频
+            options: 转录参数
+
+        Returns:
+            Tuple[List[Segment], TranscriptionInfo]: 已完全解码的分段和转录信息
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+        try:
+            shared_audio = np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)
+            shared_audio[:] = audio
+            del shared_audio
+
+            future = self.pool.submit(_worker_transcribe, shm.name, audio.shape[0], options)
+            result = future.result()
+            self.completed_count += 1
+            return result
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取工作池信息"""
+        return {
+            "processes": self.num_processes,
+            "cpu_threads_per_process": self.cpu_threads,
+            "completed": self.completed_count
+        }
+
+    def shutdown(self):
+        """关闭工作进程"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,162 @@
+"""
+会话级音频缓冲区
+
+预分配的可增长缓冲区，替代 list[bytes] + b''.join 的累积方式：
+追加时写入预留空间，容量不足时按倍数扩容；转录和断连快照通过只读
+memoryview 访问数据，不再产生整段音频的临时拷贝。
+
+配置溢出阈值后，超过阈值的会话音频改为追加到溢出目录下的文件中，
+读取时通过 mmap 映射文件，长录音不再常驻进程内存。
+"""
+import logging
+import mmap
+import os
+import tempfile
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AudioBuffer:
+    """按几何倍数增长的PCM音频缓冲区（零拷贝视图）"""
+
+    # 默认初始容量：16kHz 16-bit 单声道约2秒音频
+    DEFAULT_INITIAL_CAPACITY = 64 * 1024
+
+    def __init__(self, initial_data: Optional[bytes] = None, initial_capacity: int = DEFAULT_INITIAL_CAPACITY,
+                 spill_threshold: int = 0, spool_dir: Optional[str] = None, name: str = "audio"):
+        """
+        初始化音频缓冲区
+
+        Args:
+            initial_data: 初始音频数据（断连恢复时的已有音频）
+            initial_capacity: 初始预分配容量（字节）
+            spill_threshold: 超过该字节数后写入磁盘文件，0表示不启用
+            spool_dir: 溢出文件目录
+            name: 溢出文件名前缀（通常为会话ID）
+        """
+        initial_size = len(initial_data) if initial_data else 0
+        if spill_threshold > 0:
+            initial_size = min(initial_size, spill_threshold)
+        self._data = bytearray(max(initial_capacity, initial_size, 1))
+        self._size = 0
+        self.chunk_count = 0
+
+        # 磁盘溢出状态
+        self.spill_threshold = spill_threshold if spool_dir else 0
+        self.spool_dir = spool_dir
+        self.name = name
+        self.spill_path: Optional[str] = None
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._mmap_size = 0
+
+        if initial_data:
+            self.append(initial_data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """当前已分配的内存容量（字节），溢出到磁盘后为0"""
+        return len(self._data)
+
+    @property
+    def is_spilled(self) -> bool:
+        """音频是否已写入磁盘文件"""
+        return self._file is not None
+
+    def append(self, data: bytes):
+        """
+        追加音频数据
+
+        扩容时分配新的bytearray并复制已有数据，而不是原地resize：
+        已导出的视图继续引用旧内存，追加不会因视图存在而失败。
+        """
+        length = len(data)
+        if not length:
+            return
+
+        required = self._size + length
+        if not self.is_spilled and 0 < self.spill_threshold < required:
+            self._spill_to_disk()
+
+        if self.is_spilled:
+            self._file.write(data)
+            self._size = required
+            self.chunk_count += 1
+            return
+
+        if required > len(self._data):
+            new_capacity = max(len(self._data), 1)
+            while new_capacity < required:
+                new_capacity *= 2
+            new_data = bytearray(new_capacity)
+            new_data[:self._size] = memoryview(self._data)[:self._size]
+            self._data = new_data
+
+        # 等长切片赋值不改变bytearray大小，存在导出视图时也允许写入
+        self._data[self._size:required] = data
+        self._size = required
+        self.chunk_count += 1
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """
+        获取指定范围音频的只读零拷贝视图
+
+        视图只覆盖调用时已写入的数据，之后的追加不会改变视图内容。
+
+        Args:
+            start: 起始字节偏移
+            end: 结束字节偏移，None表示到当前末尾
+
+        Returns:
+            memoryview: 只读视图
+        """
+        end = self._size if end is None else min(end, self._size)
+
+        if self.is_spilled:
+            return self._map_file()[start:end]
+
+        return memoryview(self._data)[start:end].toreadonly()
+
+    def to_bytes(self) -> bytes:
+        """复制出完整音频数据（仅在确实需要独立bytes对象时使用）"""
+        return bytes(self.view())
+
+    def _spill_to_disk(self):
+        """把内存中的音频写入溢出文件，之后的追加直接写文件"""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        fd, self.spill_path = tempfile.mkstemp(prefix=f"{self.name}_", suffix=".pcm", dir=self.spool_dir)
+        self._file = os.fdopen(fd, "w+b")
+        self._file.write(memoryview(self._data)[:self._size])
+
+        # 已导出的内存视图仍引用旧bytearray，这里只释放缓冲区自身的引用
+        self._data = bytearray()
+        logger.info(f"音频缓冲区溢出到磁盘: {self.spill_path}, 已有 {self._size} 字节")
+
+    def _map_file(self) -> memoryview:
+        """映射溢出文件的当前内容（文件未增长时复用已有映射）"""
+        if self._size == 0:
+            return memoryview(b"")
+
+        if self._mmap is None or self._mmap_size != self._size:
+            self._file.flush()
+            # 旧映射可能仍被导出的视图引用，不主动关闭，由垃圾回收释放
+            self._mmap = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            self._mmap_size = self._size
+
+        return memoryview(self._mmap)
+
+    def close(self):
+        """释放缓冲区并删除溢出文件（已导出的视图仍可读取）"""
+        self._data = bytearray()
+        self._mmap = None
+        if self._file is not None:
+            try:
+                self._file.close()
+                os.unlink(self.spill_path)
+            except OSError as e:
+                logger.warning(f"删除音频溢出文件失败 {self.spill_path}: {e}")
+            self._file = None
@@ -0,0 +1,228 @@
+"""
+压缩音频流解码
+
+客户端可在 message_start 中声明音频编码，减少上行带宽：
+    pcm       未压缩PCM（默认，不解码；非服务端格式时由 audio_resampler 转换）
+    opus      原始Opus帧，每个音频块恰好是一个Opus数据包
+    ogg_opus  Ogg封装的Opus字节流，可以在任意位置切分成音频块
+
+每个音频流持有独立的解码状态（Ogg页拼接、Opus解码器、重采样器），
+按到达顺序增量解码为服务端配置采样率和声道数的16-bit PCM。
+解码依赖PyAV（faster-whisper已依赖），未安装时只支持pcm。
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+try:
+    import av
+except ImportError:
+    av = None
+
+logger = logging.getLogger(__name__)
+
+AUDIO_CODECS = ("pcm", "opus", "ogg_opus")
+
+# Opus解码器的固定输出采样率
+OPUS_SAMPLE_RATE = 48000
+
+_OGG_CAPTURE = b"OggS"
+_OGG_HEADER_SIZE = 27
+
+
+def is_codec_available(codec: str) -> bool:
+    """检查服务端是否支持解码该音频编码"""
+    if codec == "pcm":
+        return True
+    return codec in AUDIO_CODECS and av is not None
+
+
+class OggPacketReader:
+    """
+    增量解析Ogg页，拼出完整的数据包
+
+    输入可以在任意字节处切分。遇到无法识别的数据（如断连续传时从页中间开始）
+    会向后查找下一个页头重新同步，并丢弃跨页未拼完整的数据包。
+    只支持单个逻辑流（Opus录音的常见情况），不区分页的序列号。
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._packet = bytearray()
+        # 刚开始或重新同步后，页开头的续接数据缺少前半部分，需要丢弃
+        self._drop_continued = True
+        self.resync_count = 0
+
+    def _resync(self):
+        """丢弃未完成的数据包，等待下一个完整数据包"""
+        self._packet.clear()
+        self._drop_continued = True
+        self.resync_count += 1
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        输入一段Ogg字节流
+
+        Returns:
+            List[bytes]: 本次拼接完成的数据包
+        """
+        self._buffer += data
+        packets = []
+
+        while True:
+            start = self._buffer.find(_OGG_CAPTURE)
+            if start < 0:
+                # 保留末尾可能属于下一个页头的字节
+                if len(self._buffer) > len(_OGG_CAPTURE) - 1:
+                    del self._buffer[:len(self._buffer) - (len(_OGG_CAPTURE) - 1)]
+                    self._resync()
+                break
+            if start > 0:
+                del self._buffer[:start]
+                self._resync()
+
+            if len(self._buffer) < _OGG_HEADER_SIZE:
+                break
+            if self._buffer[4] != 0:
+                # 版本号不为0，不是真正的页头
+                del self._buffer[:len(_OGG_CAPTURE)]
+                self._resync()
+                continue
+
+            segment_count = self._buffer[26]
+            header_size = _OGG_HEADER_SIZE + segment_count
+            if len(self._buffer) < header_size:
+                break
+            lacing = bytes(self._buffer[_OGG_HEADER_SIZE:header_size])
+            page_size = header_size + sum(lacing)
+            if len(self._buffer) < page_size:
+                break
+
+            continued = bool(self._buffer[5] & 0x01)
+            if not continued and self._packet:
+                # 上一页声明数据包未结束，但本页不是续接页：数据包已损坏
+                self._packet.clear()
+
+            body = memoryview(self._buffer)[header_size:page_size]
+            offset = 0
+            drop = continued and self._drop_continued
+            for lace in lacing:
+                if not drop:
+                    self._packet += body[offset:offset + lace]
+                offset += lace
+                if lace < 255:
+                    if not drop:
+                        packets.append(bytes(self._packet))
+                    self._packet.clear()
+                    drop = False
+            body.release()
+            self._drop_continued = False
+
+            del self._buffer[:page_size]
+
+        return packets
+
+
+class OpusStreamDecoder:
+    """单个音频流的Opus解码状态"""
+
+    def __init__(self, codec: str, sample_rate: int, channels: int):
+        """
+        初始化解码器
+
+        Args:
+            codec: 音频编码（opus / ogg_opus）
+            sample_rate: 输出PCM采样率
+            channels: 输出PCM声道数（1或2）
+        """
+        if av is None:
+            raise RuntimeError("未安装PyAV，无法解码Opus音频")
+        if codec not in ("opus", "ogg_opus"):
+            raise ValueError(f"不支持的音频编码: {codec}")
+        if channels not in (1, 2):
+            raise ValueError(f"Opus解码只支持输出单声道或双声道，当前配置: {channels}")
+
+        self.codec = codec
+        self._reader = OggPacketReader() if codec == "ogg_opus" else None
+        self._context = None
+        self._opus_head: Optional[bytes] = None
+        self._resampler = av.AudioResampler(
+            format="s16",
+            layout="mono" if channels == 1 else "stereo",
+            rate=sample_rate
+        )
+
+        # 统计信息
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.packet_count = 0
+        self.error_count = 0
+
+    def _open_context(self, first_packet: bytes):
+        """
+        创建Opus解码上下文
+
+        Ogg流使用OpusHead作为extradata（声道映射、pre-skip由解码器处理）；
+        原始Opus帧或从流中间续传时，按首个数据包TOC字节的立体声标志确定声道数。
+        """
+        context = av.CodecContext.create("opus", "r")
+        context.sample_rate = OPUS_SAMPLE_RATE
+        if self._opus_head:
+            context.extradata = self._opus_head
+        else:
+            context.layout = "stereo" if first_packet[0] & 0x04 else "mono"
+        self._context = context
+        return context
+
+    def decode(self, data: bytes) -> bytes:
+        """
+        解码一个音频块（阻塞操作，应在线程池中执行；同一解码器的调用必须串行）
+
+        Args:
+            data: 压缩音频数据（原始Opus数据包或Ogg字节流片段）
+
+        Returns:
+            bytes: 解码后的16-bit PCM（Ogg页未拼完整时可能为空）
+        """
+        self.input_bytes += len(data)
+        packets = self._reader.feed(data) if self._reader else [bytes(data)]
+
+        output = []
+        for packet in packets:
+            if not packet:
+                continue
+            if packet.startswith(b"OpusHead"):
+                # 新的逻辑流：按新的流头重建解码器
+                self._opus_head = packet
+                self._context = None
+                continue
+            if packet.startswith(b"OpusTags"):
+                continue
+
+            context = self._context or self._open_context(packet)
+            try:
+                frames = context.decode(av.Packet(packet))
+            except av.error.FFmpegError as e:
+                self.error_count += 1
+                logger.debug(f"Opus数据包解码失败: {e}")
+                continue
+
+            self.packet_count += 1
+            for frame in frames:
+                for resampled in self._resampler.resample(frame):
+                    output.append(resampled.to_ndarray().tobytes())
+
+        pcm_data = b"".join(output)
+        self.output_bytes += len(pcm_data)
+        return pcm_data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取解码统计"""
+        return {
+            "codec": self.codec,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "compression_ratio": round(self.output_bytes / self.input_bytes, 2) if self.input_bytes else 0.0,
+            "packet_count": self.packet_count,
+            "error_count": self.error_count,
+            "resync_count": self._reader.resync_count if self._reader else 0
+        }
@@ -0,0 +1,143 @@
+"""
+会话音频日志
+
+录音过程中把写入缓冲区的PCM数据同步追加到每个会话的日志文件中，
+会话JSON只记录日志路径和长度。进程重启后直接从日志文件恢复音频，
+不需要把音频序列化进JSON，也不会在每次保存会话时重写整段音频。
+
+写入使用无缓冲的追加写（数据立即进入页缓存），fsync按时间间隔批量执行。
+"""
+import logging
+import mmap
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AudioJournal:
+    """只追加的会话音频日志文件"""
+
+    def __init__(self, path: str, existing_audio: Optional[bytes] = None, fsync_interval: float = 1.0):
+        """
+        打开音频日志
+
+        Args:
+            path: 日志文件路径
+            existing_audio: 已有音频（断连恢复时）。日志文件已包含这些音频时直接续写，
+                否则重新创建日志并写入已有音频
+            fsync_interval: 两次fsync的最小间隔（秒），0表示每次追加后都需要同步
+        """
+        self.path = path
+        self.fsync_interval = max(fsync_interval, 0.0)
+        self.length = 0
+        self.synced_length = 0
+        self._last_sync_at = time.monotonic()
+        self._sync_pending = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        existing_length = len(existing_audio) if existing_audio else 0
+
+        if existing_length and os.path.exists(path) and os.path.getsize(path) >= existing_length:
+            # 日志已包含已有音频：截掉之后未确认的尾部，继续追加
+            self._file = open(path, "r+b", buffering=0)
+            self._file.truncate(existing_length)
+            self._file.seek(existing_length)
+            self.length = existing_length
+            self.synced_length = existing_length
+        else:
+            self._file = open(path, "wb", buffering=0)
+            if existing_length:
+                self.append(existing_audio)
+
+    def append(self, data: bytes):
+        """追加音频数据（写入页缓存，不等待落盘）"""
+        if not len(data):
+            return
+        self._file.write(data)
+        self.length += len(data)
+
+    def claim_sync(self) -> bool:
+        """
+        检查是否到了批量fsync的时间
+
+        Returns:
+            bool: 需要同步时返回True并标记同步进行中，调用方随后应在线程池中执行 sync()
+        """
+        if (
+            self._sync_pending
+            or self.length <= self.synced_length
+            or time.monotonic() - self._last_sync_at < self.fsync_interval
+        ):
+            return False
+        self._sync_pending = True
+        return True
+
+    def sync(self) -> int:
+        """
+        将已追加的数据落盘（阻塞操作，应在线程池中执行）
+
+        Returns:
+            int: 已落盘的长度
+        """
+        length = self.length
+        try:
+            os.fsync(self._file.fileno())
+            self.synced_length = max(self.synced_length, length)
+        except (OSError, ValueError) as e:
+            logger.warning(f"音频日志同步失败 {self.path}: {e}")
+        finally:
+            self._last_sync_at = time.monotonic()
+            self._sync_pending = False
+        return self.synced_length
+
+    def close(self, discard: bool = False):
+        """
+        关闭日志
+
+        Args:
+            discard: 是否删除日志文件（消息转录完成后不再需要）
+        """
+        try:
+            self._file.close()
+        except OSError as e:
+            logger.warning(f"关闭音频日志失败 {self.path}: {e}")
+        if discard:
+            self.remove(self.path)
+
+    @staticmethod
+    def read(path: str, length: int) -> Optional[memoryview]:
+        """
+        通过mmap读取日志中前 length 字节的音频（不复制数据）
+
+        Returns:
+            Optional[memoryview]: 音频视图；文件不存在或长度不足时返回None
+        """
+        try:
+            if length <= 0 or os.path.getsize(path) < length:
+                logger.warning(f"音频日志不存在或长度不足: {path}, 需要 {length} 字节")
+                return None
+            with open(path, "rb") as file:
+                return memoryview(mmap.mmap(file.fileno(), length, access=mmap.ACCESS_READ))
+        except OSError as e:
+            logger.error(f"读取音频日志失败 {path}: {e}")
+            return None
+
+    @staticmethod
+    def size(path: str) -> int:
+        """日志文件当前长度（不存在时为0）"""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def remove(path: str):
+        """删除日志文件（不存在时忽略）"""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"删除音频日志失败 {path}: {e}")
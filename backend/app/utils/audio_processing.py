@@ -0,0 +1,70 @@
+"""
+音频数据处理工具
+"""
+from typing import List
+
+import numpy as np
+
+
+def pcm16_to_float32(audio_bytes, channels: int = 1) -> np.ndarray:
+    """
+    将16-bit PCM字节数据转换为Whisper所需的float32单声道数组
+
+    Args:
+        audio_bytes: 小端序16-bit PCM数据（bytes/bytearray/memoryview）
+        channels: 声道数，多声道数据按帧取平均混为单声道
+
+    Returns:
+        np.ndarray: 取值范围[-1.0, 1.0)的float32数组
+    """
+    # 丢弃末尾不完整的采样帧，避免frombuffer报错
+    frame_bytes = 2 * max(channels, 1)
+    usable_bytes = len(audio_bytes) - len(audio_bytes) % frame_bytes
+    samples = np.frombuffer(audio_bytes, dtype="<i2", count=usable_bytes // 2)
+
+    if channels > 1:
+        return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32) / np.float32(32768.0)
+
+    return samples.astype(np.float32) / np.float32(32768.0)
+
+
+def find_silence_split_points(audio_bytes, sample_rate: int, channels: int, window_seconds: float,
+                              search_seconds: float, frame_ms: int = 30) -> List[int]:
+    """
+    在静音处把长音频切分为不超过 window_seconds 的窗口
+
+    每个窗口的切分点取窗口末尾 search_seconds 范围内能量最低的帧，尽量避免切断语音。
+
+    Args:
+        audio_bytes: 16-bit PCM数据
+        sample_rate: 采样率
+        channels: 声道数
+        window_seconds: 窗口最大时长（秒）
+        search_seconds: 在窗口末尾搜索静音的范围（秒）
+        frame_ms: 能量计算帧长（毫秒）
+
+    Returns:
+        List[int]: 切分点的字节偏移（不含开头和末尾），按升序排列
+    """
+    frame_samples = max(int(sample_rate * frame_ms / 1000), 1) * max(channels, 1)
+    frame_count = len(audio_bytes) // (frame_samples * 2)
+    window_frames = max(int(window_seconds * 1000 / frame_ms), 1)
+    search_frames = min(max(int(search_seconds * 1000 / frame_ms), 1), window_frames)
+
+    if frame_count <= window_frames:
+        return []
+
+    samples = np.frombuffer(audio_bytes, dtype="<i2", count=frame_count * frame_samples)
+    frames = samples.reshape(frame_count, frame_samples).astype(np.float32)
+    energy = np.mean(frames * frames, axis=1)
+
+    split_points = []
+    start = 0
+    while frame_count - start > window_frames:
+        search_end = start + window_frames
+        search_start = search_end - search_frames
+        cut = search_start + int(np.argmin(energy[search_start:search_end]))
+        split_points.append(cut * frame_samples * 2)
+        start = cut
+
+    return split_points
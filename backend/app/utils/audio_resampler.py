@@ -0,0 +1,196 @@
+"""
+流式PCM格式转换（采样位宽、声道混音、重采样）
+
+客户端可在 message_start 中声明录音的采样率、声道数和采样位宽，
+服务端按音频块增量转换为配置的 audio_sample_rate / audio_channels 16-bit PCM，
+缓冲区中始终保存服务端格式的音频，最终转录时不需要再处理整段音频。
+
+重采样使用Kaiser窗sinc低通滤波器的多相（polyphase）实现：
+按 gcd 约简得到上采样/下采样倍数 up/down，每个输出采样只计算对应相位的 K 个滤波器系数，
+一个音频块的全部输出采样用NumPy一次向量化计算，块之间保留 K-1 个输入采样作为滤波历史。
+"""
+from math import ceil, gcd
+from typing import Any, Dict
+
+import numpy as np
+
+SAMPLE_WIDTHS = (1, 2, 3, 4)
+
+
+class PolyphaseResampler:
+    """有状态的多相FIR重采样器（输入输出为float32，形状为 (采样数, 声道数)）"""
+
+    def __init__(self, input_rate: int, output_rate: int, channels: int = 1,
+                 zero_crossings: int = 8, rolloff: float = 0.94, beta: float = 8.6):
+        """
+        初始化重采样器
+
+        Args:
+            input_rate: 输入采样率
+            output_rate: 输出采样率
+            channels: 声道数
+            zero_crossings: 低通滤波器单侧过零点数（越大过渡带越窄，计算量越大）
+            rolloff: 截止频率相对于较低奈奎斯特频率的比例
+            beta: Kaiser窗参数
+        """
+        divisor = gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self.channels = channels
+
+        # 原型滤波器工作在 up * input_rate 的采样率上
+        cutoff = 0.5 * rolloff / max(self.up, self.down)
+        self.taps_per_phase = int(ceil(2 * zero_crossings * max(self.up, self.down) / self.up))
+        length = self.taps_per_phase * self.up
+        center = (length - 1) / 2
+        n = np.arange(length)
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * (n - center)) * np.kaiser(length, beta) * self.up
+        # polyphase[p, k] = prototype[p + k * up]
+        self._polyphase = prototype.reshape(self.taps_per_phase, self.up).T.astype(np.float32)
+
+        self._tap_offsets = np.arange(self.taps_per_phase)
+        # 滤波历史：最近 K-1 个输入采样，_history_start 为其中第一个采样的全局序号
+        self._history = np.zeros((self.taps_per_phase - 1, channels), dtype=np.float32)
+        self._history_start = -(self.taps_per_phase - 1)
+        self._next_output = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        重采样一个音频块
+
+        Args:
+            samples: float32输入采样，形状 (采样数, 声道数)
+
+        Returns:
+            np.ndarray: float32输出采样，形状 (采样数, 声道数)
+        """
+        data = np.concatenate((self._history, samples)) if len(self._history) else samples
+        last_input = self._history_start + len(data) - 1
+
+        # 输出采样 m 需要的最新输入采样为 floor(m * down / up)
+        output_end = -(-(last_input + 1) * self.up // self.down)
+        outputs = np.arange(self._next_output, output_end, dtype=np.int64)
+        self._next_output = max(output_end, self._next_output)
+
+        if len(outputs):
+            positions = outputs * self.down
+            newest = positions // self.up - self._history_start
+            phases = positions % self.up
+            indices = newest[:, None] - self._tap_offsets[None, :]
+            coefficients = self._polyphase[phases]
+            result = np.einsum("ijc,ij->ic", data[indices], coefficients)
+        else:
+            result = np.zeros((0, self.channels), dtype=np.float32)
+
+        keep = self.taps_per_phase - 1
+        if keep:
+            self._history = data[len(data) - keep:]
+            self._history_start = last_input - keep + 1
+        else:
+            self._history_start = last_input + 1
+        return result.astype(np.float32, copy=False)
+
+
+class PCMFormatConverter:
+    """把客户端声明格式的PCM音频块转换为服务端格式的16-bit PCM"""
+
+    def __init__(self, input_rate: int, input_channels: int, sample_width: int,
+                 output_rate: int, output_channels: int):
+        """
+        初始化格式转换器
+
+        Args:
+            input_rate: 客户端采样率
+            input_channels: 客户端声道数
+            sample_width: 客户端采样位宽（字节，1为无符号8-bit，2/3/4为有符号小端整数）
+            output_rate: 服务端采样率
+            output_channels: 服务端声道数
+        """
+        if sample_width not in SAMPLE_WIDTHS:
+            raise ValueError(f"不支持的采样位宽: {sample_width}")
+        if input_rate <= 0 or input_channels <= 0:
+            raise ValueError(f"无效的音频格式: {input_rate}Hz, {input_channels}声道")
+
+        self.input_rate = input_rate
+        self.input_channels = input_channels
+        self.sample_width = sample_width
+        self.output_rate = output_rate
+        self.output_channels = output_channels
+        self.frame_bytes = sample_width * input_channels
+
+        self._resampler = (
+            PolyphaseResampler(input_rate, output_rate, output_channels) if input_rate != output_rate else None
+        )
+        # 不足一个采样帧的剩余字节，与下一个音频块拼接
+        self._remainder = b""
+
+        # 统计信息
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+    def _to_float(self, data: bytes, frame_count: int) -> np.ndarray:
+        """按采样位宽解析为 [-1, 1) 的float32采样，形状 (帧数, 输入声道数)"""
+        sample_count = frame_count * self.input_channels
+        if self.sample_width == 1:
+            raw = np.frombuffer(data, dtype=np.uint8, count=sample_count)
+            samples = (raw.astype(np.float32) - 128.0) / 128.0
+        elif self.sample_width == 2:
+            samples = np.frombuffer(data, dtype="<i2", count=sample_count).astype(np.float32) / 32768.0
+        elif self.sample_width == 3:
+            raw = np.frombuffer(data, dtype=np.uint8, count=sample_count * 3).reshape(-1, 3).astype(np.int32)
+            values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+            values = np.where(values >= 1 << 23, values - (1 << 24), values)
+            samples = values.astype(np.float32) / float(1 << 23)
+        else:
+            samples = np.frombuffer(data, dtype="<i4", count=sample_count).astype(np.float32) / float(1 << 31)
+        return samples.reshape(frame_count, self.input_channels)
+
+    def _remix(self, samples: np.ndarray) -> np.ndarray:
+        """把输入声道混音到输出声道数"""
+        if self.input_channels == self.output_channels:
+            return samples
+        mono = samples.mean(axis=1, keepdims=True, dtype=np.float32)
+        if self.output_channels == 1:
+            return mono
+        return np.repeat(mono, self.output_channels, axis=1)
+
+    def decode(self, data: bytes) -> bytes:
+        """
+        转换一个音频块（阻塞操作，应在线程池中执行；同一转换器的调用必须串行）
+
+        Args:
+            data: 客户端格式的PCM数据
+
+        Returns:
+            bytes: 服务端格式的16-bit PCM（不足一个采样帧时可能为空）
+        """
+        self.input_bytes += len(data)
+        buffer = self._remainder + bytes(data) if self._remainder else data
+        frame_count = len(buffer) // self.frame_bytes
+        usable_bytes = frame_count * self.frame_bytes
+        self._remainder = bytes(buffer[usable_bytes:])
+        if frame_count == 0:
+            return b""
+
+        # 先混音再重采样，多声道输入只需要对输出声道做滤波
+        samples = self._remix(self._to_float(buffer, frame_count))
+        if self._resampler:
+            samples = self._resampler.process(samples)
+
+        pcm_data = np.clip(np.rint(samples * 32768.0), -32768, 32767).astype("<i2").tobytes()
+        self.output_bytes += len(pcm_data)
+        return pcm_data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取转换统计"""
+        return {
+            "codec": "pcm",
+            "input_format": {
+                "sample_rate": self.input_rate,
+                "channels": self.input_channels,
+                "sample_width": self.sample_width
+            },
+            "resample_ratio": f"{self._resampler.up}/{self._resampler.down}" if self._resampler else None,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes
+        }
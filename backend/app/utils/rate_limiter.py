@@ -0,0 +1,44 @@
+"""
+令牌桶限流器
+"""
+import time
+
+
+class TokenBucket:
+    """令牌桶：按固定速率补充令牌，允许不超过容量的突发"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量（最大突发量），默认等于每秒速率
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        尝试取出令牌
+
+        Returns:
+            bool: 令牌充足时取出并返回True，否则返回False（不等待）
+        """
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def time_until_available(self, tokens: float = 1.0) -> float:
+        """距离可以取出指定数量令牌还需等待的秒数"""
+        self._refill()
+        return max(tokens - self.tokens, 0.0) / self.rate
@@ -0,0 +1,68 @@
+"""
+转录结果缓存
+
+断连恢复或客户端重试时，同一段音频经常会被多次最终转录。
+以PCM数据的blake2b摘要加上解码参数作为键，缓存最终转录文本，
+容量有限，超出时淘汰最久未使用的条目。
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class TranscriptionCache:
+    """按音频内容哈希索引的LRU转录结果缓存"""
+
+    def __init__(self, max_entries: int):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多缓存的转录结果数量
+        """
+        self.max_entries = max(max_entries, 1)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @staticmethod
+    def make_key(audio_bytes: bytes, params: Dict[str, Any]) -> str:
+        """
+        计算缓存键（阻塞操作，长音频应在线程池中调用）
+
+        Args:
+            audio_bytes: PCM音频数据（支持memoryview，不产生拷贝）
+            params: 影响转录结果的解码参数（模型、beam_size、语言等）
+        """
+        digest = hashlib.blake2b(audio_bytes, digest_size=16)
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """查找缓存的转录文本，未命中返回None"""
+        text = self._entries.get(key)
+        if text is None:
+            self.miss_count += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hit_count += 1
+        return text
+
+    def put(self, key: str, text: str):
+        """写入转录文本，超出容量时淘汰最久未使用的条目"""
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中统计"""
+        lookups = self.hit_count + self.miss_count
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hit_count,
+            "misses": self.miss_count,
+            "hit_rate": round(self.hit_count / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,171 @@
+"""
+流式能量语音活动检测（VAD）
+
+按固定帧长计算16-bit PCM的RMS能量（dBFS），低于阈值的帧视为静音。
+语音前后各保留 padding 时长的静音，更长的静音段在写入缓冲区前直接丢弃。
+同时检测语音之间的停顿，供分段转录在停顿处切分音频。
+"""
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class StreamingEnergyVAD:
+    """按音频块增量处理的能量VAD"""
+
+    def __init__(self, sample_rate: int = 16000, channels: int = 1, frame_ms: int = 30,
+                 threshold_db: float = -45.0, padding_ms: int = 300, min_pause_ms: int = 500,
+                 drop_silence: bool = True):
+        """
+        初始化VAD
+
+        Args:
+            sample_rate: 采样率
+            channels: 声道数
+            frame_ms: 判定帧长（毫秒）
+            threshold_db: 语音能量阈值（dBFS），高于该值的帧视为语音
+            padding_ms: 语音前后保留的静音时长（毫秒）
+            min_pause_ms: 语音后静音持续该时长即视为一次停顿（毫秒）
+            drop_silence: 是否丢弃长静音；为False时只做检测，音频原样返回
+        """
+        self.frame_bytes = max(int(sample_rate * frame_ms / 1000), 1) * max(channels, 1) * 2
+        self.threshold_db = threshold_db
+        self.padding_frames = max(int(padding_ms / frame_ms), 0)
+        self.pause_frames = max(int(min_pause_ms / frame_ms), 1)
+        self.drop_silence = drop_silence
+
+        # 不足一帧的剩余数据，与下一个音频块拼接后再判定
+        self._remainder = b""
+        # 长静音中最近的若干帧，遇到语音时作为前置padding输出
+        self._pending_silence: deque = deque(maxlen=self.padding_frames or 1)
+        # 距离上一个语音帧的静音帧数（初始视为长静音，录音开头的静音也会被裁剪）
+        self._silence_run = self.padding_frames
+        self._speech_since_pause = False
+
+        # 最近一次 process() 中检测到停顿时，停顿点之后输出的字节数；本块内无停顿时为None
+        self.last_pause_tail: Optional[int] = None
+
+        # 统计信息
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.kept_bytes = 0
+        self.dropped_bytes = 0
+        self.pause_count = 0
+
+    def _classify(self, frames: np.ndarray) -> np.ndarray:
+        """向量化计算每帧能量，返回是否为语音的布尔数组"""
+        samples = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(samples * samples, axis=1))
+        energy_db = 20.0 * np.log10(rms / 32768.0 + 1e-10)
+        return energy_db >= self.threshold_db
+
+    def process(self, audio_data: bytes) -> bytes:
+        """
+        处理一个音频块
+
+        Args:
+            audio_data: 16-bit PCM数据
+
+        Returns:
+            bytes: 去除长静音后需要保留的音频（可能为空）
+        """
+        self.last_pause_tail = None
+        if not self.drop_silence:
+            return self._detect_only(audio_data)
+
+        data = self._remainder + bytes(audio_data) if self._remainder else audio_data
+        frame_count = len(data) // self.frame_bytes
+        usable_bytes = frame_count * self.frame_bytes
+        self._remainder = bytes(data[usable_bytes:])
+
+        if frame_count == 0:
+            return b""
+
+        frames = np.frombuffer(data, dtype="<i2", count=usable_bytes // 2).reshape(frame_count, -1)
+        is_speech = self._classify(frames)
+
+        view = memoryview(data)
+        kept = []
+        kept_bytes = 0
+        pause_at = None
+        for index, speech in enumerate(is_speech):
+            frame = view[index * self.frame_bytes:(index + 1) * self.frame_bytes]
+            if speech:
+                self.speech_frames += 1
+                kept.extend(self._pending_silence)
+                kept_bytes += len(self._pending_silence) * self.frame_bytes
+                self._pending_silence.clear()
+                kept.append(frame)
+                kept_bytes += self.frame_bytes
+                self._silence_run = 0
+                self._speech_since_pause = True
+                continue
+
+            self.silence_frames += 1
+            self._silence_run += 1
+            if self._is_pause():
+                pause_at = kept_bytes + (self.frame_bytes if self._silence_run <= self.padding_frames else 0)
+            if self._silence_run <= self.padding_frames:
+                # 语音结束后的尾部padding
+                kept.append(frame)
+                kept_bytes += self.frame_bytes
+            elif self.padding_frames:
+                if len(self._pending_silence) == self._pending_silence.maxlen:
+                    self.dropped_bytes += self.frame_bytes
+                self._pending_silence.append(bytes(frame))
+            else:
+                self.dropped_bytes += self.frame_bytes
+
+        output = b"".join(kept)
+        self.kept_bytes += len(output)
+        if pause_at is not None:
+            self.last_pause_tail = len(output) - pause_at
+        return output
+
+    def _is_pause(self) -> bool:
+        """当前静音帧是否使语音后的静音达到停顿时长（每次停顿只触发一次）"""
+        if self._speech_since_pause and self._silence_run == self.pause_frames:
+            self._speech_since_pause = False
+            self.pause_count += 1
+            return True
+        return False
+
+    def _detect_only(self, audio_data: bytes) -> bytes:
+        """只检测语音和停顿，不丢弃音频"""
+        data = self._remainder + bytes(audio_data) if self._remainder else audio_data
+        frame_count = len(data) // self.frame_bytes
+        usable_bytes = frame_count * self.frame_bytes
+        # 剩余不足一帧的数据留到下一块参与判定，但本块音频原样返回
+        remainder_bytes = len(data) - usable_bytes
+        self._remainder = bytes(data[usable_bytes:])
+
+        if frame_count:
+            frames = np.frombuffer(data, dtype="<i2", count=usable_bytes // 2).reshape(frame_count, -1)
+            pause_end = None
+            for index, speech in enumerate(self._classify(frames)):
+                if speech:
+                    self.speech_frames += 1
+                    self._silence_run = 0
+                    self._speech_since_pause = True
+                    continue
+                self.silence_frames += 1
+                self._silence_run += 1
+                if self._is_pause():
+                    pause_end = (index + 1) * self.frame_bytes
+            if pause_end is not None:
+                self.last_pause_tail = usable_bytes - pause_end + remainder_bytes
+
+        self.kept_bytes += len(audio_data)
+        return audio_data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取语音/静音占比统计"""
+        total_frames = self.speech_frames + self.silence_frames
+        return {
+            "speech_ratio": round(self.speech_frames / total_frames, 3) if total_frames else 0.0,
+            "silence_ratio": round(self.silence_frames / total_frames, 3) if total_frames else 0.0,
+            "kept_bytes": self.kept_bytes,
+            "dropped_bytes": self.dropped_bytes,
+            "pause_count": self.pause_count
+        }
@@ -0,0 +1,51 @@
+"""
+二进制音频帧编解码
+
+客户端在 message_start 中声明 binary_audio 后，可直接发送WebSocket二进制帧传输音频，
+不再经过 JSON 解析、事件模型校验和 base64 解码。
+
+帧格式（小端序）:
+    stream_handle  uint32  服务端在 audio_stream_ready 事件中分配的音频流句柄
+    sequence       uint32  客户端音频块序号（从0开始递增）
+    payload        bytes   音频数据（message_start 声明格式的PCM，或协商的压缩编码数据）
+"""
+import struct
+from typing import Tuple
+
+AUDIO_FRAME_HEADER = struct.Struct("<II")
+AUDIO_FRAME_HEADER_SIZE = AUDIO_FRAME_HEADER.size
+
+
+def parse_audio_frame(frame: bytes) -> Tuple[int, int, memoryview]:
+    """
+    解析二进制音频帧
+
+    Args:
+        frame: WebSocket二进制消息
+
+    Returns:
+        Tuple[int, int, memoryview]: (音频流句柄, 序号, PCM数据的零拷贝视图)
+
+    Raises:
+        ValueError: 帧长度不足帧头大小
+    """
+    if len(frame) < AUDIO_FRAME_HEADER_SIZE:
+        raise ValueError(f"二进制音频帧长度不足: {len(frame)} 字节，帧头需要 {AUDIO_FRAME_HEADER_SIZE} 字节")
+
+    stream_handle, sequence = AUDIO_FRAME_HEADER.unpack_from(frame)
+    return stream_handle, sequence, memoryview(frame)[AUDIO_FRAME_HEADER_SIZE:]
+
+
+def build_audio_frame(stream_handle: int, sequence: int, pcm_data: bytes) -> bytes:
+    """
+    构造二进制音频帧（供客户端和测试脚本使用）
+
+    Args:
+        stream_handle: 音频流句柄
+        sequence: 音频块序号
+        pcm_data: 原始PCM数据
+
+    Returns:
+        bytes: 完整的二进制帧
+    """
+    return AUDIO_FRAME_HEADER.pack(stream_handle, sequence & 0xFFFFFFFF) + pcm_data
@@ -11,6 +11,12 @@ from datetime import datetime, timedelta
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import ValidationError
 
+from config.settings import settings
+from app.services.stt_executor import STTOverloadedError, STTTimeoutError
+from app.utils.audio_codec import is_codec_available
+from app.utils.audio_journal import AudioJournal
+from app.utils.rate_limiter import TokenBucket
+from app.websocket.audio_frames import parse_audio_frame
 from app.models.events import (
     EventTypes, ErrorCodes,
     IncomingEvent, OutgoingEvent,
@@ -18,16 +24,19 @@ from app.models.events import (
     ManualGenerateEvent, UserModificationEvent, UserSelectedResponseEvent,
     ScenarioSupplementEvent, ResponseCountUpdateEvent, ConversationEndEvent,
     SessionResumeEvent, GetMessageHistoryEvent,
-    SessionCreatedEvent, MessageRecordedEvent,
+    SessionCreatedEvent, MessageRecordedEvent, PartialTranscriptionEvent, AudioStreamReadyEvent, AudioBackpressureEvent,
     LLMResponseEvent, StatusUpdateEvent, ErrorEvent, SessionRestoredEvent,
     MessageHistoryResponseEvent, OpinionPredictionEvent, ProfileArchiveEvent,
-    SessionCreatedData, MessageRecordedData,
+    SessionCreatedData, MessageRecordedData, PartialTranscriptionData, AudioStreamReadyData, AudioBackpressureData,
     LLMResponseData, StatusUpdateData, ErrorData, SessionRestoredData,
     MessageHistoryResponseData, MessageHistoryItem, OpinionPredictionData, ProfileArchiveData
 )
 
 logger = logging.getLogger(__name__)
 
+# 同一音频流两次背压通知的最小间隔（秒），避免每个被丢弃的音频块都推送一次
+BACKPRESSURE_NOTIFY_INTERVAL = 1.0
+
 
 class WebSocketHandler:
     """WebSocket事件处理器"""
@@ -43,6 +52,15 @@ class WebSocketHandler:
         self.heartbeat_task = None   # 心跳检查任务
         self.heartbeat_interval = 30  # 心跳间隔（秒）
         self.connection_timeout = 300  # 连接超时时间（秒）
+        
+        # 二进制音频流句柄: handle -> {session_id, client_id, last_sequence}
+        self.audio_stream_handles: Dict[int, Dict[str, Any]] = {}
+        self.session_stream_handles: Dict[str, int] = {}
+        self._next_stream_handle = 1
+        
+        # 音频流量控制状态: session_id -> {bucket, dropped_chunks, last_notified_at,
+        #                               sequenced, next_sequence, received_bytes, duplicate_chunks}
+        self.audio_flow_control: Dict[str, Dict[str, Any]] = {}
     
     def set_services(self, session_manager, stt_service=None, llm_service=None, request_manager=None, persistence_manager=None):
         """注入服务依赖"""
@@ -51,6 +69,10 @@ class WebSocketHandler:
         self.llm_service = llm_service
         self.request_manager = request_manager
         self.persistence_manager = persistence_manager
+        
+        # 渐进式转录的部分结果由STT服务回调推送
+        if self.stt_service:
+            self.stt_service.set_partial_result_callback(self.send_partial_transcription)
     
     # ===============================
     # 连接管理
@@ -139,11 +161,13 @@ class WebSocketHandler:
         try:
             while True:
                 try:
-                    # 接收消息（带超时）
-                    data = await asyncio.wait_for(
-                        websocket.receive_text(), 
+                    # 接收消息（带超时），文本帧为JSON事件，二进制帧为音频数据
+                    received = await asyncio.wait_for(
+                        websocket.receive(), 
                         timeout=self.connection_timeout
                     )
+                    if received["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(received.get("code", 1000))
                     
                     # 更新活动时间和消息计数
                     if client_id in self.connection_info:
@@ -152,8 +176,11 @@ class WebSocketHandler:
                         info["message_count"] += 1
                     
                     try:
-                        message = json.loads(data)
-                        await self.handle_event(client_id, message)
+                        if received.get("bytes") is not None:
+                            await self.handle_binary_audio(client_id, received["bytes"])
+                        else:
+                            message = json.loads(received.get("text") or "")
+                            await self.handle_event(client_id, message)
                     except json.JSONDecodeError as e:
                         if client_id in self.connection_info:
                             self.connection_info[client_id]["error_count"] += 1
@@ -295,6 +322,14 @@ class WebSocketHandler:
         
         session_id = event.data.session_id
         sender = event.data.sender
+        audio_codec = event.data.audio_codec
+        audio_input_format = {
+            key: value for key, value in (
+                ("sample_rate", event.data.sample_rate),
+                ("channels", event.data.channels),
+                ("sample_width", event.data.sample_width)
+            ) if value is not None
+        } or None
         
         # 验证会话存在
         if not self.session_manager.session_exists(session_id):
@@ -306,6 +341,26 @@ class WebSocketHandler:
             )
             return
         
+        if not is_codec_available(audio_codec):
+            await self.send_error(
+                client_id,
+                ErrorCodes.INVALID_EVENT_DATA,
+                f"服务端不支持音频编码: {audio_codec}",
+                session_id=session_id
+            )
+            return
+        
+        # 在改变任何状态前拒绝无法处理的输入格式
+        format_error = self.stt_service.validate_stream_format(audio_codec, audio_input_format) if self.stt_service else None
+        if format_error:
+            await self.send_error(
+                client_id,
+                ErrorCodes.INVALID_EVENT_DATA,
+                f"不支持的音频输入格式: {format_error}",
+                session_id=session_id
+            )
+            return
+        
         # 取消所有未完成的LLM请求
         if self.request_manager:
             cancelled_count = await self.request_manager.cancel_all_requests(session_id)
@@ -313,12 +368,17 @@ class WebSocketHandler:
                 logger.info(f"消息开始时取消了 {cancelled_count} 个未完成的LLM请求: {session_id}")
         
         # 开始新消息
-        temp_message_id = self.session_manager.start_message(session_id, sender)
+        temp_message_id = self.session_manager.start_message(
+            session_id, sender, audio_codec, audio_input_format, event.data.binary_audio
+        )
         
         # 启动STT音频流处理
         if self.stt_service:
             success = await self.stt_service.start_stream_processing(session_id)
+            success = success and self.stt_service.set_stream_format(session_id, audio_codec, audio_input_format)
             if not success:
+                # 不保留格式未设置成功的音频流，避免后续音频按错误的格式写入
+                await self.stt_service.discard_stream(session_id)
                 await self.send_error(
                     client_id,
                     ErrorCodes.STT_SERVICE_ERROR,
@@ -326,7 +386,21 @@ class WebSocketHandler:
                     session_id=session_id
                 )
                 return
-            logger.info(f"已启动音频流处理: {session_id}")
+            logger.info(f"已启动音频流处理: {session_id}, 音频编码: {audio_codec}, 输入格式: {audio_input_format}")
+            
+            # 打开音频日志时就记录路径并保存会话，进程异常退出后仍能找到并恢复（或清理）该日志
+            journal_path = self.stt_service.get_audio_journal_path(session_id)
+            session = self.session_manager.get_session(session_id)
+            if journal_path and session:
+                session.set_audio_journal(journal_path, 0)
+                await self._save_recording_session(session)
+        
+        # 为新消息重置音频流量控制和二进制音频流句柄
+        self.audio_flow_control.pop(session_id, None)
+        self._release_stream_handle(session_id)
+        if event.data.binary_audio:
+            stream_handle = self._allocate_stream_handle(session_id, client_id)
+            await self.send_audio_stream_ready(client_id, session_id, stream_handle)
         
         # 更新状态
         await self.send_status_update(session_id, "recording_message", "开始录制消息")
@@ -360,10 +434,237 @@ class WebSocketHandler:
         
         # 处理音频数据
         if self.stt_service:
-            await self.stt_service.process_audio_chunk(session_id, audio_chunk)
+            sequence = event.data.sequence
+            if not await self._accept_chunk_sequence(client_id, session_id, sequence):
+                return
+            if not await self._admit_audio_chunk(client_id, session_id):
+                return
+            result = await self.stt_service.process_audio_chunk(session_id, audio_chunk)
+            await self._handle_audio_result(client_id, session_id, result)
+            self._advance_chunk_sequence(session_id, sequence, self._base64_decoded_length(audio_chunk), result)
         
         logger.debug(f"音频流处理: {session_id}, 数据长度: {len(audio_chunk)}")
     
+    async def handle_binary_audio(self, client_id: str, frame: bytes):
+        """
+        处理二进制音频帧
+        
+        帧头中的句柄在 message_start 时分配并绑定到会话和连接，
+        PCM数据直接写入STT缓冲区，不经过JSON解析和base64解码。
+        """
+        try:
+            stream_handle, sequence, pcm_data = parse_audio_frame(frame)
+        except ValueError as e:
+            await self.send_error(client_id, ErrorCodes.INVALID_EVENT_DATA, "无效的二进制音频帧", str(e))
+            return
+        
+        handle_info = self.audio_stream_handles.get(stream_handle)
+        if not handle_info or handle_info["client_id"] != client_id:
+            # 句柄只保存在内存中：服务重启、消息已结束或句柄属于其他连接时，该帧被丢弃，
+            # 客户端需要使用重连后下发的 audio_stream_ready 句柄，或重新发送 message_start
+            await self.send_error(
+                client_id,
+                ErrorCodes.AUDIO_STREAM_HANDLE_INVALID,
+                f"音频流句柄无效或已失效: {stream_handle}",
+                "音频帧已丢弃，请使用最新收到的audio_stream_ready句柄，或重新发送message_start"
+            )
+            return
+        
+        session_id = handle_info["session_id"]
+        handle_info["last_sequence"] = sequence
+        
+        session = self.session_manager.get_session(session_id)
+        if session and session.is_recovering_from_disconnect:
+            logger.info(f"音频流恢复中: {session_id}")
+            session.is_recovering_from_disconnect = False
+        
+        if self.stt_service:
+            if not await self._accept_chunk_sequence(client_id, session_id, sequence):
+                return
+            if not await self._admit_audio_chunk(client_id, session_id):
+                return
+            result = await self.stt_service.process_audio_bytes(session_id, pcm_data)
+            await self._handle_audio_result(client_id, session_id, result)
+            self._advance_chunk_sequence(session_id, sequence, len(pcm_data), result)
+        
+        logger.debug(f"二进制音频流处理: {session_id}, 序号: {sequence}, 数据长度: {len(pcm_data)}")
+    
+    def _get_audio_flow_control(self, session_id: str) -> Dict[str, Any]:
+        """获取（必要时创建）会话音频流的流量控制状态"""
+        state = self.audio_flow_control.get(session_id)
+        if state is None:
+            rate = settings.audio_max_chunks_per_second
+            state = {
+                "bucket": TokenBucket(rate) if rate > 0 else None,
+                "dropped_chunks": 0,
+                "last_notified_at": 0.0,
+                # 断点续传：已连续接收的音频块序号和字节数
+                "sequenced": False,
+                "next_sequence": 0,
+                "received_bytes": 0,
+                "duplicate_chunks": 0
+            }
+            self.audio_flow_control[session_id] = state
+        return state
+    
+    async def _accept_chunk_sequence(self, client_id: str, session_id: str, sequence: Optional[int]) -> bool:
+        """
+        按序号检查音频块（未携带序号时直接接收）
+        
+        已接收过的序号直接忽略（重连后重发的音频块不会重复写入）；
+        序号超前说明中间有音频块未被接收，丢弃并通知客户端从缺失处重新发送。
+        
+        Returns:
+            bool: 是否为下一个期望的音频块
+        """
+        if sequence is None:
+            return True
+        
+        state = self._get_audio_flow_control(session_id)
+        state["sequenced"] = True
+        expected = state["next_sequence"]
+        if sequence == expected:
+            return True
+        
+        if sequence < expected:
+            state["duplicate_chunks"] += 1
+            logger.debug(f"忽略重复音频块 {session_id}: 序号 {sequence}, 期望 {expected}")
+            return False
+        
+        state["dropped_chunks"] += 1
+        await self._notify_audio_backpressure(
+            client_id, session_id, state, "sequence_gap",
+            f"音频块序号不连续 (收到 {sequence}，期望 {expected})，请从序号 {expected} 重新发送"
+        )
+        return False
+    
+    def _advance_chunk_sequence(self, session_id: str, sequence: Optional[int], byte_count: int,
+                                result: Optional[Dict[str, Any]]):
+        """音频块被STT服务接收后才推进已连续接收的位置（解码失败、流不存在、缓冲区已满时不推进）"""
+        if sequence is None or not (result and result.get("accepted")):
+            return
+        
+        state = self._get_audio_flow_control(session_id)
+        state["next_sequence"] = sequence + 1
+        state["received_bytes"] += byte_count
+    
+    @staticmethod
+    def _base64_decoded_length(data: str) -> int:
+        """计算base64字符串解码后的字节数（无需实际解码）"""
+        return len(data) * 3 // 4 - data[-2:].count("=")
+    
+    def _get_audio_resume_point(self, session):
+        """
+        录音中恢复时客户端应重新发送的起点
+        
+        Returns:
+            Tuple[Optional[int], Optional[int]]: (起始序号, 已接收字节数)；
+            客户端未使用序号且服务端仍有音频时为 (None, None)
+        """
+        if not session.is_recording_message():
+            return None, None
+        
+        state = self.audio_flow_control.get(session.id)
+        if state and state["sequenced"]:
+            return state["next_sequence"], state["received_bytes"]
+        if session.audio_next_sequence is not None:
+            # 服务重启后从会话记录的续传位置恢复
+            return session.audio_next_sequence, session.audio_received_bytes
+        
+        # 服务端没有任何该消息的音频时，需要从头发送
+        has_audio = (
+            (self.stt_service and self.stt_service.is_stream_active(session.id)
+             and self.stt_service.get_accumulated_audio(session.id))
+            or session.get_accumulated_audio()
+            or (session.audio_journal_path and self._audio_journal_length(session) > 0)
+        )
+        return (None, None) if has_audio else (0, 0)
+    
+    @staticmethod
+    def _audio_journal_length(session) -> int:
+        """会话音频日志中可恢复的字节数（断连时未记录长度，即进程异常退出时，按文件实际长度）"""
+        return session.audio_journal_length or AudioJournal.size(session.audio_journal_path)
+    
+    async def _admit_audio_chunk(self, client_id: str, session_id: str) -> bool:
+        """
+        按令牌桶检查音频块发送速率
+        
+        Returns:
+            bool: 是否接收该音频块；超限时丢弃并通知客户端暂停发送
+        """
+        state = self._get_audio_flow_control(session_id)
+        bucket = state["bucket"]
+        if bucket is None or bucket.try_acquire():
+            return True
+        
+        state["dropped_chunks"] += 1
+        retry_after = bucket.time_until_available()
+        message = f"音频发送速率超过限制 ({settings.audio_max_chunks_per_second} 块/秒)，音频块已丢弃"
+        if state["sequenced"]:
+            message += f"，请从序号 {state['next_sequence']} 重新发送"
+        # 使用序号时，被丢弃的块之后的音频块都会按序号不连续丢弃，每次丢弃都需要告知客户端续传位置
+        await self._notify_audio_backpressure(
+            client_id, session_id, state, "rate_limited", message,
+            retry_after_ms=max(int(retry_after * 1000), 1),
+            throttle=not state["sequenced"]
+        )
+        return False
+    
+    async def _handle_audio_result(self, client_id: str, session_id: str, result: Optional[Dict[str, Any]]):
+        """处理STT服务返回的背压信息（缓冲区已满时音频块未被保存）"""
+        if not result or not result.get("buffer_full"):
+            return
+        
+        state = self._get_audio_flow_control(session_id)
+        state["dropped_chunks"] += 1
+        await self._notify_audio_backpressure(
+            client_id, session_id, state, "buffer_full",
+            f"{result.get('message', '音频缓冲区已满')}，请结束当前消息",
+            throttle=not state["sequenced"]
+        )
+    
+    async def _notify_audio_backpressure(self, client_id: str, session_id: str, state: Dict[str, Any],
+                                         reason: str, message: str, retry_after_ms: Optional[int] = None,
+                                         throttle: bool = True):
+        """向发送音频的连接推送背压事件（throttle 为True时限制通知频率）"""
+        now = time.monotonic()
+        if throttle and now - state["last_notified_at"] < BACKPRESSURE_NOTIFY_INTERVAL:
+            return
+        state["last_notified_at"] = now
+        
+        logger.warning(f"音频背压 {session_id}: {reason}, 已丢弃 {state['dropped_chunks']} 块")
+        event = AudioBackpressureEvent(
+            type="audio_backpressure",
+            data=AudioBackpressureData(
+                session_id=session_id,
+                reason=reason,
+                retry_after_ms=retry_after_ms,
+                dropped_chunks=state["dropped_chunks"],
+                resume_sequence=state["next_sequence"] if state["sequenced"] else None,
+                message=message
+            )
+        )
+        await self.send_event(client_id, event)
+    
+    def _allocate_stream_handle(self, session_id: str, client_id: str) -> int:
+        """为会话分配二进制音频流句柄"""
+        stream_handle = self._next_stream_handle
+        self._next_stream_handle = self._next_stream_handle % 0xFFFFFFFF + 1
+        
+        self.audio_stream_handles[stream_handle] = {
+            "session_id": session_id,
+            "client_id": client_id,
+            "last_sequence": None
+        }
+        self.session_stream_handles[session_id] = stream_handle
+        return stream_handle
+    
+    def _release_stream_handle(self, session_id: str):
+        """释放会话的二进制音频流句柄"""
+        stream_handle = self.session_stream_handles.pop(session_id, None)
+        if stream_handle is not None:
+            self.audio_stream_handles.pop(stream_handle, None)
+    
     async def handle_message_end(self, client_id: str, event_data: Dict[str, Any]):
         """处理消息结束事件"""
         event = MessageEndEvent(type="message_end", data=event_data)
@@ -387,16 +688,43 @@ class WebSocketHandler:
         
         # 完成STT转录
         content = ""
+        transcription_quality = None
         if self.stt_service:
-            final_content = await self.stt_service.get_final_transcription(session_id)
+            try:
+                final_content = await self.stt_service.get_final_transcription(session_id)
+            except STTOverloadedError as e:
+                # 音频仍保留在服务端，客户端可稍后重新发送message_end
+                await self.send_error(
+                    client_id,
+                    ErrorCodes.SERVICE_OVERLOADED,
+                    "语音识别服务繁忙，请稍后重新结束消息",
+                    str(e),
+                    session_id=session_id
+                )
+                await self.send_status_update(session_id, "recording_message", "语音识别繁忙，可重新发送消息结束")
+                return
+            except STTTimeoutError as e:
+                await self.send_error(
+                    client_id,
+                    ErrorCodes.SERVICE_TIMEOUT,
+                    "语音识别超时，请稍后重新结束消息",
+                    str(e),
+                    session_id=session_id
+                )
+                await self.send_status_update(session_id, "recording_message", "语音识别超时，可重新发送消息结束")
+                return
             if final_content:
                 content = final_content
+            transcription_quality = self.stt_service.pop_transcription_quality(session_id)
+        
+        self._release_stream_handle(session_id)
+        self.audio_flow_control.pop(session_id, None)
         
         # 结束消息并获取正式ID
         message_id = self.session_manager.end_message(session_id, content)
         
         # 发送消息记录确认（包含消息内容）
-        await self.send_message_recorded(session_id, message_id, content)
+        await self.send_message_recorded(session_id, message_id, content, transcription_quality)
         
         # 主动保存会话（有新消息时）
         if self.persistence_manager:
@@ -582,6 +910,10 @@ class WebSocketHandler:
             await self.request_manager.cancel_all_requests(session_id)
         
         # 销毁会话
+        self._release_stream_handle(session_id)
+        self.audio_flow_control.pop(session_id, None)
+        if self.stt_service:
+            await self.stt_service.release_session(session_id)
         self.session_manager.destroy_session(session_id)
         
         # 删除持久化的会话文件（正常结束）
@@ -770,12 +1102,23 @@ class WebSocketHandler:
                     # 将音频数据保存到会话中
                     session.set_accumulated_audio(accumulated_audio)
                     session.set_partial_transcription(f"录音中断连，已保存 {audio_size} 字节音频", audio_size)
+                    
+                    # 音频日志落盘，会话JSON只记录日志路径和长度
+                    journal_info = await self.stt_service.sync_audio_journal(session_id)
+                    if journal_info:
+                        session.set_audio_journal(journal_info["path"], journal_info["length"])
+                        logger.info(f"音频日志已落盘: {session_id}, {journal_info['path']} ({journal_info['length']} 字节)")
                 else:
                     # 没有音频数据，只记录状态
                     session.set_partial_transcription("录音开始但无音频数据", 0)
             else:
                 # STT服务不可用或流未激活
                 session.set_partial_transcription("录音中断连，STT服务不可用", 0)
+            
+            # 记录音频块续传位置，服务重启后仍可告知客户端从何处重新发送
+            flow_state = self.audio_flow_control.get(session_id)
+            if flow_state and flow_state["sequenced"]:
+                session.set_audio_upload_progress(flow_state["next_sequence"], flow_state["received_bytes"])
                 
             # 保持 RECORDING_MESSAGE 状态，不清理临时消息状态
             # 这样重连后可以继续接收音频
@@ -815,17 +1158,52 @@ class WebSocketHandler:
                 if self.stt_service:
                     # 检查是否需要重启STT流
                     if not self.stt_service.is_stream_active(session_id):
-                        # 获取保存的累积音频数据
+                        # 获取保存的累积音频数据（服务重启后内存中没有音频，从音频日志恢复）
                         existing_audio = session.get_accumulated_audio()
+                        if existing_audio is None and session.audio_journal_path:
+                            journal_length = self._audio_journal_length(session)
+                            if journal_length:
+                                existing_audio = AudioJournal.read(session.audio_journal_path, journal_length)
                         
                         success = await self.stt_service.start_stream_processing(session_id, existing_audio=existing_audio)
+                        # 解码器状态不随会话保存，按协商的输入格式重新创建（Ogg流从下一个页头重新同步）
+                        success = success and self.stt_service.set_stream_format(
+                            session_id, session.audio_codec, session.audio_input_format
+                        )
                         if success:
                             logger.info(f"重连后重新启动音频流处理: {session_id}, 恢复音频: {len(existing_audio) if existing_audio else 0} 字节")
                         else:
+                            # 不保留格式未恢复的音频流（保留音频日志），通知客户端重新开始录音
                             logger.error(f"重连后启动音频流处理失败: {session_id}")
+                            await self.stt_service.discard_stream(session_id, discard_journal=False)
+                            await self.send_error(
+                                client_id,
+                                ErrorCodes.STT_SERVICE_ERROR,
+                                "恢复音频流处理失败，请重新发送message_start开始录音",
+                                session_id=session_id
+                            )
                     else:
                         logger.info(f"音频流处理仍然活动: {session_id}")
                 
+                # 服务重启后按会话记录恢复音频块续传位置
+                if session_id not in self.audio_flow_control and session.audio_next_sequence is not None:
+                    flow_state = self._get_audio_flow_control(session_id)
+                    flow_state.update({
+                        "sequenced": True,
+                        "next_sequence": session.audio_next_sequence,
+                        "received_bytes": session.audio_received_bytes
+                    })
+                
+                # 二进制音频流句柄改绑到新连接；服务重启后内存中没有句柄，按会话记录重新分配
+                stream_handle = self.session_stream_handles.get(session_id)
+                if stream_handle is not None:
+                    self.audio_stream_handles[stream_handle]["client_id"] = client_id
+                    await self.send_audio_stream_ready(client_id, session_id, stream_handle)
+                elif session.audio_binary and self.stt_service and self.stt_service.is_stream_active(session_id):
+                    stream_handle = self._allocate_stream_handle(session_id, client_id)
+                    await self.send_audio_stream_ready(client_id, session_id, stream_handle)
+                    logger.info(f"重新分配二进制音频流句柄: {session_id}, 句柄: {stream_handle}")
+                
                 # 发送状态更新，通知前端可以继续录音
                 await self.send_status_update(
                     session_id, 
@@ -838,6 +1216,16 @@ class WebSocketHandler:
         except Exception as e:
             logger.error(f"检查录音恢复异常 {session.id}: {e}")
             
+    async def _save_recording_session(self, session):
+        """录音开始时保存会话（记录音频日志路径）"""
+        if not self.persistence_manager:
+            return
+        try:
+            if not await self.persistence_manager.save_session(session):
+                logger.warning(f"录音开始时保存会话失败: {session.id}")
+        except Exception as e:
+            logger.error(f"录音开始时保存会话异常 {session.id}: {e}")
+    
     async def _save_session_on_disconnect(self, session_id: str):
         """在连接断开时保存会话"""
         if not self.persistence_manager or not self.session_manager:
@@ -873,6 +1261,7 @@ class WebSocketHandler:
     
     async def send_session_restored(self, client_id: str, session):
         """发送会话恢复成功事件"""
+        audio_resume_sequence, audio_received_bytes = self._get_audio_resume_point(session)
         event = SessionRestoredEvent(
             type="session_restored",
             data=SessionRestoredData(
@@ -882,12 +1271,15 @@ class WebSocketHandler:
                 scenario_description=session.scenario_description,
                 response_count=session.response_count,
                 has_modifications=len(session.modifications) > 0,
-                restored_at=datetime.utcnow().isoformat()
+                restored_at=datetime.utcnow().isoformat(),
+                audio_resume_sequence=audio_resume_sequence,
+                audio_received_bytes=audio_received_bytes
             )
         )
         await self.send_event(client_id, event)
     
-    async def send_message_recorded(self, session_id: str, message_id: str, message_content: Optional[str] = None):
+    async def send_message_recorded(self, session_id: str, message_id: str, message_content: Optional[str] = None,
+                                    transcription_quality: Optional[str] = None):
         """发送消息记录确认事件"""
         # 找到对应的客户端
         for client_id in self.active_connections:
@@ -896,11 +1288,38 @@ class WebSocketHandler:
                 data=MessageRecordedData(
                     session_id=session_id,
                     message_id=message_id,
-                    message_content=message_content
+                    message_content=message_content,
+                    transcription_quality=transcription_quality
                 )
             )
             await self.send_event(client_id, event)
 
+    async def send_partial_transcription(self, session_id: str, partial_text: str, segment_index: int):
+        """发送部分转录结果事件（仅发送给关联该会话的连接）"""
+        for client_id, info in list(self.connection_info.items()):
+            if session_id not in info.get("session_ids", []):
+                continue
+            event = PartialTranscriptionEvent(
+                type="partial_transcription_update",
+                data=PartialTranscriptionData(
+                    session_id=session_id,
+                    partial_text=partial_text,
+                    segment_index=segment_index
+                )
+            )
+            await self.send_event(client_id, event)
+
+    async def send_audio_stream_ready(self, client_id: str, session_id: str, stream_handle: int):
+        """发送二进制音频流就绪事件（仅发送给发起录音的连接）"""
+        event = AudioStreamReadyEvent(
+            type="audio_stream_ready",
+            data=AudioStreamReadyData(
+                session_id=session_id,
+                stream_handle=stream_handle
+            )
+        )
+        await self.send_event(client_id, event)
+    
     async def send_profile_archive(
         self,
         session_id: str,
@@ -1095,6 +1514,7 @@ class WebSocketHandler:
             "error_rate": round(total_errors / max(total_messages, 1) * 100, 2),
             "heartbeat_interval": self.heartbeat_interval,
             "connection_timeout": self.connection_timeout,
+            "binary_audio_streams": len(self.audio_stream_handles),
             "connections": connection_details
         }
     
@@ -59,6 +59,26 @@ class Settings(BaseSettings):
         default=16,
         description="Whisper批处理大小"
     )
+    whisper_batching_enabled: bool = Field(
+        default=False,
+        description="是否启用跨会话批量推理：在时间窗口内合并多个会话的转录请求，一次批量推理"
+    )
+    whisper_batch_window_ms: int = Field(
+        default=30,
+        description="跨会话批量推理收集请求的时间窗口（毫秒）"
+    )
+    whisper_parallel_transcription: bool = Field(
+        default=False,
+        description="是否将超过一个窗口时长的长音频在静音处切分为重叠窗口并行转录"
+    )
+    whisper_parallel_window_seconds: float = Field(
+        default=30.0,
+        description="并行转录的窗口最大时长（秒）"
+    )
+    whisper_parallel_overlap_seconds: float = Field(
+        default=1.0,
+        description="并行转录相邻窗口之间的重叠时长（秒）"
+    )
     whisper_beam_size: int = Field(
         default=5,
         description="Whisper束搜索大小"
@@ -67,6 +87,22 @@ class Settings(BaseSettings):
         default=None,
         description="强制指定语言（如'zh', 'en'），None为自动检测"
     )
+    whisper_language_pinning: bool = Field(
+        default=True,
+        description="自动检测语言时，按会话锁定已检测到的语言，后续消息跳过语言检测"
+    )
+    whisper_language_pin_probability: float = Field(
+        default=0.8,
+        description="检测到的语言概率达到该值时锁定会话语言"
+    )
+    whisper_language_redetect_logprob: float = Field(
+        default=-1.0,
+        description="锁定语言后转录的平均对数概率低于该值时解除锁定，下次重新检测"
+    )
+    whisper_language_pin_max_sessions: int = Field(
+        default=10000,
+        description="最多保留的会话语言锁定数量（超过时淘汰最久未使用的会话）"
+    )
     # VAD Filter: Automatically filter out silence
     whisper_vad_filter: bool = Field(
         default=True,
@@ -74,9 +110,65 @@ class Settings(BaseSettings):
     )
 
     # Progressive Transcription Buffer
+    whisper_progressive_transcription: bool = Field(
+        default=False,
+        description="是否启用渐进式转录：录音过程中在后台分段转录，并向客户端推送部分转录结果"
+    )
     whisper_progressive_transcription_seconds: float = Field(
         default=1.0,
-        description="Buffer duration in seconds for progressive transcription. Audio chunks are processed each time this duration is reached."
+        description="Minimum segment duration in seconds for progressive transcription. Without pause segmentation, audio is processed each time this duration is reached."
+    )
+    whisper_progressive_segment_on_pause: bool = Field(
+        default=True,
+        description="渐进式转录在VAD检测到的停顿处切分音频（分段至少 whisper_progressive_transcription_seconds 秒，最长 whisper_progressive_max_segment_seconds 秒）；关闭时按固定时长切分"
+    )
+    whisper_progressive_min_pause_ms: int = Field(
+        default=500,
+        description="语音后静音持续多少毫秒视为可切分的停顿"
+    )
+    whisper_progressive_max_segment_seconds: float = Field(
+        default=25.0,
+        description="按停顿切分时单个分段的最大时长（秒），一直没有停顿时强制切分"
+    )
+    whisper_num_workers: int = Field(
+        default=1,
+        description="进程内Whisper模型副本数（CTranslate2 num_workers），大于1时多个转录请求并行推理"
+    )
+    whisper_cpu_threads: int = Field(
+        default=0,
+        description="每个模型副本的CPU线程数，0表示自动：单副本时为 max_workers，多副本时按CPU核心数在副本间平均分配"
+    )
+    whisper_partial_model_name: str = Field(
+        default="",
+        description="渐进式部分转录使用的小模型名称（如tiny、base），为空时与最终转录共用 whisper_model_name"
+    )
+    whisper_partial_max_workers: int = Field(
+        default=1,
+        description="部分转录模型的并发推理数（独立于最终转录的执行器）"
+    )
+    whisper_partial_cpu_threads: int = Field(
+        default=2,
+        description="部分转录模型的CPU线程数"
+    )
+    whisper_adaptive_quality: bool = Field(
+        default=False,
+        description="是否启用负载自适应转录质量：STT排队过深时降低beam_size、关闭词级时间戳或改用部分转录小模型"
+    )
+    whisper_degrade_queue_depth: int = Field(
+        default=4,
+        description="STT排队请求数达到该值时降低转录质量，达到两倍时进一步降级"
+    )
+    whisper_degrade_wait_ms: float = Field(
+        default=2000.0,
+        description="STT请求排队等待达到该毫秒数时降低转录质量，达到两倍时进一步降级"
+    )
+    whisper_degraded_beam_size: int = Field(
+        default=1,
+        description="降级时使用的beam_size"
+    )
+    whisper_quality_recover_seconds: float = Field(
+        default=10.0,
+        description="负载回落后持续多少秒才恢复一级转录质量"
     )
     whisper_word_timestamps: bool = Field(
         default=False,
@@ -104,6 +196,10 @@ class Settings(BaseSettings):
         default=16000,
         description="Vosk音频采样率"
     )
+    vosk_partial_results: bool = Field(
+        default=False,
+        description="是否在录音过程中推送Vosk流式识别的部分结果（实时字幕）"
+    )
     
     # Server Configuration
     host: str = Field(default="127.0.0.1", description="服务器主机地址")
@@ -116,6 +212,8 @@ class Settings(BaseSettings):
     
     # Timeout Settings (seconds)
     stt_timeout: int = Field(default=30, description="STT服务超时时间")
+    stt_queue_max_size: int = Field(default=32, description="STT执行器等待队列上限，超过后拒绝新的转录请求")
+    stt_result_cache_size: int = Field(default=64, description="最终转录结果缓存条数（按音频内容哈希和解码参数索引），0表示禁用")
     llm_timeout: int = Field(default=30, description="LLM服务超时时间")
     websocket_timeout: int = Field(default=600, description="WebSocket连接超时时间")
     websocket_ping_interval: int = Field(default=30, description="WebSocket心跳间隔时间")
@@ -136,10 +234,48 @@ class Settings(BaseSettings):
     audio_channels: int = Field(default=1, description="音频声道数")
     audio_buffer_max_size: int = Field(default=50*1024*1024, description="音频缓冲区最大大小(50MB)")
     audio_buffer_cleanup_interval: int = Field(default=10, description="音频缓冲区清理间隔(秒)")
-    audio_max_chunks_per_second: int = Field(default=100, description="每秒最大音频块数量(背压控制)")
+    audio_max_chunks_per_second: int = Field(default=100, description="每个音频流每秒最大音频块数量(令牌桶背压控制，0表示不限制)")
+    audio_spill_threshold: int = Field(
+        default=0,
+        description="单个会话累积音频超过该字节数后改为写入磁盘文件并通过mmap读取，0表示不启用"
+    )
+    audio_spool_dir: str = Field(default="./audio_spool", description="音频溢出文件存放目录")
+    audio_journal_enabled: bool = Field(
+        default=False,
+        description="是否将录音中的音频同步追加到会话音频日志文件，断连或重启后从日志恢复"
+    )
+    audio_journal_dir: str = Field(default="./audio_journal", description="会话音频日志文件存放目录")
+    audio_journal_fsync_interval: float = Field(
+        default=1.0,
+        description="音频日志批量fsync的最小间隔（秒），0表示每个音频块写入后都同步"
+    )
+    audio_vad_enabled: bool = Field(default=False, description="是否在音频写入缓冲区前用能量VAD丢弃长静音")
+    audio_vad_threshold_db: float = Field(default=-45.0, description="VAD语音能量阈值(dBFS)，低于该值的帧视为静音")
+    audio_vad_padding_ms: int = Field(default=300, description="VAD在语音前后保留的静音时长(毫秒)")
+    audio_vad_frame_ms: int = Field(default=30, description="VAD判定帧长(毫秒)")
     
     # Performance Configuration
     max_workers: int = Field(default=4, description="最大工作线程数")
+    stt_worker_processes: int = Field(
+        default=0,
+        description="Whisper推理工作进程数，每个进程加载独立模型；0表示在API进程内推理"
+    )
+    stt_worker_cpu_threads: int = Field(
+        default=0,
+        description="每个Whisper工作进程的CPU线程数，0表示按CPU核心数平均分配"
+    )
+    service_warmup_enabled: bool = Field(
+        default=True,
+        description="启动后在后台用合成音频预热STT模型并预热LLM连接，完成前就绪检查返回未就绪"
+    )
+    service_warmup_max_attempts: int = Field(
+        default=3,
+        description="每个服务的最大预热尝试次数，用尽后记录错误并按未预热状态就绪"
+    )
+    service_warmup_retry_seconds: float = Field(
+        default=2.0,
+        description="预热失败后首次重试的等待时间（秒），之后每次翻倍"
+    )
     
     # Session Persistence Configuration
     session_persistence_enabled: bool = Field(default=True, description="是否启用会话持久化")
@@ -277,6 +277,7 @@ class RemoteTestRunner:
             ("test_websocket_features.py", "WebSocket功能测试"),
             ("test_conversation_features.py", "完整对话功能测试"),
             ("test_user_corpus_and_opinion_keywords.py", "档案回传测试"),
+            ("test_audio_streaming.py", "音频流专项测试"),
         ]
         
         print(f"\n📋 计划执行 {len(test_suites)} 个测试套件:")
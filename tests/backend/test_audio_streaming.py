@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+音频流专项测试脚本
+测试远程后端的二进制音频帧句柄、音频块序号（去重/断点续传）、
+录音中重连续传、过载拒绝、音频编码协商和就绪检查
+"""
+
+import asyncio
+import base64
+import struct
+import sys
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# 添加项目路径
+sys.path.append(os.path.dirname(__file__))
+from remote_test_base import RemoteTestBase
+
+
+# 二进制音频帧帧头：stream_handle(uint32) + sequence(uint32)，小端序
+AUDIO_FRAME_HEADER = struct.Struct("<II")
+
+
+class AudioStreamingTester(RemoteTestBase):
+    """音频流测试器"""
+
+    def __init__(self, config_file: str = "remote_test_config.json"):
+        super().__init__(config_file)
+
+        # 从配置文件加载音频流测试设置
+        self.audio_config = self.config.get("audio_streaming_test", {})
+        self.sample_rate = self.audio_config.get("sample_rate", 16000)
+        self.chunk_ms = self.audio_config.get("chunk_ms", 100)
+        self.overload_sessions = self.audio_config.get("overload_sessions", 8)
+        self.overload_audio_seconds = self.audio_config.get("overload_audio_seconds", 5)
+        self.overload_retry_interval = self.audio_config.get("overload_retry_interval", 2)
+        self.overload_max_retries = self.audio_config.get("overload_max_retries", 10)
+        self.rate_limit_burst = self.audio_config.get("rate_limit_burst", 200)
+        self.event_timeout = self.audio_config.get("event_timeout", 10)
+
+        # 等待某类事件时收到的其他事件，按连接暂存，后续等待时优先匹配
+        self.pending_events: Dict[int, List[Dict[str, Any]]] = {}
+
+    def generate_pcm_chunk(self, fill: int = 0) -> bytes:
+        """生成一个音频块的16-bit单声道PCM（fill 为每个字节的取值，便于区分音频块）"""
+        return bytes([fill]) * (self.sample_rate * self.chunk_ms // 1000 * 2)
+
+    async def wait_for_event(self, websocket, expected_types: List[str],
+                             timeout: Optional[float] = None,
+                             session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        等待指定类型之一的事件
+
+        Args:
+            websocket: WebSocket连接
+            expected_types: 期望的事件类型列表
+            timeout: 总等待时间
+            session_id: 只匹配该会话的事件（后端会向所有连接广播部分会话事件）
+
+        Returns:
+            接收到的事件或None（超时）
+        """
+        def matches(event: Dict[str, Any]) -> bool:
+            event_session = event.get("data", {}).get("session_id")
+            return event.get("type") in expected_types and (
+                session_id is None or event_session in (None, session_id)
+            )
+
+        timeout = timeout or self.event_timeout
+        pending = self.pending_events.setdefault(id(websocket), [])
+        for event in pending:
+            if matches(event):
+                pending.remove(event)
+                return event
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            event = await self.receive_websocket_event(websocket, None, max(deadline - time.time(), 0.1))
+            if not event:
+                return None
+            if matches(event):
+                return event
+            pending.append(event)
+        return None
+
+    async def send_binary_frame(self, websocket, stream_handle: int, sequence: int, payload: bytes) -> bool:
+        """发送二进制音频帧"""
+        try:
+            await websocket.send(AUDIO_FRAME_HEADER.pack(stream_handle, sequence) + payload)
+            success = True
+        except Exception as e:
+            print(f"❌ 发送二进制音频帧失败: {e}")
+            success = False
+
+        self._log_event("SEND", "binary_audio_frame", {
+            "stream_handle": stream_handle,
+            "sequence": sequence,
+            "payload_size": len(payload)
+        }, success=success)
+        return success
+
+    async def send_sequenced_chunk(self, websocket, session_id: str, sequence: int) -> bool:
+        """发送携带序号的 audio_stream 事件（音频内容按序号填充）"""
+        return await self.send_websocket_event(websocket, "audio_stream", {
+            "session_id": session_id,
+            "audio_chunk": base64.b64encode(self.generate_pcm_chunk(sequence % 256)).decode(),
+            "sequence": sequence
+        })
+
+    async def open_recording(self, binary_audio: bool = False, **format_fields):
+        """
+        建立连接、创建会话并开始录音
+
+        Returns:
+            (websocket, session_id, stream_handle)，失败时 websocket 为None
+        """
+        websocket = await self.connect_websocket()
+        if not websocket:
+            return None, None, None
+
+        session_id = await self.start_conversation(websocket, scenario_description="音频流专项测试", response_count=2)
+        if not session_id:
+            await websocket.close()
+            return None, None, None
+
+        event_data = {"session_id": session_id, "sender": "音频流测试用户", "binary_audio": binary_audio}
+        event_data.update(format_fields)
+        await self.send_websocket_event(websocket, "message_start", event_data)
+
+        stream_handle = None
+        if binary_audio:
+            ready_event = await self.wait_for_event(websocket, ["audio_stream_ready", "error"])
+            if not ready_event or ready_event["type"] != "audio_stream_ready":
+                await websocket.close()
+                return None, session_id, None
+            stream_handle = ready_event["data"]["stream_handle"]
+
+        return websocket, session_id, stream_handle
+
+    async def close_session(self, websocket, session_id: Optional[str]):
+        """结束对话并关闭连接"""
+        if not websocket:
+            return
+        try:
+            if session_id:
+                await self.end_conversation(websocket, session_id)
+            await websocket.close()
+        except Exception:
+            pass
+        self.pending_events.pop(id(websocket), None)
+
+    async def test_readiness_endpoint(self) -> bool:
+        """测试就绪检查端点"""
+        print("\n🧪 测试就绪检查端点...")
+
+        result = await self.test_http_endpoint("/ready")
+        data = result.get("response_data") or {}
+        if result["status_code"] not in (200, 503) or "ready" not in data:
+            self.log_test_result("就绪检查测试", False, f"响应异常: {result['status_code']} {result.get('error')}")
+            return False
+
+        # 就绪与状态码一致；预热重试用尽的服务在 warmup_errors 中返回错误
+        consistent = data["ready"] == (result["status_code"] == 200)
+        details = f"ready={data['ready']}, checks={data.get('checks')}, warmup_errors={data.get('warmup_errors')}"
+        self.log_test_result("就绪检查测试", consistent, details)
+        return consistent
+
+    async def test_binary_handle_binding(self) -> bool:
+        """测试二进制音频帧句柄绑定：正确句柄被接收，未知句柄和其他连接的句柄被拒绝"""
+        print("\n🧪 测试二进制音频流句柄绑定...")
+
+        websocket, session_id, stream_handle = await self.open_recording(binary_audio=True)
+        other_websocket = None
+        try:
+            if not websocket:
+                self.log_test_result("二进制句柄绑定测试", False, "未收到audio_stream_ready")
+                return False
+            print(f"✅ 分配到音频流句柄: {stream_handle}")
+
+            for sequence in range(3):
+                await self.send_binary_frame(websocket, stream_handle, sequence, self.generate_pcm_chunk(sequence))
+
+            # 未知句柄：返回 AUDIO_STREAM_HANDLE_INVALID
+            unknown_handle = (stream_handle + 100000) % 0xFFFFFFFF
+            await self.send_binary_frame(websocket, unknown_handle, 0, self.generate_pcm_chunk())
+            error_event = await self.wait_for_event(websocket, ["error"])
+            unknown_rejected = bool(error_event) and error_event["data"].get("error_code") == "AUDIO_STREAM_HANDLE_INVALID"
+
+            # 其他连接使用该句柄：同样被拒绝，不会写入本会话
+            other_websocket = await self.connect_websocket()
+            foreign_rejected = False
+            if other_websocket:
+                await self.send_binary_frame(other_websocket, stream_handle, 3, self.generate_pcm_chunk())
+                error_event = await self.wait_for_event(other_websocket, ["error"])
+                foreign_rejected = bool(error_event) and error_event["data"].get("error_code") == "AUDIO_STREAM_HANDLE_INVALID"
+
+            # 正确句柄的音频完整转录
+            await self.send_websocket_event(websocket, "message_end", {"session_id": session_id})
+            recorded_event = await self.wait_for_event(websocket, ["message_recorded", "error"], self.test_settings["response_timeout"])
+            recorded = bool(recorded_event) and recorded_event["type"] == "message_recorded"
+
+            success = unknown_rejected and foreign_rejected and recorded
+            self.log_test_result(
+                "二进制句柄绑定测试", success,
+                f"未知句柄拒绝: {unknown_rejected}, 其他连接拒绝: {foreign_rejected}, 消息记录: {recorded}"
+            )
+            return success
+
+        except Exception as e:
+            self.log_test_result("二进制句柄绑定测试", False, f"测试异常: {str(e)}")
+            return False
+        finally:
+            if other_websocket:
+                await self.close_session(other_websocket, None)
+            await self.close_session(websocket, session_id)
+
+    async def test_sequence_dedup_and_gap(self) -> bool:
+        """测试音频块序号：重复序号被忽略，序号超前时推送 sequence_gap 并给出续传起点"""
+        print("\n🧪 测试音频块序号去重与缺口检测...")
+
+        websocket, session_id, _ = await self.open_recording()
+        try:
+            if not websocket:
+                self.log_test_result("序号去重与缺口测试", False, "无法开始录音")
+                return False
+
+            # 0, 1, 1(重复), 2 按序接收，随后跳过 3 直接发送 4
+            for sequence in (0, 1, 1, 2, 4):
+                await self.send_sequenced_chunk(websocket, session_id, sequence)
+
+            backpressure = await self.wait_for_event(websocket, ["audio_backpressure"])
+            if not backpressure:
+                self.log_test_result("序号去重与缺口测试", False, "未收到sequence_gap背压事件")
+                return False
+
+            data = backpressure["data"]
+            success = data.get("reason") == "sequence_gap" and data.get("resume_sequence") == 3
+            self.log_test_result(
+                "序号去重与缺口测试", success,
+                f"reason={data.get('reason')}, resume_sequence={data.get('resume_sequence')}（期望3）"
+            )
+            return success
+
+        except Exception as e:
+            self.log_test_result("序号去重与缺口测试", False, f"测试异常: {str(e)}")
+            return False
+        finally:
+            await self.close_session(websocket, session_id)
+
+    async def test_resume_after_reconnect(self) -> bool:
+        """测试录音中断连后续传：恢复会话返回续传起点并重新下发句柄，重发的音频块不会重复写入"""
+        print("\n🧪 测试录音中重连续传...")
+
+        websocket, session_id, stream_handle = await self.open_recording(binary_audio=True)
+        try:
+            if not websocket:
+                self.log_test_result("重连续传测试", False, "无法开始二进制录音")
+                return False
+
+            sent_chunks = 4
+            for sequence in range(sent_chunks):
+                await self.send_binary_frame(websocket, stream_handle, sequence, self.generate_pcm_chunk(sequence))
+            await asyncio.sleep(1)
+
+            print("🔌 录音中断开连接...")
+            await websocket.close()
+            self.pending_events.pop(id(websocket), None)
+            await asyncio.sleep(2)
+
+            websocket = await self.connect_websocket()
+            if not websocket:
+                self.log_test_result("重连续传测试", False, "重连失败")
+                return False
+            await self.send_websocket_event(websocket, "session_resume", {"session_id": session_id})
+
+            restored_event = await self.wait_for_event(websocket, ["session_restored", "error"])
+            if not restored_event or restored_event["type"] != "session_restored":
+                self.log_test_result("重连续传测试", False, "会话恢复失败")
+                return False
+
+            resume_sequence = restored_event["data"].get("audio_resume_sequence")
+            ready_event = await self.wait_for_event(websocket, ["audio_stream_ready"])
+            if resume_sequence != sent_chunks or not ready_event:
+                self.log_test_result(
+                    "重连续传测试", False,
+                    f"audio_resume_sequence={resume_sequence}（期望{sent_chunks}）, 重新下发句柄: {bool(ready_event)}"
+                )
+                return False
+            new_handle = ready_event["data"]["stream_handle"]
+
+            # 重发最后一个已接收的音频块（应被忽略），再从续传起点继续发送
+            for sequence in range(resume_sequence - 1, resume_sequence + 2):
+                await self.send_binary_frame(websocket, new_handle, sequence, self.generate_pcm_chunk(sequence))
+            unexpected = await self.wait_for_event(websocket, ["audio_backpressure", "error"], 2)
+
+            await self.send_websocket_event(websocket, "message_end", {"session_id": session_id})
+            recorded_event = await self.wait_for_event(websocket, ["message_recorded"], self.test_settings["response_timeout"])
+
+            success = unexpected is None and recorded_event is not None
+            self.log_test_result(
+                "重连续传测试", success,
+                f"续传起点: {resume_sequence}, 新句柄: {new_handle}, "
+                f"异常事件: {unexpected['type'] if unexpected else '无'}, 消息记录: {recorded_event is not None}"
+            )
+            return success
+
+        except Exception as e:
+            self.log_test_result("重连续传测试", False, f"测试异常: {str(e)}")
+            return False
+        finally:
+            await self.close_session(websocket, session_id)
+
+    async def test_rate_limit_backpressure(self) -> bool:
+        """测试音频块速率限制：突发发送时收到 rate_limited 背压（后端未启用限速时跳过）"""
+        print("\n🧪 测试音频块速率限制...")
+
+        websocket, session_id, stream_handle = await self.open_recording(binary_audio=True)
+        try:
+            if not websocket:
+                self.log_test_result("速率限制测试", False, "无法开始二进制录音")
+                return False
+
+            small_chunk = b"\x00" * 64
+            for sequence in range(self.rate_limit_burst):
+                await self.send_binary_frame(websocket, stream_handle, sequence, small_chunk)
+
+            backpressure = await self.wait_for_event(websocket, ["audio_backpressure"], 3)
+            if not backpressure:
+                self.log_test_result("速率限制测试", True, f"突发 {self.rate_limit_burst} 个音频块未触发限速（后端未启用限速）")
+                return True
+
+            reason = backpressure["data"].get("reason")
+            success = reason in ("rate_limited", "sequence_gap")
+            self.log_test_result(
+                "速率限制测试", success,
+                f"reason={reason}, retry_after_ms={backpressure['data'].get('retry_after_ms')}, "
+                f"dropped_chunks={backpressure['data'].get('dropped_chunks')}"
+            )
+            return success
+
+        except Exception as e:
+            self.log_test_result("速率限制测试", False, f"测试异常: {str(e)}")
+            return False
+        finally:
+            await self.close_session(websocket, session_id)
+
+    async def _end_until_recorded(self, websocket, session_id: str) -> Dict[str, Any]:
+        """结束消息，过载时按间隔重试 message_end（音频保留在后端）"""
+        result = {"recorded": False, "overloaded": 0, "error": None}
+        for _ in range(self.overload_max_retries + 1):
+            await self.send_websocket_event(websocket, "message_end", {"session_id": session_id})
+            event = await self.wait_for_event(
+                websocket, ["message_recorded", "error"], self.test_settings["response_timeout"], session_id
+            )
+            if event and event["type"] == "message_recorded":
+                result["recorded"] = True
+                return result
+            error_code = event["data"].get("error_code") if event else "TIMEOUT"
+            if error_code not in ("SERVICE_OVERLOADED", "SERVICE_TIMEOUT"):
+                result["error"] = error_code
+                return result
+            result["overloaded"] += 1
+            await asyncio.sleep(self.overload_retry_interval)
+        result["error"] = "重试次数用尽"
+        return result
+
+    async def test_overload_rejection(self) -> bool:
+        """测试过载拒绝：并发结束多条消息，被拒绝的请求返回 SERVICE_OVERLOADED 且重试后完成转录"""
+        print(f"\n🧪 测试STT过载拒绝（并发会话: {self.overload_sessions}）...")
+
+        recordings = []
+        try:
+            # 依次开始录音并发送音频，再同时结束所有消息，使转录请求同时到达STT执行器
+            chunks = self.overload_audio_seconds * 1000 // self.chunk_ms
+            for _ in range(self.overload_sessions):
+                websocket, session_id, _ = await self.open_recording()
+                if not websocket:
+                    self.log_test_result("过载拒绝测试", False, "无法开始录音")
+                    return False
+                recordings.append((websocket, session_id))
+                for sequence in range(chunks):
+                    await self.send_sequenced_chunk(websocket, session_id, sequence)
+
+            results = await asyncio.gather(*[
+                self._end_until_recorded(websocket, session_id) for websocket, session_id in recordings
+            ])
+        except Exception as e:
+            self.log_test_result("过载拒绝测试", False, f"测试异常: {str(e)}")
+            return False
+        finally:
+            for websocket, session_id in recordings:
+                await self.close_session(websocket, session_id)
+
+        recorded = sum(1 for result in results if result["recorded"])
+        overloaded = sum(result["overloaded"] for result in results)
+        errors = [result["error"] for result in results if result["error"]]
+
+        # 过载只允许以 SERVICE_OVERLOADED/SERVICE_TIMEOUT 拒绝，音频保留，重试后全部完成
+        success = recorded == self.overload_sessions and not errors
+        self.log_test_result(
+            "过载拒绝测试", success,
+            f"完成转录: {recorded}/{self.overload_sessions}, 过载拒绝次数: {overloaded}, 其他错误: {errors or '无'}"
+        )
+        return success
+
+    async def test_codec_negotiation(self) -> bool:
+        """测试音频编码协商：ogg_opus 被接受（或后端未安装解码器时明确拒绝），未知编码被拒绝"""
+        print("\n🧪 测试音频编码协商...")
+
+        websocket = await self.connect_websocket()
+        session_id = None
+        try:
+            if not websocket:
+                self.log_test_result("音频编码协商测试", False, "无法建立WebSocket连接")
+                return False
+            session_id = await self.start_conversation(websocket, scenario_description="音频编码协商测试", response_count=2)
+            if not session_id:
+                self.log_test_result("音频编码协商测试", False, "无法创建会话")
+                return False
+
+            # 未知编码：事件校验失败
+            await self.send_websocket_event(websocket, "message_start", {
+                "session_id": session_id, "sender": "编码测试用户", "audio_codec": "mp3"
+            })
+            error_event = await self.wait_for_event(websocket, ["error"])
+            unknown_rejected = bool(error_event) and error_event["data"].get("error_code") == "INVALID_EVENT_DATA"
+
+            # ogg_opus：开始录音，或后端不支持时返回 INVALID_EVENT_DATA
+            await self.send_websocket_event(websocket, "message_start", {
+                "session_id": session_id, "sender": "编码测试用户", "audio_codec": "ogg_opus"
+            })
+            event = await self.wait_for_event(websocket, ["status_update", "error"])
+            if event and event["type"] == "status_update":
+                opus_result = "已接受" if event["data"].get("status") == "recording_message" else None
+            elif event and event["data"].get("error_code") == "INVALID_EVENT_DATA":
+                opus_result = "后端不支持（已拒绝）"
+            else:
+                opus_result = None
+
+            # 不同采样率的PCM：开始录音，音频由后端重采样
+            await self.send_websocket_event(websocket, "message_start", {
+                "session_id": session_id, "sender": "编码测试用户", "sample_rate": 48000, "channels": 2
+            })
+            event = await self.wait_for_event(websocket, ["status_update", "error"])
+            pcm_accepted = bool(event) and event["type"] == "status_update"
+
+            success = unknown_rejected and opus_result is not None and pcm_accepted
+            self.log_test_result(
+                "音频编码协商测试", success,
+                f"未知编码拒绝: {unknown_rejected}, ogg_opus: {opus_result}, 48kHz双声道PCM: {pcm_accepted}"
+            )
+            return success
+
+        except Exception as e:
+            self.log_test_result("音频编码协商测试", False, f"测试异常: {str(e)}")
+            return False
+        finally:
+            await self.close_session(websocket, session_id)
+
+    async def run_all_tests(self) -> bool:
+        """运行所有音频流测试"""
+        print("🚀 开始音频流专项测试...")
+        print(f"🌐 目标服务器: {self.base_url}")
+        print(f"🔌 WebSocket地址: {self.ws_url}")
+        print("=" * 60)
+
+        tests = [
+            self.test_readiness_endpoint,
+            self.test_binary_handle_binding,
+            self.test_sequence_dedup_and_gap,
+            self.test_resume_after_reconnect,
+            self.test_rate_limit_backpressure,
+            self.test_codec_negotiation,
+            self.test_overload_rejection,
+        ]
+
+        for test in tests:
+            try:
+                await test()
+                await asyncio.sleep(1)  # 测试间隔
+            except Exception as e:
+                print(f"❌ 测试执行异常: {e}")
+
+        # 生成测试摘要
+        summary = self.get_test_summary()
+
+        print("\n📊 测试完成")
+        print(f"总测试数: {summary['total_tests']}")
+        print(f"成功测试: {summary['passed_tests']}")
+        print(f"失败测试: {summary['failed_tests']}")
+        print(f"成功率: {summary['success_rate']}%")
+
+        # 保存报告
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_file = f"audio_streaming_test_report_{timestamp}.json"
+        self.save_test_report(report_file)
+
+        return summary['failed_tests'] == 0
+
+
+def main():
+    """主函数"""
+    config_file = sys.argv[1] if len(sys.argv) > 1 else "remote_test_config.json"
+
+    tester = AudioStreamingTester(config_file)
+    result = asyncio.run(tester.run_all_tests())
+
+    sys.exit(0 if result else 1)
+
+
+if __name__ == "__main__":
+    main()